@@ -0,0 +1,225 @@
+import asyncio
+from collections import Counter
+from collections.abc import Awaitable, Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from urllib.parse import urljoin, urlsplit
+
+import orjson
+
+from data_collector.scraper.models import ScrapeResult
+from data_collector.scraper.urls import canonicalize_url
+
+
+@dataclass(slots=True)
+class PageFixture:
+    """
+    One recorded page: what scrape_page would have returned for it
+    """
+    url: str
+    links: list[tuple[str, str]] = field(default_factory=list)
+    markdown: str = ""
+    html: str = ""
+    status_code: int = 200
+
+
+@dataclass(slots=True)
+class SiteFixture:
+    """
+    A company site with its recorded pages and the labeled answer. Any of
+    `careers_urls` counts as correct, an empty list means the company has no
+    careers page and the right answer is None.
+    """
+    company_url: str
+    careers_urls: list[str] = field(default_factory=list)
+    # Keyed by the requested URL, which differs from the page's own URL after a redirect
+    pages: dict[str, PageFixture] = field(default_factory=dict)
+
+    def is_correct(self, career_page: str | None) -> bool:
+        if career_page is None:
+            return not self.careers_urls
+        return canonicalize_url(career_page) in {canonicalize_url(url) for url in self.careers_urls}
+
+    def to_json(self) -> bytes:
+        return orjson.dumps(
+            {
+                "company_url": self.company_url,
+                "careers_urls": self.careers_urls,
+                "pages": {
+                    url: {"url": page.url, "links": page.links, "markdown": page.markdown, "html": page.html,
+                          "status_code": page.status_code}
+                    for url, page in self.pages.items()
+                },
+            }
+        )
+
+    @classmethod
+    def from_json(cls, line: bytes | str) -> "SiteFixture":
+        data = orjson.loads(line)
+        pages = {}
+        for url, page in data["pages"].items():
+            page["links"] = [tuple(link) for link in page["links"]]
+            pages[url] = PageFixture(**page)
+        return cls(company_url=data["company_url"], careers_urls=data["careers_urls"], pages=pages)
+
+
+class Corpus:
+    """
+    Recorded company sites served through stand-ins for the scraper functions,
+    so the career finder runs offline and repeatably.
+
+    A corpus file is JSONL with one SiteFixture per line: the company URL, its
+    labeled careers URLs and every recorded page with its links, markdown and
+    HTML. Pages are looked up by canonical URL; a page that wasn't recorded
+    comes back as a failed fetch, like a dead link would.
+
+    Each stand-in waits `latency` seconds to stand in for the network and
+    counts the fetch against the company whose site (or ATS board) it is on.
+    No corpus file ships with the repo: `synthesize` builds one in memory, and
+    `Corpus.load` reads one written with `save` or `python -m benchmarks.run --save`.
+
+        corpus = synthesize(300)
+        corpus.latency = 0.05
+        pipeline = CareerPipeline(fetch_links=corpus.scrape_links, fetch_page=corpus.fetch_page)
+    """
+
+    def __init__(self, sites: Iterable[SiteFixture] = (), latency: float = 0.0):
+        self.latency = latency
+        self.sites: dict[str, SiteFixture] = {}
+        self.fetches: Counter[str] = Counter()
+        self._pages: dict[str, tuple[PageFixture, str]] = {}
+        self._hosts: dict[str, str] = {}
+        for site in sites:
+            self.add(site)
+
+    def add(self, site: SiteFixture):
+        self.sites[site.company_url] = site
+        for url, page in site.pages.items():
+            for key in (url, page.url):
+                self._pages[canonicalize_url(key)] = (page, site.company_url)
+                self._hosts.setdefault(_host(key), site.company_url)
+
+    def __len__(self) -> int:
+        return len(self.sites)
+
+    def __iter__(self) -> Iterator[SiteFixture]:
+        return iter(self.sites.values())
+
+    @classmethod
+    def load(cls, path: str, latency: float = 0.0) -> "Corpus":
+        with open(path, "rb") as f:
+            return cls((SiteFixture.from_json(line) for line in f if line.strip()), latency=latency)
+
+    def save(self, path: str):
+        with open(path, "wb") as f:
+            for site in self.sites.values():
+                f.write(site.to_json() + b"\n")
+
+    def company_of(self, url: str) -> str | None:
+        found = self._pages.get(canonicalize_url(url))
+        return found[1] if found is not None else self._hosts.get(_host(url))
+
+    async def scrape_page(self, url: str, markdown: bool = True, html: bool = False, **kwargs) -> ScrapeResult:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        found = self._pages.get(canonicalize_url(url))
+        self.fetches[self.company_of(url) or ""] += 1
+        if found is None:
+            return ScrapeResult(url=url, final_url=url, success=False, status_code=404, error="not in corpus")
+
+        page = found[0]
+        host = _host(page.url)
+        return ScrapeResult(
+            url=url,
+            final_url=page.url,
+            success=200 <= page.status_code < 400,
+            status_code=page.status_code,
+            markdown=page.markdown if markdown else "",
+            internal_links=[link for link in page.links if _host(link[0]) == host],
+            external_links=[link for link in page.links if _host(link[0]) != host],
+            html=page.html if html else "",
+            fetch_mode="http",
+        )
+
+    async def scrape_links(self, url: str, **kwargs) -> list[tuple[str, str]]:
+        result = await self.scrape_page(url, markdown=False)
+        return result.links if result.success else []
+
+    async def scrape_page_markdown(self, url: str, **kwargs) -> str:
+        result = await self.scrape_page(url)
+        return result.markdown if result.success else ""
+
+    async def fetch_page(self, url: str) -> ScrapeResult:
+        """
+        Stand-in for the `fetch_page` of CareerPipeline and JobExtractor, which need the HTML
+        """
+        return await self.scrape_page(url, markdown=False, html=True)
+
+
+def _host(url: str) -> str:
+    return (urlsplit(url).hostname or "").lower().removeprefix("www.")
+
+
+async def record_site(
+    company_url: str,
+    careers_urls: list[str],
+    max_pages: int = 40,
+    max_depth: int = 2,
+    scrape: Callable[..., Awaitable[ScrapeResult]] | None = None,
+) -> SiteFixture:
+    """
+    Records a live site for the corpus: the homepage, the pages the link ranker
+    likes best up to `max_depth` hops away (at most `max_pages` in total) and
+    the labeled careers pages, each with its links, markdown and HTML.
+    """
+    # Imported here so loading a corpus doesn't need a browser
+    from data_collector.scraper.scrape import scrape_page
+    from data_intelligence.career.ranking import LinkRanker
+
+    scrape = scrape or scrape_page
+    site = SiteFixture(company_url=company_url, careers_urls=list(careers_urls))
+    queued = {canonicalize_url(company_url)}
+    level = [company_url]
+    for depth in range(max_depth + 1):
+        results = await asyncio.gather(*(scrape(url, html=True) for url in level))
+        candidates = []
+        for url, result in zip(level, results):
+            if not result.success:
+                continue
+            site.pages[url] = PageFixture(
+                url=result.final_url,
+                links=list(result.links),
+                markdown=result.markdown,
+                html=result.html,
+                status_code=result.status_code or 200,
+            )
+            if depth < max_depth:
+                candidates.extend(LinkRanker(result.internal_links).top_k(10, exclude=queued))
+
+        level = []
+        for link, _, _ in sorted(candidates, key=lambda candidate: -candidate[2]):
+            key = canonicalize_url(link)
+            if key not in queued and len(site.pages) + len(level) < max_pages:
+                queued.add(key)
+                level.append(urljoin(company_url, link))
+
+    recorded = {canonicalize_url(url) for key, page in site.pages.items() for url in (key, page.url)}
+    missing = [url for url in careers_urls if canonicalize_url(url) not in recorded]
+    for url, result in zip(missing, await asyncio.gather(*(scrape(url, html=True) for url in missing))):
+        if result.success:
+            site.pages[url] = PageFixture(
+                url=result.final_url, links=list(result.links), markdown=result.markdown, html=result.html
+            )
+    return site
+
+
+async def record_corpus(labels: Iterable[tuple[str, list[str]]], concurrency: int = 4, **kwargs) -> Corpus:
+    """
+    Records the sites of `(company_url, careers_urls)` labels, `concurrency` sites at a time
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def record(company_url: str, careers_urls: list[str]) -> SiteFixture:
+        async with semaphore:
+            return await record_site(company_url, careers_urls, **kwargs)
+
+    return Corpus(await asyncio.gather(*(record(url, careers) for url, careers in labels)))
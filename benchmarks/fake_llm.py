@@ -0,0 +1,98 @@
+import asyncio
+import json
+import random
+import re
+from collections.abc import Iterable
+from urllib.parse import urljoin
+
+import xxhash
+from langchain_core.messages import AIMessage
+
+from data_collector.scraper.urls import canonicalize_url
+from data_intelligence.career.careers_page_validator.prompts import VALIDATE_CAREERS_PAGE_PROMPT
+from data_intelligence.career.definitions import CAREER_PAGE_KEYWORDS
+
+LINK_LINE = re.compile(r"^(L\d+) (\S+)(?: (.*))?$")
+CURRENT_URL = re.compile(r"^Current URL: (\S+)", re.M)
+PAGE_URL = re.compile(r"^URL: (\S+)", re.M)
+# Where a careers page hides when no link mentions one
+ABOUT = ("about", "company", "meista", "meistä", "yritys", "om-oss", "om oss")
+
+
+class FakeChatModel:
+    """
+    Deterministic stand-in for the chat model, answering from the corpus labels.
+
+    Link prompts are answered like a good model would: the current page when
+    it is a labeled careers page, otherwise the labeled link if it is listed,
+    otherwise the link with the most career keywords, then an about page, or
+    no promising links.
+    Validation prompts are answered from the labels. With `accuracy` below 1
+    that share of link answers is replaced with a random link, chosen from a
+    hash of the prompt so reruns give the same answers.
+
+    Only `ainvoke` is implemented, so the pipeline must run without a DecisionBatcher.
+    Token usage is reported as characters / 4.
+    """
+
+    def __init__(self, careers_urls: Iterable[str], latency: float = 0.0, accuracy: float = 1.0, seed: int = 0):
+        self.careers_urls = {canonicalize_url(url) for url in careers_urls}
+        self.latency = latency
+        self.accuracy = accuracy
+        self.seed = seed
+        self.calls = 0
+
+    def _answer_links(self, prompt: str) -> dict:
+        match = CURRENT_URL.search(prompt)
+        current_url = match.group(1) if match and match.group(1) != "unknown" else None
+        if current_url and canonicalize_url(current_url) in self.careers_urls:
+            return {"action": "CAREERS_PAGE_FOUND", "next_link": None}
+
+        links = []
+        for line in prompt.splitlines():
+            match = LINK_LINE.match(line)
+            if match:
+                shown = match.group(2)
+                url = urljoin(current_url, shown) if current_url else shown
+                links.append((match.group(1), url, (shown + " " + (match.group(3) or "")).lower()))
+        if not links:
+            return {"action": "NO_PROMISING_LINKS", "next_link": None}
+
+        rng = random.Random(xxhash.xxh3_64_intdigest(prompt.encode()) ^ self.seed)
+        if rng.random() >= self.accuracy:
+            return {"action": "NEXT_LINK_TO_CRAWL", "next_link": rng.choice(links)[0]}
+
+        for alias, url, _ in links:
+            if canonicalize_url(url) in self.careers_urls:
+                return {"action": "NEXT_LINK_TO_CRAWL", "next_link": alias}
+        scores = [
+            sum(keyword in text for keyword in CAREER_PAGE_KEYWORDS) or 0.5 * any(word in text for word in ABOUT)
+            for _, _, text in links
+        ]
+        best = max(range(len(links)), key=scores.__getitem__)
+        if scores[best] == 0:
+            return {"action": "NO_PROMISING_LINKS", "next_link": None}
+        return {"action": "NEXT_LINK_TO_CRAWL", "next_link": links[best][0]}
+
+    def _answer_validation(self, prompt: str) -> dict:
+        match = PAGE_URL.search(prompt)
+        is_careers_page = match is not None and canonicalize_url(match.group(1)) in self.careers_urls
+        return {"is_careers_page": is_careers_page, "reason": "labeled" if is_careers_page else "not labeled"}
+
+    async def ainvoke(self, messages: list[dict], **kwargs) -> AIMessage:
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        system, prompt = messages[0]["content"], messages[-1]["content"]
+        answer = self._answer_validation(prompt) if system == VALIDATE_CAREERS_PAGE_PROMPT else self._answer_links(prompt)
+        content = json.dumps(answer)
+        input_tokens = (len(system) + len(prompt)) // 4
+        output_tokens = len(content) // 4
+        return AIMessage(
+            content=content,
+            usage_metadata={
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens,
+            },
+        )
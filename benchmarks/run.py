@@ -0,0 +1,229 @@
+"""
+Offline benchmark of the career finder: throughput, fetches and LLM calls per
+company, latency percentiles and accuracy of CareerPipeline, plus accuracy and
+speed of the link ranker, on a recorded or synthetic corpus and a fake LLM.
+
+    python -m benchmarks.run --synthetic 300
+    python -m benchmarks.run --synthetic 300 --search best_first --latency 0.05 --llm-latency 0.5
+    python -m benchmarks.run --synthetic 300 --save corpus.jsonl
+    python -m benchmarks.run --record labels.jsonl --save corpus.jsonl
+    python -m benchmarks.run corpus.jsonl --search best_first
+
+No corpus file ships with the repo, only the synthetic generator: a corpus.jsonl
+is one saved with --save, from --synthetic or from live sites recorded with
+--record. A labels file for --record is JSONL of {"company_url": ..., "careers_urls": [...]}.
+
+Runs offline: without the tiktoken encoding cached locally, prompt tokens are
+counted as characters / 4.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from statistics import quantiles
+
+import orjson
+
+from data_collector.scraper.urls import canonicalize_url
+from data_collector.telemetry import RecordingTelemetry
+from data_intelligence.career.interface import SEARCH_MODES, CareerPipeline
+from data_intelligence.career.ranking import LinkRanker
+
+from .corpus import Corpus, record_corpus
+from .fake_llm import FakeChatModel
+from .synthetic import synthesize
+
+
+@dataclass(slots=True)
+class PipelineReport:
+    search: str
+    companies: int
+    seconds: float
+    companies_per_second: float
+    fetches_per_company: float
+    llm_calls_per_company: float
+    tokens_per_company: float
+    p50_seconds: float
+    p95_seconds: float
+    accuracy: float
+    errors: int
+    # p50 seconds of each instrumented stage
+    stages: dict[str, float] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class RankerReport:
+    # Pages that link to a labeled careers page
+    pages: int
+    seconds: float
+    pages_per_second: float
+    hit_at_1: float
+    hit_at_5: float
+    mrr: float
+
+
+def _percentiles(values: list[float]) -> tuple[float, float]:
+    if len(values) < 2:
+        value = values[0] if values else 0.0
+        return value, value
+    cuts = quantiles(values, n=20, method="inclusive")
+    return cuts[9], cuts[18]
+
+
+async def benchmark_pipeline(
+    corpus: Corpus,
+    search: str = "greedy",
+    llm_latency: float = 0.0,
+    accuracy: float = 1.0,
+    concurrency: int = 16,
+    **pipeline_kwargs,
+) -> PipelineReport:
+    """
+    Runs CareerPipeline.run over every company of `corpus` with a FakeChatModel
+    answering after `llm_latency` seconds
+    """
+    model = FakeChatModel(
+        (url for site in corpus for url in site.careers_urls), latency=llm_latency, accuracy=accuracy
+    )
+    pipeline = CareerPipeline(
+        model=model,
+        fetch_links=corpus.scrape_links,
+        fetch_page=corpus.fetch_page,
+        search=search,
+        **pipeline_kwargs,
+    )
+    corpus.fetches.clear()
+
+    correct = errors = 0
+    latencies = []
+    with RecordingTelemetry() as telemetry:
+        started = time.perf_counter()
+        async for result in pipeline.run(
+            [site.company_url for site in corpus], fetch_workers=concurrency, classify_workers=concurrency
+        ):
+            latencies.append(result.elapsed)
+            errors += result.error is not None
+            correct += corpus.sites[result.company_url].is_correct(result.career_page)
+        seconds = time.perf_counter() - started
+
+    companies = len(latencies) or 1
+    p50, p95 = _percentiles(latencies)
+    tokens = sum(value for key, value in telemetry.counters.items() if key.startswith("llm.tokens"))
+    return PipelineReport(
+        search=search,
+        companies=len(latencies),
+        seconds=seconds,
+        companies_per_second=len(latencies) / seconds if seconds else 0.0,
+        fetches_per_company=sum(corpus.fetches.values()) / companies,
+        llm_calls_per_company=model.calls / companies,
+        tokens_per_company=tokens / companies,
+        p50_seconds=p50,
+        p95_seconds=p95,
+        accuracy=correct / companies,
+        errors=errors,
+        stages={
+            key.removesuffix(".duration"): summary["p50"]
+            for key, summary in telemetry.summary().items()
+            if key.endswith(".duration")
+        },
+    )
+
+
+def benchmark_ranker(corpus: Corpus, k: int = 5) -> RankerReport:
+    """
+    Ranks the links of every recorded page that links to a labeled careers page
+    and measures where the first labeled link lands
+    """
+    ranks = []
+    started = time.perf_counter()
+    for site in corpus:
+        labels = {canonicalize_url(url) for url in site.careers_urls}
+        if not labels:
+            continue
+        for page in site.pages.values():
+            if not any(canonicalize_url(href) in labels for href, _ in page.links):
+                continue
+            ranked = LinkRanker(page.links).top_k(len(page.links))
+            rank = next(
+                (position for position, (href, _, _) in enumerate(ranked, 1) if canonicalize_url(href) in labels),
+                None,
+            )
+            ranks.append(rank)
+    seconds = time.perf_counter() - started
+
+    pages = len(ranks) or 1
+    return RankerReport(
+        pages=len(ranks),
+        seconds=seconds,
+        pages_per_second=len(ranks) / seconds if seconds else 0.0,
+        hit_at_1=sum(rank == 1 for rank in ranks) / pages,
+        hit_at_5=sum(rank is not None and rank <= k for rank in ranks) / pages,
+        mrr=sum(1 / rank for rank in ranks if rank) / pages,
+    )
+
+
+def _print_report(report: PipelineReport | RankerReport):
+    print(type(report).__name__)
+    for key, value in asdict(report).items():
+        if isinstance(value, dict):
+            for stage, seconds in value.items():
+                print(f"  {key}.{stage:<28} {seconds * 1000:10.2f} ms")
+        elif isinstance(value, float):
+            print(f"  {key:<35} {value:10.4f}")
+        else:
+            print(f"  {key:<35} {value:>10}")
+
+
+def _load_labels(path: str) -> list[tuple[str, list[str]]]:
+    with open(path, "rb") as f:
+        return [
+            (record["company_url"], record.get("careers_urls", []))
+            for record in map(orjson.loads, f)
+            if record
+        ]
+
+
+async def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__.split("\n\n")[0])
+    parser.add_argument("corpus", nargs="?", help="corpus JSONL file")
+    parser.add_argument("--synthetic", type=int, metavar="SITES", help="generate a synthetic corpus instead")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--record", metavar="LABELS", help="record live sites from a labels JSONL file")
+    parser.add_argument("--save", metavar="PATH", help="save the corpus and exit")
+    parser.add_argument("--search", choices=SEARCH_MODES, default="greedy")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per simulated page fetch")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="seconds per fake LLM call")
+    parser.add_argument("--accuracy", type=float, default=1.0, help="share of correct fake LLM answers")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--json", metavar="PATH", help="also write the reports as JSON")
+    args = parser.parse_args(argv)
+
+    if args.record:
+        corpus = await record_corpus(_load_labels(args.record))
+    elif args.synthetic:
+        corpus = synthesize(args.synthetic, args.seed)
+    elif args.corpus:
+        corpus = Corpus.load(args.corpus)
+    else:
+        parser.error("give a corpus file, --synthetic or --record")
+    if args.save:
+        corpus.save(args.save)
+        print(f"Saved {len(corpus)} sites to {args.save}")
+        return
+
+    corpus.latency = args.latency
+    reports = [
+        await benchmark_pipeline(corpus, args.search, args.llm_latency, args.accuracy, args.concurrency),
+        benchmark_ranker(corpus),
+    ]
+    for report in reports:
+        _print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({type(report).__name__: asdict(report) for report in reports}, f, indent=2)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1:]))
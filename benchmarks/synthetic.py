@@ -0,0 +1,119 @@
+import random
+from html import escape
+
+from .corpus import Corpus, PageFixture, SiteFixture
+
+# (path, anchor text) of pages every site has, per language
+NAV = {
+    "fi": [("/palvelut", "Palvelut"), ("/meista", "Meistä"), ("/yhteystiedot", "Yhteystiedot"),
+           ("/ajankohtaista", "Ajankohtaista"), ("/asiakkaat", "Asiakkaat"), ("/tietosuoja", "Tietosuojaseloste")],
+    "en": [("/services", "Services"), ("/about", "About us"), ("/contact", "Contact"),
+           ("/news", "News"), ("/customers", "Customers"), ("/privacy", "Privacy policy")],
+    "sv": [("/tjanster", "Tjänster"), ("/om-oss", "Om oss"), ("/kontakt", "Kontakt"),
+           ("/nyheter", "Nyheter"), ("/kunder", "Kunder"), ("/integritet", "Integritetspolicy")],
+}
+CAREERS = {
+    "fi": [("/rekrytointi", "Rekrytointi"), ("/tyopaikat", "Työpaikat"), ("/ura", "Ura meillä"),
+           ("/tule-toihin", "Tule meille töihin")],
+    "en": [("/careers", "Careers"), ("/jobs", "Jobs"), ("/join-us", "Join us"), ("/work-with-us", "Work with us")],
+    "sv": [("/karriar", "Karriär"), ("/lediga-jobb", "Lediga jobb"), ("/jobba-hos-oss", "Jobba hos oss")],
+}
+# Career sounding links that aren't careers pages
+DECOYS = {
+    "fi": [("/ajankohtaista/uratarinat", "Uratarinoita"), ("/sijoittajat", "Sijoittajille")],
+    "en": [("/news/career-stories", "Career stories"), ("/investors", "Investors")],
+    "sv": [("/nyheter/karriarberattelser", "Karriärberättelser"), ("/investerare", "Investerare")],
+}
+TITLES = ["Software Developer", "Project Manager", "Sales Specialist", "Data Engineer", "Designer",
+          "Myyjä", "Asiakaspalvelija", "Huoltoasentaja", "Controller", "HR Partner", "Trainee"]
+ATS_BOARDS = ["https://{slug}.teamtailor.com/jobs", "https://jobs.lever.co/{slug}",
+              "https://{slug}.recruitee.com/", "https://boards.greenhouse.io/{slug}"]
+# Share of sites per layout: careers linked from the homepage, under an about page,
+# a landing page in front of an ATS board, and no careers page at all
+LAYOUTS = (("direct", 0.45), ("nested", 0.25), ("ats", 0.2), ("none", 0.1))
+
+
+def _html(title: str, links: list[tuple[str, str]], body: str = "") -> str:
+    anchors = "".join(f'<a href="{escape(href)}">{escape(text)}</a>' for href, text in links)
+    return f"<html><head><title>{escape(title)}</title></head><body><nav>{anchors}</nav><main>{body}</main></body></html>"
+
+
+def _markdown(title: str, links: list[tuple[str, str]], text: str = "") -> str:
+    return f"# {title}\n\n{text}\n\n" + "\n".join(f"[{link_text}]({href})" for href, link_text in links)
+
+
+def _listing(rng: random.Random, base: str) -> tuple[list[tuple[str, str]], str, str]:
+    """
+    Links, HTML and markdown of a job listing with a few postings
+    """
+    jobs = [(f"{base}/jobs/{i}-{title.lower().replace(' ', '-')}", title)
+            for i, title in enumerate(rng.sample(TITLES, rng.randint(3, 7)))]
+    items = "".join(
+        f'<li class="job"><a href="{href}"><h3>{escape(title)}</h3></a><span class="location">Helsinki</span>'
+        f'<a class="apply" href="{href}#apply">Apply</a></li>'
+        for href, title in jobs
+    )
+    markdown = "\n".join(f"- [{title}]({href}) Helsinki" for href, title in jobs)
+    return jobs, f'<ul class="jobs">{items}</ul>', markdown
+
+
+def synthesize_site(rng: random.Random, index: int) -> SiteFixture:
+    language = rng.choice(("fi", "fi", "en", "sv"))
+    slug = f"yritys{index}"
+    root = f"https://www.{slug}.{'fi' if language == 'fi' else rng.choice(('com', 'fi', 'se'))}"
+    layout = rng.choices([name for name, _ in LAYOUTS], [share for _, share in LAYOUTS])[0]
+
+    nav = [(root + path, text) for path, text in NAV[language]]
+    decoys = [(root + path, text) for path, text in DECOYS[language]]
+    products = [(f"{root}/tuotteet/{i}", f"Product {i}") for i in range(rng.randint(3, 12))]
+    social = [("https://www.linkedin.com/company/" + slug, "LinkedIn"), ("https://www.facebook.com/" + slug, "Facebook")]
+    careers_path, careers_text = rng.choice(CAREERS[language])
+    about = nav[1]
+
+    site = SiteFixture(company_url=root + "/")
+    home_links = nav + rng.sample(decoys, 1) + products + social
+    pages: dict[str, PageFixture] = {}
+
+    def page(url: str, title: str, links: list[tuple[str, str]], body_html: str = "", text: str = ""):
+        pages[url] = PageFixture(url=url, links=links, markdown=_markdown(title, links, text),
+                                 html=_html(title, links, body_html or f"<p>{escape(text)}</p>"))
+
+    if layout == "direct":
+        careers_url = root + careers_path
+        home_links.append((careers_url, careers_text))
+        jobs, body, text = _listing(rng, root)
+        page(careers_url, careers_text, nav + jobs, body, text)
+        site.careers_urls = [careers_url]
+    elif layout == "nested":
+        careers_url = about[0] + careers_path
+        jobs, body, text = _listing(rng, root)
+        page(careers_url, careers_text, nav + jobs, body, text)
+        site.careers_urls = [careers_url]
+    elif layout == "ats":
+        board = rng.choice(ATS_BOARDS).format(slug=slug)
+        landing = root + careers_path
+        home_links.append((landing, careers_text))
+        page(landing, careers_text, nav + [(board, "Open positions")], text="Our culture, benefits and people.")
+        jobs, body, text = _listing(rng, board.rstrip("/"))
+        page(board, "Jobs", jobs, body, text)
+        site.careers_urls = [board]
+
+    about_links = nav + ([(about[0] + careers_path, careers_text)] if layout == "nested" else [])
+    page(root + "/", slug, home_links, text=f"{slug} is a company.")
+    page(about[0], about[1], about_links, text="Our history and team.")
+    for url, text in nav[:1] + nav[2:] + decoys + products:
+        page(url, text, nav, text=f"{text} of {slug}.")
+
+    site.pages = pages
+    return site
+
+
+def synthesize(sites: int = 300, seed: int = 0) -> Corpus:
+    """
+    A deterministic corpus of made up company sites in Finnish, English and
+    Swedish: careers pages linked from the homepage, nested under an about
+    page or behind a landing page on an ATS board, plus sites without one and
+    career sounding decoys. The same `seed` always gives the same corpus.
+    """
+    rng = random.Random(seed)
+    return Corpus(synthesize_site(rng, index) for index in range(sites))
@@ -0,0 +1,277 @@
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+import aiosqlite
+import httpx
+import orjson
+import zstandard
+
+from .models import ScrapeResult
+from .urls import normalize_url
+
+_current_cache: ContextVar["PageCache | None"] = ContextVar("current_page_cache", default=None)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    final_url TEXT NOT NULL,
+    status_code INTEGER,
+    has_markdown INTEGER NOT NULL,
+    body BLOB NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    elapsed REAL NOT NULL,
+    fetched_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    size INTEGER NOT NULL,
+    fetch_mode TEXT NOT NULL DEFAULT 'browser'
+);
+CREATE INDEX IF NOT EXISTS pages_accessed_at ON pages (accessed_at);
+"""
+
+
+async def is_not_modified(
+    client: httpx.AsyncClient, url: str, etag: str | None, last_modified: str | None
+) -> bool:
+    """
+    Conditional GET of `url` with the validators of a stored copy, True when the
+    server answers 304 Not Modified. False without validators or on errors.
+    """
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    if not headers:
+        return False
+    try:
+        # Only the status line is needed, the body is never read
+        async with client.stream("GET", url, headers=headers) as response:
+            return response.status_code == 304
+    except (httpx.HTTPError, httpx.InvalidURL, ValueError):
+        return False
+
+
+def current_cache() -> "PageCache | None":
+    """
+    Returns the cache opened with `async with PageCache()` in the current context, if any
+    """
+    return _current_cache.get()
+
+
+@dataclass(slots=True)
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    revalidated: int = 0
+    stores: int = 0
+    evictions: int = 0
+    # Render time the cached results originally took, i.e. browser time saved by hits
+    saved_seconds: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class PageCache:
+    """
+    SQLite backed cache of scrape results keyed by normalized URL.
+
+    Markdown and links are stored zstd compressed. Entries older than `ttl`
+    seconds are revalidated with a conditional GET when the site sent an ETag
+    or Last-Modified header, otherwise they count as misses. The least recently
+    used entries are evicted once `max_bytes` or `max_entries` is exceeded.
+
+        async with PageCache("scrape_cache.sqlite"):
+            links = await scrape_links(url)  # served from cache when possible
+    """
+
+    def __init__(
+        self,
+        path: str = "scrape_cache.sqlite",
+        ttl: float = 7 * 24 * 3600,
+        max_bytes: int = 1 << 30,
+        max_entries: int | None = None,
+        revalidate: bool = True,
+        compression_level: int = 3,
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.revalidate = revalidate
+        self.stats = CacheStats()
+
+        self._compressor = zstandard.ZstdCompressor(level=compression_level)
+        self._decompressor = zstandard.ZstdDecompressor()
+        self._db: aiosqlite.Connection | None = None
+        self._http: httpx.AsyncClient | None = None
+        self._total_bytes = 0
+        self._total_entries = 0
+        self._context_token = None
+
+    async def open(self):
+        if self._db is not None:
+            return
+        self._db = await aiosqlite.connect(self.path)
+        await self._db.executescript(_SCHEMA)
+        # Caches created before the fetch mode was stored
+        async with self._db.execute("PRAGMA table_info(pages)") as cursor:
+            columns = {row[1] for row in await cursor.fetchall()}
+        if "fetch_mode" not in columns:
+            await self._db.execute("ALTER TABLE pages ADD COLUMN fetch_mode TEXT NOT NULL DEFAULT 'browser'")
+        await self._db.commit()
+        async with self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM pages") as cursor:
+            self._total_entries, self._total_bytes = await cursor.fetchone()
+
+    async def close(self):
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+        if self._db is not None:
+            await self._db.close()
+            self._db = None
+
+    async def __aenter__(self) -> "PageCache":
+        await self.open()
+        self._context_token = _current_cache.set(self)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        if self._context_token is not None:
+            _current_cache.reset(self._context_token)
+            self._context_token = None
+        await self.close()
+
+    def _encode(self, result: ScrapeResult) -> bytes:
+        return self._compressor.compress(orjson.dumps({
+            "markdown": result.markdown,
+            "internal_links": result.internal_links,
+            "external_links": result.external_links,
+        }))
+
+    def _decode(self, body: bytes) -> dict:
+        data = orjson.loads(self._decompressor.decompress(body))
+        data["internal_links"] = [tuple(link) for link in data["internal_links"]]
+        data["external_links"] = [tuple(link) for link in data["external_links"]]
+        return data
+
+    async def _is_not_modified(self, url: str, etag: str | None, last_modified: str | None) -> bool:
+        if not (etag or last_modified):
+            return False
+        if self._http is None:
+            self._http = httpx.AsyncClient(follow_redirects=True, timeout=10.0)
+        return await is_not_modified(self._http, url, etag, last_modified)
+
+    async def get(self, url: str, markdown: bool = True) -> ScrapeResult | None:
+        """
+        Returns the cached result for `url`, or None on a miss.
+
+        Entries stored without markdown only satisfy `markdown=False` lookups.
+        """
+        key = normalize_url(url)
+        async with self._db.execute(
+            "SELECT final_url, status_code, has_markdown, body, etag, last_modified, elapsed, fetched_at, fetch_mode "
+            "FROM pages WHERE key = ?",
+            (key,),
+        ) as cursor:
+            row = await cursor.fetchone()
+
+        if row is None or (markdown and not row[2]):
+            self.stats.misses += 1
+            return None
+
+        final_url, status_code, _, body, etag, last_modified, elapsed, fetched_at, fetch_mode = row
+        now = time.time()
+        if now - fetched_at > self.ttl:
+            if not (self.revalidate and await self._is_not_modified(final_url, etag, last_modified)):
+                self.stats.misses += 1
+                return None
+            self.stats.revalidated += 1
+            await self._db.execute("UPDATE pages SET fetched_at = ? WHERE key = ?", (now, key))
+
+        await self._db.execute("UPDATE pages SET accessed_at = ? WHERE key = ?", (now, key))
+        await self._db.commit()
+
+        self.stats.hits += 1
+        self.stats.saved_seconds += elapsed
+        return ScrapeResult(
+            url=url,
+            final_url=final_url,
+            success=True,
+            status_code=status_code,
+            elapsed=0.0,
+            from_cache=True,
+            fetch_mode=fetch_mode,
+            **self._decode(body),
+        )
+
+    async def put(self, result: ScrapeResult, markdown: bool = True):
+        """
+        Stores a successful result, evicting least recently used entries if over the limits.
+
+        `markdown` tells whether the result was scraped with markdown conversion enabled.
+        A result without markdown doesn't replace a fresh entry that has it, the
+        links only lookups it would serve are served by that entry as well.
+        """
+        if not result.success:
+            return
+
+        key = normalize_url(result.url)
+        body = self._encode(result)
+        headers = {name.lower(): value for name, value in result.headers.items()}
+        now = time.time()
+
+        async with self._db.execute(
+            "SELECT size, has_markdown, fetched_at FROM pages WHERE key = ?", (key,)
+        ) as cursor:
+            previous = await cursor.fetchone()
+        if previous is not None:
+            size, has_markdown, fetched_at = previous
+            if has_markdown and not markdown and now - fetched_at <= self.ttl:
+                await self._db.execute("UPDATE pages SET accessed_at = ? WHERE key = ?", (now, key))
+                await self._db.commit()
+                return
+            self._total_bytes -= size
+            self._total_entries -= 1
+
+        await self._db.execute(
+            "INSERT OR REPLACE INTO pages (key, url, final_url, status_code, has_markdown, body, etag, "
+            "last_modified, elapsed, fetched_at, accessed_at, size, fetch_mode) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                key, result.url, result.final_url, result.status_code, markdown, body,
+                headers.get("etag"), headers.get("last-modified"), result.elapsed, now, now, len(body),
+                result.fetch_mode,
+            ),
+        )
+        self._total_bytes += len(body)
+        self._total_entries += 1
+        self.stats.stores += 1
+
+        await self._evict()
+        await self._db.commit()
+
+    async def _evict(self):
+        while self._total_entries and (
+            self._total_bytes > self.max_bytes
+            or (self.max_entries is not None and self._total_entries > self.max_entries)
+        ):
+            async with self._db.execute(
+                "SELECT key, size FROM pages ORDER BY accessed_at LIMIT 64"
+            ) as cursor:
+                rows = await cursor.fetchall()
+
+            for key, size in rows:
+                await self._db.execute("DELETE FROM pages WHERE key = ?", (key,))
+                self._total_bytes -= size
+                self._total_entries -= 1
+                self.stats.evictions += 1
+                if self._total_bytes <= self.max_bytes and (
+                    self.max_entries is None or self._total_entries <= self.max_entries
+                ):
+                    break
@@ -0,0 +1,310 @@
+import zlib
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass, field
+from urllib.parse import urljoin, urlsplit
+from urllib.robotparser import RobotFileParser
+
+import httpx
+import lxml.etree
+
+from ..telemetry import current_telemetry
+from .http_fetch import DEFAULT_USER_AGENT
+from .ratelimit import HostRateLimiter
+
+# Tried in order when robots.txt lists no sitemap
+DEFAULT_SITEMAPS = ("/sitemap.xml", "/sitemap_index.xml", "/wp-sitemap.xml")
+# The sitemap protocol's own limits for a single file
+MAX_SITEMAP_URLS = 50_000
+MAX_SITEMAP_BYTES = 50 * 1024 * 1024
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+@dataclass(slots=True)
+class SitemapEntry:
+    url: str
+    lastmod: str | None = None
+
+
+@dataclass(slots=True)
+class RobotsPolicy:
+    """
+    The robots.txt rules of one site for our user agent
+    """
+    parser: RobotFileParser
+    sitemaps: list[str] = field(default_factory=list)
+    crawl_delay: float | None = None
+    # "found", "missing" (4xx or unreachable, everything allowed) or "denied" (401, 403 or 5xx, nothing allowed)
+    status: str = "found"
+    agent: str = "*"
+
+    def allowed(self, url: str) -> bool:
+        return self.parser.can_fetch(self.agent, url)
+
+
+@dataclass(slots=True)
+class DiscoveryStats:
+    robots: int = 0
+    robots_missing: int = 0
+    crawl_delays: int = 0
+    sitemaps: int = 0
+    sitemap_failures: int = 0
+    urls: int = 0
+    # Decompressed sitemap bytes parsed
+    bytes: int = 0
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url if "://" in url else f"https://{url}")
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _localname(element) -> str:
+    return lxml.etree.QName(element).localname
+
+
+class _SitemapParser:
+    """
+    Incremental sitemap parser fed one chunk of the (possibly gzipped) body at a
+    time. Entries are read as their element closes and then freed, so memory
+    stays flat however long the sitemap is.
+    """
+
+    def __init__(self, max_bytes: int = MAX_SITEMAP_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.entries: list[SitemapEntry] = []
+        # Child sitemaps of a sitemap index
+        self.sitemaps: list[str] = []
+        # zlib decompressor of a gzipped body, None for plain XML
+        self._gunzip = None
+        self._started = False
+        self._parser = lxml.etree.XMLPullParser(
+            events=("end",), resolve_entities=False, no_network=True, recover=True, huge_tree=False
+        )
+
+    def feed(self, chunk: bytes):
+        if not self._started:
+            self._started = True
+            if chunk.startswith(GZIP_MAGIC):
+                self._gunzip = zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)
+        if self._gunzip is not None:
+            # Bounded so a small gzip bomb can't inflate past the size limit
+            chunk = self._gunzip.decompress(chunk, self.max_bytes - self.size + 1)
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            raise ValueError(f"Sitemap larger than {self.max_bytes} bytes")
+        self._parser.feed(chunk)
+        self._read_events()
+
+    def close(self):
+        self._parser.close()
+        self._read_events()
+
+    def _read_events(self):
+        for _, element in self._parser.read_events():
+            name = _localname(element)
+            if name not in ("url", "sitemap"):
+                continue
+            loc = lastmod = None
+            for child in element:
+                if not isinstance(child.tag, str):
+                    continue
+                child_name = _localname(child)
+                if child_name == "loc" and child.text:
+                    loc = child.text.strip()
+                elif child_name == "lastmod" and child.text:
+                    lastmod = child.text.strip()
+            if loc:
+                if name == "url":
+                    self.entries.append(SitemapEntry(loc, lastmod))
+                else:
+                    self.sitemaps.append(loc)
+            # Drop the finished entry and everything before it
+            element.clear()
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+
+
+class SiteDiscovery:
+    """
+    Finds a site's URLs without rendering anything: reads its robots.txt and
+    walks the sitemaps listed there (or the usual sitemap paths), including
+    gzipped sitemaps and sitemap indexes, with a streaming XML parser.
+
+    A crawl-delay in robots.txt is applied to `limiter`, which spaces the
+    discovery requests themselves and every other fetch sharing it. URLs
+    robots.txt disallows are left out.
+
+        async with SiteDiscovery() as discovery:
+            async for entry in discovery.sitemap_urls("https://example.fi"):
+                print(entry.url)
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient | None = None,
+        limiter: HostRateLimiter | None = None,
+        user_agent: str = DEFAULT_USER_AGENT,
+        robots_agent: str = "*",
+        max_sitemaps: int = 10,
+        max_urls: int = MAX_SITEMAP_URLS,
+        max_bytes: int = MAX_SITEMAP_BYTES,
+        max_delay: float = 30.0,
+        max_sites: int = 4096,
+        timeout: float = 10.0,
+    ):
+        self.client = client
+        self._own_client = client is None
+        # Without a delay of its own the limiter only spaces hosts that ask for it
+        self.limiter = limiter or HostRateLimiter(per_host_concurrency=2, per_host_delay=0.0)
+        self.user_agent = user_agent
+        # The robots.txt user agent whose rules apply to us
+        self.robots_agent = robots_agent
+        self.max_sitemaps = max_sitemaps
+        self.max_urls = max_urls
+        self.max_bytes = max_bytes
+        # Longer crawl-delays are capped, a site asking for minutes per page isn't crawled at that pace
+        self.max_delay = max_delay
+        self.max_sites = max_sites
+        self.timeout = timeout
+        self.stats = DiscoveryStats()
+        self._robots: OrderedDict[str, RobotsPolicy] = OrderedDict()
+
+    def _client(self) -> httpx.AsyncClient:
+        if self.client is None:
+            self.client = httpx.AsyncClient(
+                follow_redirects=True, timeout=self.timeout, headers={"User-Agent": self.user_agent}
+            )
+        return self.client
+
+    async def close(self):
+        if self._own_client and self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+    async def __aenter__(self) -> "SiteDiscovery":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def robots(self, site_url: str) -> RobotsPolicy:
+        """
+        Returns the robots.txt rules of the site of `site_url`, fetched once per
+        site. Its crawl-delay is applied to the limiter.
+        """
+        origin = _origin(site_url)
+        policy = self._robots.get(origin)
+        if policy is not None:
+            self._robots.move_to_end(origin)
+            return policy
+
+        parser = RobotFileParser(f"{origin}/robots.txt")
+        status = "found"
+        try:
+            with current_telemetry().stage("discovery.robots"):
+                async with self.limiter.limit(origin):
+                    response = await self._client().get(f"{origin}/robots.txt")
+        except httpx.HTTPError:
+            response = None
+
+        # The same rules RobotFileParser.read applies to missing and forbidden files
+        if response is None or (400 <= response.status_code < 500 and response.status_code not in (401, 403)):
+            parser.allow_all = True
+            status = "missing"
+        elif response.status_code in (401, 403) or response.status_code >= 500:
+            parser.disallow_all = True
+            status = "denied"
+        else:
+            parser.parse(response.text.splitlines())
+        parser.modified()
+
+        self.stats.robots += 1
+        self.stats.robots_missing += status != "found"
+        policy = RobotsPolicy(
+            parser=parser,
+            sitemaps=[urljoin(origin + "/", url) for url in parser.site_maps() or []],
+            status=status,
+            agent=self.robots_agent,
+        )
+        delay = parser.crawl_delay(self.robots_agent)
+        rate = parser.request_rate(self.robots_agent)
+        if rate is not None and rate.requests:
+            delay = max(float(delay or 0), rate.seconds / rate.requests)
+        if delay:
+            policy.crawl_delay = min(float(delay), self.max_delay)
+            self.limiter.set_delay(urlsplit(origin).hostname or "", policy.crawl_delay)
+            self.stats.crawl_delays += 1
+
+        self._robots[origin] = policy
+        if len(self._robots) > self.max_sites:
+            self._robots.popitem(last=False)
+        return policy
+
+    async def _read_sitemap(self, url: str) -> _SitemapParser | None:
+        parser = _SitemapParser(self.max_bytes)
+        try:
+            async with self.limiter.limit(url):
+                async with self._client().stream("GET", url) as response:
+                    if not response.is_success:
+                        return None
+                    async for chunk in response.aiter_bytes():
+                        parser.feed(chunk)
+            parser.close()
+        except (httpx.HTTPError, lxml.etree.XMLSyntaxError, zlib.error, ValueError):
+            return None
+        finally:
+            self.stats.bytes += parser.size
+        # Soft 404s answer the usual sitemap paths with an HTML page
+        return parser if parser.entries or parser.sitemaps else None
+
+    async def sitemap_urls(
+        self, site_url: str, priority: Callable[[str], float] | None = None
+    ) -> AsyncIterator[SitemapEntry]:
+        """
+        Yields the URLs in the sitemaps of the site of `site_url` that robots.txt
+        allows, at most `max_urls` of them from at most `max_sitemaps` sitemaps.
+
+        Child sitemaps of an index are read highest `priority` first, so a
+        caller after one kind of page can have the likeliest sitemap read
+        before the budget runs out.
+        """
+        policy = await self.robots(site_url)
+        if policy.status == "denied":
+            return
+
+        origin = _origin(site_url)
+        queue = list(policy.sitemaps) or [origin + path for path in DEFAULT_SITEMAPS]
+        # Only the first default path that exists is read
+        fallback = not policy.sitemaps
+        telemetry = current_telemetry()
+        queued = set(queue)
+        fetched = urls = 0
+        while queue and fetched < self.max_sitemaps and urls < self.max_urls:
+            sitemap_url = queue.pop(0)
+            fetched += 1
+            with telemetry.stage("discovery.sitemap"):
+                sitemap = await self._read_sitemap(sitemap_url)
+            telemetry.count("discovery.sitemaps", outcome="failed" if sitemap is None else "read")
+            if sitemap is None:
+                self.stats.sitemap_failures += 1
+                continue
+            self.stats.sitemaps += 1
+            if fallback:
+                queue, fallback = [], False
+
+            children = [url for url in sitemap.sitemaps if url not in queued]
+            queued.update(children)
+            queue.extend(children)
+            if priority is not None:
+                queue.sort(key=priority, reverse=True)
+
+            for entry in sitemap.entries:
+                if urls >= self.max_urls:
+                    break
+                if policy.allowed(entry.url):
+                    urls += 1
+                    self.stats.urls += 1
+                    yield entry
+        telemetry.count("discovery.urls", urls)
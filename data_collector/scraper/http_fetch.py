@@ -0,0 +1,280 @@
+import re
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+from urllib.parse import urljoin, urlsplit
+
+import httpx
+import lxml.etree
+import lxml.html
+from crawl4ai import DefaultMarkdownGenerator
+
+from ..telemetry import current_telemetry
+from .models import ScrapeResult
+
+if TYPE_CHECKING:
+    from .offload import ProcessOffload
+
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/131.0.0.0 Safari/537.36"
+)
+
+# Empty mount points of client side rendered apps
+SPA_ROOT_IDS = ("root", "app", "__next", "__nuxt", "svelte", "ember-app")
+NOSCRIPT_WALL = re.compile(r"enable javascript|javascript (is )?(required|disabled)|ota javascript käyttöön", re.I)
+MIN_TEXT_LENGTH = 200
+META_CHARSET = re.compile(rb"<meta[^>]+charset", re.I)
+
+_current_fetcher: ContextVar["HttpFetcher | None"] = ContextVar("current_http_fetcher", default=None)
+
+
+def current_fetcher() -> "HttpFetcher | None":
+    """
+    Returns the fetcher opened with `async with HttpFetcher()` in the current context, if any
+    """
+    return _current_fetcher.get()
+
+
+@dataclass(slots=True)
+class ParsedPage:
+    markdown: str = ""
+    internal_links: list[tuple[str, str]] = field(default_factory=list)
+    external_links: list[tuple[str, str]] = field(default_factory=list)
+    # Why the page looks client side rendered, None when the static HTML is usable
+    browser_reason: str | None = None
+
+
+def _site(host: str) -> str:
+    host = host.lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def _drop_scripts(doc: lxml.html.HtmlElement):
+    for node in doc.xpath("//script|//style|//noscript|//template"):
+        node.drop_tree()
+
+
+def _to_markdown(doc: lxml.html.HtmlElement, base_url: str) -> str:
+    result = DefaultMarkdownGenerator().generate_markdown(
+        input_html=lxml.html.tostring(doc, encoding="unicode"), base_url=base_url
+    )
+    return result.raw_markdown
+
+
+def response_encoding(response: httpx.Response) -> str | None:
+    """
+    Charset to decode an HTML body with: the Content-Type charset, else None
+    when the page declares its own in a meta tag, else UTF-8
+    """
+    if response.charset_encoding:
+        return response.charset_encoding
+    return None if META_CHARSET.search(response.content[:4096]) else "utf-8"
+
+
+def _document(html: str | bytes, encoding: str | None) -> lxml.html.HtmlElement:
+    parser = None
+    if encoding and isinstance(html, bytes):
+        try:
+            parser = lxml.html.HTMLParser(encoding=encoding)
+        except LookupError:
+            # A charset lxml doesn't know, let it sniff the body instead
+            parser = None
+    return lxml.html.fromstring(html, parser=parser)
+
+
+def html_to_markdown(html: str | bytes, base_url: str = "", encoding: str | None = None) -> str:
+    """
+    Converts the HTML of a page to markdown, leaving out scripts, styles and templates.
+    Bytes are decoded with `encoding`, or whatever charset lxml detects when None.
+    """
+    if not html or not html.strip():
+        return ""
+    try:
+        doc = _document(html, encoding)
+    except (lxml.etree.ParserError, ValueError):
+        return ""
+    _drop_scripts(doc)
+    return _to_markdown(doc, base_url)
+
+
+def parse_html(
+    html: str | bytes,
+    base_url: str,
+    markdown: bool = True,
+    browser_fallback: bool = True,
+    encoding: str | None = None,
+) -> ParsedPage:
+    """
+    Extracts links (and optionally markdown) from static HTML and checks whether
+    the page needs a browser to render its content.
+
+    With `browser_fallback` the markdown conversion is skipped for pages that
+    will be re-rendered in a browser anyway. Bytes are decoded with `encoding`
+    (see `response_encoding`), lxml only sniffs the charset when it is None.
+    """
+    if not html or not html.strip():
+        return ParsedPage(browser_reason="empty body")
+
+    try:
+        doc = _document(html, encoding)
+    except (lxml.etree.ParserError, ValueError):
+        return ParsedPage(browser_reason="unparseable html")
+    base = doc.find(".//base[@href]")
+    if base is not None:
+        base_url = urljoin(base_url, base.get("href"))
+    site = _site(urlsplit(base_url).hostname or "")
+
+    internal, external, seen = [], [], set()
+    for anchor in doc.iter("a"):
+        href = (anchor.get("href") or "").strip()
+        if not href or href.startswith(("#", "javascript:", "mailto:", "tel:")):
+            continue
+        href = urljoin(base_url, href)
+        if href in seen:
+            continue
+        seen.add(href)
+        text = " ".join(anchor.text_content().split())
+        is_internal = _site(urlsplit(href).hostname or "") == site
+        (internal if is_internal else external).append((href, text))
+
+    noscript_text = " ".join(node.text_content() for node in doc.iter("noscript"))
+    _drop_scripts(doc)
+
+    body = doc.find("body")
+    text = " ".join((body if body is not None else doc).text_content().split())
+
+    reason = None
+    if len(text) < MIN_TEXT_LENGTH:
+        reason = "noscript wall" if NOSCRIPT_WALL.search(noscript_text) else "empty body"
+    elif not seen:
+        reason = "no anchors"
+    elif len(seen) < 3 and any(
+        not " ".join(node.text_content().split()) for node in doc.xpath("//*[@id]") if node.get("id") in SPA_ROOT_IDS
+    ):
+        reason = "empty app root"
+
+    page = ParsedPage(internal_links=internal, external_links=external, browser_reason=reason)
+    if markdown and (reason is None or not browser_fallback):
+        page.markdown = _to_markdown(doc, base_url)
+    return page
+
+
+class HttpFetcher:
+    """
+    Pooled httpx client (HTTP/2 where the server supports it) for fetching static pages.
+
+        async with HttpFetcher():
+            links = await scrape_links(url, strategy="auto")
+    """
+
+    def __init__(
+        self,
+        timeout: float = 10.0,
+        max_connections: int = 100,
+        http2: bool = True,
+        user_agent: str = DEFAULT_USER_AGENT,
+    ):
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.http2 = http2
+        self.user_agent = user_agent
+        self._client: httpx.AsyncClient | None = None
+        self._context_token = None
+
+    async def open(self):
+        if self._client is not None:
+            return
+        self._client = httpx.AsyncClient(
+            http2=self.http2,
+            follow_redirects=True,
+            timeout=self.timeout,
+            limits=httpx.Limits(max_connections=self.max_connections),
+            headers={"User-Agent": self.user_agent, "Accept": "text/html,application/xhtml+xml"},
+        )
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def __aenter__(self) -> "HttpFetcher":
+        await self.open()
+        self._context_token = _current_fetcher.set(self)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        if self._context_token is not None:
+            _current_fetcher.reset(self._context_token)
+            self._context_token = None
+        await self.close()
+
+    async def fetch(
+        self,
+        url: str,
+        markdown: bool = True,
+        browser_fallback: bool = True,
+        html: bool = False,
+        offload: "ProcessOffload | None" = None,
+    ) -> tuple[ScrapeResult, str | None]:
+        """
+        GETs and parses `url`. Returns the result and the reason the page should
+        be rendered in a browser instead, or None if the static HTML was enough.
+        With `html` the response body is kept in the result. With `offload` the
+        body is parsed in its process pool.
+        """
+        await self.open()
+        telemetry = current_telemetry()
+        started = time.perf_counter()
+        try:
+            with telemetry.stage("scrape.http"):
+                response = await self._client.get(url)
+        except (httpx.HTTPError, httpx.InvalidURL, ValueError) as e:
+            result = ScrapeResult(
+                url=url,
+                final_url=url,
+                success=False,
+                elapsed=time.perf_counter() - started,
+                error=str(e) or type(e).__name__,
+                fetch_mode="http",
+            )
+            # A URL httpx can't even build a request for won't render in a browser either
+            return result, "request failed" if isinstance(e, httpx.HTTPError) else None
+
+        result = ScrapeResult(
+            url=url,
+            final_url=str(response.url),
+            success=response.is_success,
+            status_code=response.status_code,
+            headers=dict(response.headers),
+            fetch_mode="http",
+        )
+        telemetry.count("scrape.bytes", len(response.content), mode="http")
+        content_type = response.headers.get("content-type", "")
+        if not response.is_success:
+            result.error = f"HTTP {response.status_code}"
+            reason = "http error"
+        elif "html" not in content_type:
+            result.success = False
+            result.error = f"Unsupported content type {content_type}"
+            reason = "not html"
+        else:
+            # lxml would ignore the Content-Type charset of the raw bytes
+            encoding = response_encoding(response)
+            with telemetry.stage("scrape.parse", markdown=markdown):
+                if offload is not None:
+                    page = await offload.parse_html(
+                        response.content, result.final_url, markdown, browser_fallback, encoding
+                    )
+                else:
+                    page = parse_html(response.content, result.final_url, markdown, browser_fallback, encoding)
+            result.markdown = page.markdown
+            result.internal_links = page.internal_links
+            result.external_links = page.external_links
+            reason = page.browser_reason
+            if html:
+                result.html = response.text
+
+        result.elapsed = time.perf_counter() - started
+        return result, reason
@@ -0,0 +1,313 @@
+import asyncio
+import time
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Literal
+
+import aiosqlite
+import httpx
+import orjson
+import xxhash
+
+from .cache import is_not_modified
+from .models import ScrapeResult
+from .pruning import MARKDOWN_LINK
+from .scrape import _iterate, scrape_page
+from .urls import canonicalize_url
+
+PageStatus = Literal["new", "not_modified", "unchanged", "changed", "failed"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fingerprints (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    simhash TEXT NOT NULL,
+    links_hash TEXT NOT NULL,
+    listings BLOB NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    checked_at REAL NOT NULL
+);
+"""
+
+
+def simhash(text: str, shingle_size: int = 3) -> int:
+    """
+    64 bit SimHash of the visible words of the markdown `text` in `shingle_size` word
+    shingles. Near duplicate texts differ in only a few bits.
+    """
+    words = MARKDOWN_LINK.sub(r"\1", text).lower().split()
+    weights = [0] * 64
+    for start in range(max(len(words) - shingle_size + 1, 1)):
+        shingle_hash = xxhash.xxh3_64_intdigest(" ".join(words[start : start + shingle_size]).encode())
+        for bit in range(64):
+            weights[bit] += 1 if shingle_hash >> bit & 1 else -1
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def links_hash(links: Iterable[tuple[str, str]]) -> int:
+    """
+    Hash of the set of canonical link targets, independent of their order and anchor texts
+    """
+    return xxhash.xxh3_64_intdigest("\n".join(sorted({canonicalize_url(href) for href, _ in links})).encode())
+
+
+@dataclass(slots=True)
+class PageFingerprint:
+    url: str
+    simhash: int
+    links_hash: int
+    # (href, text) of the listings on the page when it was last checked
+    listings: list[tuple[str, str]] = field(default_factory=list)
+    etag: str | None = None
+    last_modified: str | None = None
+    checked_at: float = 0.0
+
+
+@dataclass(slots=True)
+class PageDiff:
+    """
+    What changed on one page since the previous scan
+    """
+    url: str
+    # "not_modified" pages were skipped on a 304 before rendering, "unchanged"
+    # ones rendered to the same fingerprint
+    status: PageStatus
+    added: list[tuple[str, str]] = field(default_factory=list)
+    removed: list[tuple[str, str]] = field(default_factory=list)
+    # Hamming distance between the old and new SimHash, None without both
+    distance: int | None = None
+    error: str | None = None
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.added or self.removed)
+
+
+@dataclass(slots=True)
+class IncrementalStats:
+    pages: int = 0
+    new: int = 0
+    not_modified: int = 0
+    unchanged: int = 0
+    changed: int = 0
+    failed: int = 0
+    added: int = 0
+    removed: int = 0
+
+    @property
+    def skipped(self) -> int:
+        return self.not_modified + self.unchanged
+
+
+class FingerprintStore:
+    """
+    SQLite store of the last fingerprint and listings of every rescanned page,
+    keyed by canonical URL
+    """
+
+    def __init__(self, path: str = "fingerprints.sqlite"):
+        self.path = path
+        self._db: aiosqlite.Connection | None = None
+
+    async def open(self):
+        if self._db is not None:
+            return
+        self._db = await aiosqlite.connect(self.path)
+        await self._db.executescript(_SCHEMA)
+        await self._db.commit()
+
+    async def close(self):
+        if self._db is not None:
+            await self._db.close()
+            self._db = None
+
+    async def __aenter__(self) -> "FingerprintStore":
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def get(self, url: str) -> PageFingerprint | None:
+        async with self._db.execute(
+            "SELECT url, simhash, links_hash, listings, etag, last_modified, checked_at FROM fingerprints WHERE key = ?",
+            (canonicalize_url(url),),
+        ) as cursor:
+            row = await cursor.fetchone()
+        if row is None:
+            return None
+        url, page_simhash, page_links_hash, listings, etag, last_modified, checked_at = row
+        return PageFingerprint(
+            url=url,
+            simhash=int(page_simhash, 16),
+            links_hash=int(page_links_hash, 16),
+            listings=[tuple(listing) for listing in orjson.loads(listings)],
+            etag=etag,
+            last_modified=last_modified,
+            checked_at=checked_at,
+        )
+
+    async def put(self, fingerprint: PageFingerprint):
+        # Hex text, SQLite integers are signed and can't hold every 64 bit hash
+        await self._db.execute(
+            "INSERT OR REPLACE INTO fingerprints VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                canonicalize_url(fingerprint.url), fingerprint.url, f"{fingerprint.simhash:016x}",
+                f"{fingerprint.links_hash:016x}", orjson.dumps(fingerprint.listings), fingerprint.etag,
+                fingerprint.last_modified, fingerprint.checked_at,
+            ),
+        )
+        await self._db.commit()
+
+    async def touch(self, url: str):
+        await self._db.execute(
+            "UPDATE fingerprints SET checked_at = ? WHERE key = ?", (time.time(), canonicalize_url(url))
+        )
+        await self._db.commit()
+
+
+class IncrementalCrawler:
+    """
+    Rescans known pages and reports only the listings added or removed since
+    the previous scan.
+
+    A page whose server answers a conditional GET with 304 is skipped before it
+    is rendered. Otherwise it is scraped and fingerprinted with a SimHash of its
+    markdown and a hash of its link set; a page whose links are the same and
+    whose SimHash is within `max_distance` bits counts as unchanged. Only
+    changed pages have their listings compared. `is_listing` picks the links
+    that are listings (default: every internal link).
+
+        async with FingerprintStore("fingerprints.sqlite") as store:
+            crawler = IncrementalCrawler(store, is_listing=lambda href, text: "/jobs/" in href)
+            async for diff in crawler.rescan_many(career_pages):
+                if diff.has_changes:
+                    notify(diff.url, diff.added, diff.removed)
+
+    Rescans read through the current PageCache if one is open, so its `ttl`
+    should be shorter than the rescan interval.
+    """
+
+    def __init__(
+        self,
+        store: FingerprintStore,
+        max_distance: int = 3,
+        is_listing: Callable[[str, str], bool] | None = None,
+        scrape: Callable[..., Awaitable[ScrapeResult]] = scrape_page,
+        client: httpx.AsyncClient | None = None,
+        conditional_get: bool = True,
+    ):
+        self.store = store
+        self.max_distance = max_distance
+        self.is_listing = is_listing
+        self.scrape = scrape
+        self.client = client
+        self._own_client = client is None
+        self.conditional_get = conditional_get
+        self.stats = IncrementalStats()
+
+    async def _is_not_modified(self, url: str, previous: PageFingerprint) -> bool:
+        if not (previous.etag or previous.last_modified):
+            return False
+        if self.client is None:
+            self.client = httpx.AsyncClient(follow_redirects=True, timeout=10.0)
+        return await is_not_modified(self.client, url, previous.etag, previous.last_modified)
+
+    def _listings(self, result: ScrapeResult) -> list[tuple[str, str]]:
+        listings: dict[str, tuple[str, str]] = {}
+        for href, text in result.internal_links:
+            if self.is_listing is None or self.is_listing(href, text):
+                listings.setdefault(canonicalize_url(href), (href, text))
+        return list(listings.values())
+
+    def _count(self, diff: PageDiff) -> PageDiff:
+        self.stats.pages += 1
+        setattr(self.stats, diff.status, getattr(self.stats, diff.status) + 1)
+        self.stats.added += len(diff.added)
+        self.stats.removed += len(diff.removed)
+        return diff
+
+    async def rescan(self, url: str, **scrape_kwargs) -> PageDiff:
+        """
+        Scans `url` again and diffs its listings against the stored ones. A page
+        seen for the first time reports all its listings as added.
+        """
+        previous = await self.store.get(url)
+        if previous is not None and self.conditional_get and await self._is_not_modified(url, previous):
+            await self.store.touch(url)
+            return self._count(PageDiff(url=url, status="not_modified", distance=0))
+
+        result = await self.scrape(url, **scrape_kwargs)
+        if not result.success:
+            return self._count(PageDiff(url=url, status="failed", error=result.error))
+
+        headers = {name.lower(): value for name, value in result.headers.items()}
+        fingerprint = PageFingerprint(
+            url=url,
+            simhash=simhash(result.markdown),
+            links_hash=links_hash(result.links),
+            listings=self._listings(result),
+            etag=headers.get("etag"),
+            last_modified=headers.get("last-modified"),
+            checked_at=time.time(),
+        )
+        await self.store.put(fingerprint)
+
+        if previous is None:
+            return self._count(PageDiff(url=url, status="new", added=fingerprint.listings))
+
+        distance = hamming_distance(previous.simhash, fingerprint.simhash)
+        if previous.links_hash == fingerprint.links_hash and distance <= self.max_distance:
+            return self._count(PageDiff(url=url, status="unchanged", distance=distance))
+
+        old = {canonicalize_url(href): (href, text) for href, text in previous.listings}
+        new = {canonicalize_url(href): (href, text) for href, text in fingerprint.listings}
+        return self._count(
+            PageDiff(
+                url=url,
+                status="changed",
+                added=[listing for key, listing in new.items() if key not in old],
+                removed=[listing for key, listing in old.items() if key not in new],
+                distance=distance,
+            )
+        )
+
+    async def rescan_many(
+        self, urls: Iterable[str] | AsyncIterable[str], concurrency: int = 8, **scrape_kwargs
+    ) -> AsyncIterator[PageDiff]:
+        """
+        Rescans `urls` concurrently and yields their diffs as they finish.
+        `urls` is consumed lazily with at most `concurrency` rescans pending.
+        """
+        source = _iterate(urls)
+        pending: set[asyncio.Task] = set()
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(pending) < concurrency:
+                    try:
+                        url = await anext(source)
+                    except StopAsyncIteration:
+                        exhausted = True
+                        break
+                    pending.add(asyncio.create_task(self.rescan(url, **scrape_kwargs)))
+
+                if not pending:
+                    break
+
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def close(self):
+        if self._own_client and self.client is not None:
+            await self.client.aclose()
+            self.client = None
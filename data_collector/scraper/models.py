@@ -0,0 +1,27 @@
+from dataclasses import dataclass, field
+
+
+@dataclass(slots=True)
+class ScrapeResult:
+    """
+    Everything one render of a page produced
+    """
+    url: str
+    final_url: str
+    success: bool
+    status_code: int | None = None
+    markdown: str = ""
+    internal_links: list[tuple[str, str]] = field(default_factory=list)
+    external_links: list[tuple[str, str]] = field(default_factory=list)
+    elapsed: float = 0.0
+    error: str | None = None
+    headers: dict[str, str] = field(default_factory=dict)
+    from_cache: bool = False
+    # "browser" or "http", whichever produced the result
+    fetch_mode: str = "browser"
+    # Raw HTML, only kept when asked for with scrape_page(html=True)
+    html: str = ""
+
+    @property
+    def links(self) -> list[tuple[str, str]]:
+        return self.internal_links + self.external_links
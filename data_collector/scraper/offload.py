@@ -0,0 +1,160 @@
+import asyncio
+import multiprocessing
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import partial
+from typing import TypeVar
+
+from ..telemetry import current_telemetry
+from .http_fetch import ParsedPage, html_to_markdown, parse_html
+from .pruning import ContentFilter, analyze_blocks
+
+T = TypeVar("T")
+
+_current_offload: ContextVar["ProcessOffload | None"] = ContextVar("current_process_offload", default=None)
+
+
+def current_offload() -> "ProcessOffload | None":
+    """
+    Returns the offload opened with `async with ProcessOffload()` in the current context, if any
+    """
+    return _current_offload.get()
+
+
+@dataclass(slots=True)
+class OffloadStats:
+    # Tasks run in the pool and run inline because they were too small to be worth shipping
+    offloaded: int = 0
+    inline: int = 0
+    # HTML and markdown bytes sent to the workers
+    bytes_sent: int = 0
+
+
+def _start_method() -> str:
+    # Forking a process that runs an event loop, browsers and client threads is
+    # asking for deadlocks, a forkserver starts workers from a clean process
+    return "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+class ProcessOffload:
+    """
+    Process pool for the CPU bound steps of scraping: HTML parsing, link
+    extraction, HTML to markdown conversion, boilerplate pruning and link
+    scoring. The event loop keeps driving browsers and sockets while the
+    workers use the other cores.
+
+    Raw HTML is handed over as the bytes the server sent, never decoded into a
+    str on the event loop, and only the results (links, markdown, block
+    verdicts) come back. Inputs smaller than `min_bytes` are processed inline,
+    as shipping them costs more than parsing them.
+
+        async with ProcessOffload(max_workers=8):
+            async for result in scrape_many(urls, strategy="auto"):
+                ...
+    """
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        min_bytes: int = 32 * 1024,
+        max_tasks_per_child: int | None = 1000,
+        start_method: str | None = None,
+    ):
+        self.max_workers = max_workers
+        self.min_bytes = min_bytes
+        # Recycles workers now and then, lxml and the markdown converter grow their heaps over time
+        self.max_tasks_per_child = max_tasks_per_child
+        self.start_method = start_method or _start_method()
+        self.stats = OffloadStats()
+        self._executor: ProcessPoolExecutor | None = None
+        self._context_token = None
+
+    def start(self):
+        if self._executor is not None:
+            return
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context(self.start_method),
+            # Forked workers can't be recycled
+            max_tasks_per_child=self.max_tasks_per_child if self.start_method != "fork" else None,
+        )
+
+    async def close(self):
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+
+    async def __aenter__(self) -> "ProcessOffload":
+        self.start()
+        self._context_token = _current_offload.set(self)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        if self._context_token is not None:
+            _current_offload.reset(self._context_token)
+            self._context_token = None
+        await self.close()
+
+    def worth_offloading(self, size: int) -> bool:
+        return size >= self.min_bytes
+
+    async def run(self, stage: str, size: int, fn: Callable[..., T], *args) -> T:
+        """
+        Runs `fn(*args)` in a worker when `size` bytes are worth shipping, inline
+        otherwise. `fn` and its arguments must be picklable.
+        """
+        telemetry = current_telemetry()
+        if not self.worth_offloading(size):
+            self.stats.inline += 1
+            telemetry.count("offload.tasks", stage=stage, where="inline")
+            return fn(*args)
+
+        self.start()
+        self.stats.offloaded += 1
+        self.stats.bytes_sent += size
+        telemetry.count("offload.tasks", stage=stage, where="pool")
+        telemetry.count("offload.bytes", size, stage=stage)
+        with telemetry.stage("offload.run", stage=stage):
+            return await asyncio.get_running_loop().run_in_executor(self._executor, partial(fn, *args))
+
+    async def parse_html(
+        self,
+        html: bytes,
+        base_url: str,
+        markdown: bool = True,
+        browser_fallback: bool = True,
+        encoding: str | None = None,
+    ) -> ParsedPage:
+        """
+        `parse_html` in a worker: links, markdown and the browser fallback verdict of static HTML
+        """
+        return await self.run("parse", len(html), parse_html, html, base_url, markdown, browser_fallback, encoding)
+
+    async def markdown(self, html: str | bytes, base_url: str = "") -> str:
+        """
+        Converts rendered HTML to markdown in a worker
+        """
+        encoding = None
+        if isinstance(html, str):
+            # Encoded once here, pickling a str would do the same work anyway.
+            # The encoding is passed along so lxml doesn't guess it from the bytes.
+            html, encoding = html.encode("utf-8"), "utf-8"
+        return await self.run("markdown", len(html), html_to_markdown, html, base_url, encoding)
+
+    async def prune(self, content_filter: ContentFilter, markdown: str, url: str = "") -> str:
+        """
+        Prunes `markdown` with `content_filter`. The per-block rules run in a
+        worker, the rules that remember blocks across pages on the event loop.
+        """
+        blocks = await self.run(
+            "prune",
+            len(markdown),
+            analyze_blocks,
+            markdown,
+            content_filter.keyword_pattern,
+            content_filter.max_link_density,
+            content_filter.max_boilerplate_length,
+        )
+        return content_filter.prune(markdown, url, blocks=blocks)
@@ -0,0 +1,188 @@
+import asyncio
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+
+from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig
+
+from ..telemetry import current_telemetry
+from .profiles import install_hooks
+
+# Error fragments Playwright raises when the underlying browser process died
+BROWSER_CRASH_MARKERS = (
+    "target closed",
+    "target page, context or browser has been closed",
+    "browser has been closed",
+    "browser has disconnected",
+    "connection closed",
+)
+
+_current_pool: ContextVar["CrawlerPool | None"] = ContextVar("current_crawler_pool", default=None)
+
+
+def current_pool() -> "CrawlerPool | None":
+    """
+    Returns the pool opened with `async with CrawlerPool()` in the current context, if any
+    """
+    return _current_pool.get()
+
+
+def is_browser_crash(error: BaseException | str | None) -> bool:
+    message = str(error or "").lower()
+    return any(marker in message for marker in BROWSER_CRASH_MARKERS)
+
+
+class _BrowserSlot:
+    """
+    One started AsyncWebCrawler (= one Chromium process) and its bookkeeping
+    """
+
+    def __init__(self, browser_config: BrowserConfig | None):
+        self.browser_config = browser_config
+        self.crawler: AsyncWebCrawler | None = None
+        self.pages_served = 0
+        self.in_flight = 0
+        self.generation = 0
+        self.lock = asyncio.Lock()
+
+    async def start(self):
+        self.crawler = AsyncWebCrawler(config=self.browser_config)
+        install_hooks(self.crawler)
+        with current_telemetry().stage("browser.launch"):
+            await self.crawler.start()
+        self.pages_served = 0
+        self.generation += 1
+
+    async def close(self):
+        crawler, self.crawler = self.crawler, None
+        if crawler is not None:
+            try:
+                await crawler.close()
+            except Exception:
+                # The browser is usually already gone when we get here
+                pass
+
+    def is_healthy(self) -> bool:
+        if self.crawler is None:
+            return False
+        strategy = getattr(self.crawler, "crawler_strategy", None)
+        manager = getattr(strategy, "browser_manager", None)
+        browser = getattr(manager, "browser", None)
+        # Persistent/CDP setups have no Browser object to ask, trust them
+        return browser is None or browser.is_connected()
+
+
+class CrawlerPool:
+    """
+    Long-lived pool of started browsers shared by the scrape functions.
+
+    `browsers` Chromium processes are launched once and each serves up to
+    `tabs_per_browser` pages concurrently. A browser that crashed or has served
+    `max_pages_per_browser` pages is closed and relaunched on its next use.
+
+        async with CrawlerPool(browsers=2, tabs_per_browser=4):
+            markdown = await scrape_page_markdown(url)  # uses the pool
+    """
+
+    def __init__(
+        self,
+        browsers: int = 1,
+        tabs_per_browser: int = 4,
+        browser_config: BrowserConfig | None = None,
+        max_pages_per_browser: int = 500,
+    ):
+        if browsers < 1 or tabs_per_browser < 1:
+            raise ValueError("browsers and tabs_per_browser must be at least 1")
+
+        self.browser_config = browser_config
+        self.tabs_per_browser = tabs_per_browser
+        self.max_pages_per_browser = max_pages_per_browser
+        self.recycled = 0
+
+        self._slots = [_BrowserSlot(browser_config) for _ in range(browsers)]
+        self._tabs: asyncio.Queue[int] | None = None
+        self._context_token = None
+
+    @property
+    def size(self) -> int:
+        return len(self._slots) * self.tabs_per_browser
+
+    async def start(self):
+        if self._tabs is not None:
+            return
+        await asyncio.gather(*(slot.start() for slot in self._slots))
+        self._tabs = asyncio.Queue()
+        # Interleave so consecutive acquires spread over browsers
+        for _ in range(self.tabs_per_browser):
+            for index in range(len(self._slots)):
+                self._tabs.put_nowait(index)
+
+    async def close(self):
+        self._tabs = None
+        await asyncio.gather(*(slot.close() for slot in self._slots))
+
+    async def __aenter__(self) -> "CrawlerPool":
+        await self.start()
+        self._context_token = _current_pool.set(self)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        if self._context_token is not None:
+            _current_pool.reset(self._context_token)
+            self._context_token = None
+        await self.close()
+
+    async def _recycle(self, slot: _BrowserSlot, generation: int):
+        async with slot.lock:
+            # Another tab already replaced this browser
+            if slot.generation != generation and slot.crawler is not None:
+                return
+            await slot.close()
+            await slot.start()
+            self.recycled += 1
+            current_telemetry().count("browser.recycled")
+
+    @asynccontextmanager
+    async def acquire(self):
+        """
+        Borrows one tab slot and yields a healthy, started AsyncWebCrawler
+        """
+        if self._tabs is None:
+            raise RuntimeError("CrawlerPool is not started, use `async with CrawlerPool()`")
+
+        index = await self._tabs.get()
+        slot = self._slots[index]
+        try:
+            if not slot.is_healthy() or (
+                slot.pages_served >= self.max_pages_per_browser and slot.in_flight == 0
+            ):
+                await self._recycle(slot, slot.generation)
+
+            slot.in_flight += 1
+            try:
+                yield slot
+            finally:
+                slot.in_flight -= 1
+                slot.pages_served += 1
+        finally:
+            if self._tabs is not None:
+                self._tabs.put_nowait(index)
+
+    async def arun(self, url: str, config: CrawlerRunConfig | None = None, retries: int = 1):
+        """
+        Runs `crawler.arun` on a pooled browser, relaunching it once if it crashed
+        """
+        for attempt in range(retries + 1):
+            async with self.acquire() as slot:
+                generation = slot.generation
+                try:
+                    result = await slot.crawler.arun(url=url, config=config)
+                except Exception as e:
+                    if attempt < retries and (is_browser_crash(e) or not slot.is_healthy()):
+                        await self._recycle(slot, generation)
+                        continue
+                    raise
+
+                if not result.success and attempt < retries and is_browser_crash(result.error_message):
+                    await self._recycle(slot, generation)
+                    continue
+                return result
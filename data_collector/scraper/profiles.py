@@ -0,0 +1,145 @@
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+from crawl4ai import AsyncWebCrawler
+
+# Key of the blocking rules in CrawlerRunConfig.shared_data, read by the before_goto hook
+SHARED_DATA_KEY = "resource_blocking"
+
+# Analytics, tag managers, ad and chat widgets: never needed to read a page
+TRACKER_DOMAINS = frozenset({
+    "google-analytics.com", "googletagmanager.com", "googleadservices.com", "doubleclick.net",
+    "googlesyndication.com", "facebook.net", "connect.facebook.net", "hotjar.com", "clarity.ms",
+    "licdn.com", "ads.linkedin.com", "hs-analytics.net", "hs-scripts.com", "hsforms.net",
+    "leadinfo.net", "leadfeeder.com", "snitcher.com", "intercom.io", "intercomcdn.com",
+    "zdassets.com", "tawk.to", "giosg.com", "cookiebot.com", "consent.cookiebot.com",
+    "cookielaw.org", "onetrust.com", "matomo.cloud", "sentry.io", "nr-data.net", "newrelic.com",
+    "segment.io", "segment.com", "mixpanel.com", "analytics.tiktok.com", "bat.bing.com",
+    "adform.net", "criteo.com", "taboola.com",
+})
+
+
+@dataclass(frozen=True, slots=True)
+class RenderProfile:
+    """
+    How much of a page the browser loads and how long it waits for it.
+
+    `blocked_resource_types` are Playwright resource types ("image", "media",
+    "font", "stylesheet", ...) aborted before they are requested, as is every
+    request to `blocked_domains` (or their subdomains). With
+    `block_third_party_frames` iframes from other sites aren't loaded either.
+    """
+    name: str
+    blocked_resource_types: frozenset[str] = frozenset()
+    blocked_domains: frozenset[str] = frozenset()
+    block_third_party_frames: bool = False
+    # None keeps crawl4ai's default for each of these
+    wait_until: str | None = None
+    page_timeout: int | None = None
+    delay_before_return_html: float | None = None
+    screenshot: bool = False
+    extra_options: dict = field(default_factory=dict, hash=False, compare=False)
+
+    @property
+    def blocks_requests(self) -> bool:
+        return bool(self.blocked_resource_types or self.blocked_domains or self.block_third_party_frames)
+
+    def run_options(self) -> dict:
+        """
+        CrawlerRunConfig keyword arguments of the profile, empty for crawl4ai's defaults
+        """
+        options = dict(self.extra_options)
+        for name in ("wait_until", "page_timeout", "delay_before_return_html"):
+            value = getattr(self, name)
+            if value is not None:
+                options[name] = value
+        if self.screenshot:
+            options["screenshot"] = True
+        if self.blocks_requests:
+            # Plain data, the config may be cloned or serialized on its way to the hook
+            options["shared_data"] = {
+                SHARED_DATA_KEY: {
+                    "resource_types": sorted(self.blocked_resource_types),
+                    "domains": sorted(self.blocked_domains),
+                    "third_party_frames": self.block_third_party_frames,
+                }
+            }
+        return options
+
+
+# Everything loaded, what scrape_page always did
+FULL = RenderProfile("full")
+# Only the DOM is needed to read anchors: no images, media, fonts, styles,
+# trackers or third party iframes, and no waiting past DOMContentLoaded
+LINKS_ONLY = RenderProfile(
+    "links_only",
+    blocked_resource_types=frozenset({"image", "media", "font", "stylesheet", "texttrack", "eventsource", "websocket", "manifest"}),
+    blocked_domains=TRACKER_DOMAINS,
+    block_third_party_frames=True,
+    wait_until="domcontentloaded",
+    page_timeout=30_000,
+    delay_before_return_html=0.0,
+)
+
+
+def _host(url: str) -> str:
+    return (urlsplit(url).hostname or "").lower()
+
+
+def _site(host: str) -> str:
+    # Last two labels, close enough to tell first from third party frames
+    return ".".join(host.rsplit(".", 2)[-2:])
+
+
+def _is_blocked_domain(host: str, domains: frozenset[str]) -> bool:
+    while host:
+        if host in domains:
+            return True
+        host = host.partition(".")[2]
+    return False
+
+
+async def block_resources(page, context=None, url: str = "", config=None, **kwargs):
+    """
+    crawl4ai before_goto hook that aborts the requests the run config's render
+    profile blocks. Pages rendered without blocking rules are left alone.
+    """
+    rules = (getattr(config, "shared_data", None) or {}).get(SHARED_DATA_KEY)
+    if not rules:
+        return page
+
+    resource_types = frozenset(rules["resource_types"])
+    domains = frozenset(rules["domains"])
+    third_party_frames = rules["third_party_frames"]
+    page_site = _site(_host(url))
+
+    def is_blocked(request) -> bool:
+        host = _host(request.url)
+        if request.resource_type in resource_types:
+            return True
+        # Documents are the page itself or a frame, which only the frame rule may block
+        if request.resource_type != "document":
+            return _is_blocked_domain(host, domains)
+        if third_party_frames and _site(host) != page_site:
+            try:
+                return request.frame.parent_frame is not None
+            except Exception:
+                # Service worker requests have no frame
+                return False
+        return False
+
+    async def route(route):
+        if is_blocked(route.request):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    await page.route("**/*", route)
+    return page
+
+
+def install_hooks(crawler: AsyncWebCrawler):
+    """
+    Lets `crawler` honor the resource blocking of render profiles
+    """
+    crawler.crawler_strategy.set_hook("before_goto", block_resources)
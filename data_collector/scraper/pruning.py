@@ -0,0 +1,231 @@
+import re
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+import xxhash
+
+MARKDOWN_LINK = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+HEADING = re.compile(r"^#{1,6}\s")
+BOILERPLATE = re.compile(
+    r"cookie|evästee|consent|privacy policy|tietosuoja|all rights reserved|kaikki oikeudet|©|copyright|"
+    r"subscribe to our newsletter|tilaa uutiskirje|skip to (main )?content|siirry sisältöön",
+    re.I,
+)
+
+
+@dataclass(slots=True)
+class PruningStats:
+    pages: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    blocks_kept: int = 0
+    blocks_dropped: int = 0
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.bytes_in - self.bytes_out
+
+    @property
+    def saved_ratio(self) -> float:
+        return self.bytes_saved / self.bytes_in if self.bytes_in else 0.0
+
+
+@dataclass(slots=True)
+class _SiteBlocks:
+    # Block hash -> number of pages of the site it appeared on
+    counts: dict[int, int] = field(default_factory=dict)
+    # Page hash -> the block hashes it added to `counts`
+    pages: dict[int, frozenset[int]] = field(default_factory=dict)
+
+    def forget_page(self, page: int):
+        for fingerprint in self.pages.pop(page, ()):
+            count = self.counts.get(fingerprint, 0) - 1
+            if count > 0:
+                self.counts[fingerprint] = count
+            else:
+                self.counts.pop(fingerprint, None)
+
+
+def iter_blocks(markdown: str) -> Iterator[str]:
+    """
+    Yields the blank line separated blocks of `markdown`, starting a new block at every heading
+    """
+    block: list[str] = []
+    for line in markdown.splitlines():
+        if not line.strip() or HEADING.match(line):
+            if block:
+                yield "\n".join(block)
+                block = []
+            if not line.strip():
+                continue
+        block.append(line)
+    if block:
+        yield "\n".join(block)
+
+
+def _visible_text(block: str) -> str:
+    return MARKDOWN_LINK.sub(r"\1", block)
+
+
+def _fingerprint(text: str) -> int:
+    return xxhash.xxh3_64_intdigest(" ".join(text.lower().split()).encode())
+
+
+@dataclass(slots=True)
+class Block:
+    """
+    One markdown block with the verdicts that don't depend on other pages
+    """
+    markdown: str
+    fingerprint: int
+    heading: bool
+    # Mentions a keyword in its visible text
+    relevant: bool
+    boilerplate: bool
+
+
+def _analyze_block(
+    block: str, keyword_pattern: re.Pattern | None, max_link_density: float, max_boilerplate_length: int
+) -> Block:
+    text = _visible_text(block)
+    heading = HEADING.match(block) is not None
+    relevant = keyword_pattern is not None and keyword_pattern.search(text) is not None
+
+    # A menu with a "Careers" link is still a menu, so only keywords outside links count here
+    boilerplate = False
+    if not heading and (keyword_pattern is None or keyword_pattern.search(MARKDOWN_LINK.sub("", block)) is None):
+        link_text = sum(len(match.group(1)) for match in MARKDOWN_LINK.finditer(block))
+        stripped = text.strip()
+        boilerplate = (bool(stripped) and link_text / len(stripped) > max_link_density) or (
+            len(text) <= max_boilerplate_length and BOILERPLATE.search(text) is not None
+        )
+    return Block(block, _fingerprint(text), heading, relevant, boilerplate)
+
+
+def analyze_blocks(
+    markdown: str,
+    keyword_pattern: re.Pattern | None = None,
+    max_link_density: float = 0.6,
+    max_boilerplate_length: int = 400,
+) -> list[Block]:
+    """
+    Splits `markdown` into blocks and judges each on its own, see ContentFilter.analyze
+    """
+    return [
+        _analyze_block(block, keyword_pattern, max_link_density, max_boilerplate_length)
+        for block in iter_blocks(markdown)
+    ]
+
+
+class ContentFilter:
+    """
+    Drops boilerplate from page markdown block by block before it is stored or
+    sent anywhere: link heavy blocks (menus, link lists), cookie banners and
+    footers, and blocks already seen on another page of the same site.
+
+    Blocks mentioning one of `keywords` outside their links survive the density
+    and boilerplate rules, and blocks mentioning one anywhere survive repetition
+    across pages. Pruning the same page again doesn't count it against itself.
+    With `relevant_only=True` only the heading delimited sections that
+    mention a keyword are kept at all. Only block hashes are remembered between
+    pages, for at most `max_sites` sites.
+
+        content_filter = ContentFilter(keywords=CAREER_PAGE_KEYWORDS)
+        markdown = await scrape_page_markdown(url, content_filter=content_filter)
+        print(content_filter.stats.bytes_saved)
+    """
+
+    def __init__(
+        self,
+        keywords: Iterable[str] = (),
+        relevant_only: bool = False,
+        max_link_density: float = 0.6,
+        max_boilerplate_length: int = 400,
+        min_repeats: int = 1,
+        max_sites: int = 1024,
+        max_blocks_per_site: int = 4096,
+    ):
+        keywords = sorted({keyword.lower() for keyword in keywords if keyword}, key=len, reverse=True)
+        self.keyword_pattern = re.compile("|".join(map(re.escape, keywords)), re.I) if keywords else None
+        self.relevant_only = relevant_only and self.keyword_pattern is not None
+        self.max_link_density = max_link_density
+        self.max_boilerplate_length = max_boilerplate_length
+        self.min_repeats = min_repeats
+        self.max_sites = max_sites
+        self.max_blocks_per_site = max_blocks_per_site
+        self.stats = PruningStats()
+        self._sites: OrderedDict[str, _SiteBlocks] = OrderedDict()
+
+    def _site_blocks(self, url: str) -> _SiteBlocks:
+        host = (urlsplit(url).hostname or "").lower().removeprefix("www.")
+        site = self._sites.get(host)
+        if site is None:
+            site = self._sites[host] = _SiteBlocks()
+            if len(self._sites) > self.max_sites:
+                self._sites.popitem(last=False)
+        else:
+            self._sites.move_to_end(host)
+        return site
+
+    def analyze(self, markdown: str) -> list[Block]:
+        """
+        Splits `markdown` into blocks and runs the rules that need no memory of
+        other pages. Touches no state, so it can run in another process.
+        """
+        return analyze_blocks(markdown, self.keyword_pattern, self.max_link_density, self.max_boilerplate_length)
+
+    def filter_blocks(self, blocks: Iterable[str | Block], url: str = "") -> Iterator[str]:
+        """
+        Yields the blocks of one page worth keeping, consuming `blocks` lazily
+        """
+        site = self._site_blocks(url)
+        page = _fingerprint(url)
+        # A page pruned again takes back what it counted last time, so its own blocks aren't repeats
+        site.forget_page(page)
+        counted: set[int] = set()
+        on_page: set[int] = set()
+        section_relevant = not self.relevant_only
+
+        try:
+            for block in blocks:
+                if isinstance(block, str):
+                    block = _analyze_block(
+                        block, self.keyword_pattern, self.max_link_density, self.max_boilerplate_length
+                    )
+                if self.relevant_only and block.heading:
+                    section_relevant = block.relevant
+
+                fingerprint = block.fingerprint
+                duplicate = fingerprint in on_page
+                # Blocks mentioning a keyword survive repetition, a careers link in the nav is what we're after
+                repeated = site.counts.get(fingerprint, 0) >= self.min_repeats and not block.relevant
+                if not duplicate:
+                    if fingerprint in site.counts:
+                        site.counts[fingerprint] += 1
+                        counted.add(fingerprint)
+                    elif len(site.counts) < self.max_blocks_per_site:
+                        site.counts[fingerprint] = 1
+                        counted.add(fingerprint)
+                on_page.add(fingerprint)
+
+                if duplicate or repeated or block.boilerplate or not (section_relevant or block.relevant):
+                    self.stats.blocks_dropped += 1
+                    continue
+                self.stats.blocks_kept += 1
+                yield block.markdown
+        finally:
+            site.pages[page] = frozenset(counted)
+
+    def prune(self, markdown: str, url: str = "", blocks: Iterable[Block] | None = None) -> str:
+        """
+        Returns `markdown` without its boilerplate blocks, `url` tells which site's
+        repeated blocks apply. `blocks` are the page's blocks from `analyze`, when
+        they were already analyzed elsewhere.
+        """
+        pruned = "\n\n".join(self.filter_blocks(iter_blocks(markdown) if blocks is None else blocks, url))
+        self.stats.pages += 1
+        self.stats.bytes_in += len(markdown.encode())
+        self.stats.bytes_out += len(pruned.encode())
+        return pruned
@@ -0,0 +1,105 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
+
+
+class TokenBucket:
+    """
+    Classic token bucket: `rate` tokens per second, at most `capacity` saved up
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def is_full(self) -> bool:
+        self._refill()
+        return self.tokens >= self.capacity
+
+    async def take(self):
+        async with self._lock:
+            self._refill()
+            if self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
+
+
+class _HostState:
+    def __init__(self, concurrency: int, bucket: TokenBucket | None):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.bucket = bucket
+        self.users = 0
+
+
+class HostRateLimiter:
+    """
+    Limits concurrent requests and request rate per host.
+
+    Idle hosts whose bucket has refilled are forgotten, so memory depends on the
+    number of hosts in flight rather than the number of hosts ever seen. Delays
+    set for single hosts with `set_delay` are kept.
+    """
+
+    def __init__(
+        self,
+        per_host_concurrency: int = 2,
+        per_host_delay: float = 1.0,
+        burst: float = 1.0,
+        max_idle_hosts: int = 1024,
+    ):
+        self.per_host_concurrency = per_host_concurrency
+        self.per_host_delay = per_host_delay
+        self.burst = burst
+        self.max_idle_hosts = max_idle_hosts
+        self._hosts: dict[str, _HostState] = {}
+        self._delays: dict[str, float] = {}
+
+    def _new_state(self, delay: float) -> _HostState:
+        bucket = TokenBucket(1 / delay, self.burst) if delay > 0 else None
+        return _HostState(self.per_host_concurrency, bucket)
+
+    def set_delay(self, host: str, delay: float):
+        """
+        Spaces requests to `host` at least `delay` seconds apart, e.g. for the
+        crawl-delay of its robots.txt. Never goes below `per_host_delay`.
+        """
+        host = host.lower()
+        delay = max(delay, self.per_host_delay)
+        self._delays[host] = delay
+        state = self._hosts.get(host)
+        if state is not None:
+            state.bucket = TokenBucket(1 / delay, self.burst) if delay > 0 else None
+
+    def _prune(self):
+        if len(self._hosts) <= self.max_idle_hosts:
+            return
+        for host, state in list(self._hosts.items()):
+            if state.users == 0 and (state.bucket is None or state.bucket.is_full()):
+                del self._hosts[host]
+
+    @asynccontextmanager
+    async def limit(self, url: str):
+        host = (urlsplit(url).hostname or "").lower()
+        state = self._hosts.get(host)
+        if state is None:
+            self._prune()
+            state = self._hosts[host] = self._new_state(self._delays.get(host, self.per_host_delay))
+
+        state.users += 1
+        try:
+            async with state.semaphore:
+                if state.bucket is not None:
+                    await state.bucket.take()
+                yield
+        finally:
+            state.users -= 1
@@ -1,24 +1,396 @@
-from crawl4ai import AsyncWebCrawler
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
+from typing import Literal
 
-async def scrape_page_markdown(url: str) -> str:
-    async with AsyncWebCrawler() as crawler:
-        result = await crawler.arun(url=url)
-        if not result.success:
-            #logging.error(f"Failed to scrape page {url}: {result.error_message}")
-            print(f"Failed to scrape page {url}: {result.error_message}")
-            return ""
+from crawl4ai import AsyncWebCrawler, CrawlerRunConfig
+from crawl4ai.markdown_generation_strategy import MarkdownGenerationStrategy
+from crawl4ai.models import MarkdownGenerationResult
+
+from ..telemetry import current_telemetry
+from .cache import PageCache, current_cache
+from .http_fetch import HttpFetcher, current_fetcher
+from .models import ScrapeResult
+from .offload import ProcessOffload, current_offload
+from .pool import CrawlerPool, current_pool
+from .profiles import FULL, LINKS_ONLY, RenderProfile, install_hooks
+from .pruning import ContentFilter
+from .ratelimit import HostRateLimiter
+from .seen import SeenUrls
+from .urls import url_error
+
+FetchStrategy = Literal["browser", "http", "auto"]
+FETCH_STRATEGIES = ("browser", "http", "auto")
+
+logger = logging.getLogger(__name__)
+
+
+class _NoMarkdownGenerator(MarkdownGenerationStrategy):
+    """
+    Skips the HTML -> markdown conversion crawl4ai otherwise always runs
+    """
+
+    def generate_markdown(self, input_html: str, base_url: str = "", **kwargs) -> MarkdownGenerationResult:
+        return MarkdownGenerationResult(raw_markdown="", markdown_with_citations="", references_markdown="")
 
-        return result.markdown
 
-async def scrape_links(url: str) -> list[tuple[str, str]]:
+def _run_config(markdown: bool, profile: RenderProfile = FULL) -> CrawlerRunConfig | None:
+    options = profile.run_options()
+    if not markdown:
+        options["markdown_generator"] = _NoMarkdownGenerator()
+    return CrawlerRunConfig(**options) if options else None
+
+
+async def _arun(url: str, config: CrawlerRunConfig | None = None, pool: CrawlerPool | None = None):
+    """
+    Renders `url` on the given pool, the pool of the current `async with CrawlerPool()`
+    block, or a throwaway browser when neither exists
+    """
+    pool = pool or current_pool()
+    if pool is not None:
+        return await pool.arun(url, config=config)
+
     async with AsyncWebCrawler() as crawler:
-        result = await crawler.arun(url=url)
-        if not result.success:
-            #logging.error(f"Failed to scrape links {url}: {result.error_message}")
-            print(f"Failed to scrape links {url}: {result.error_message}")
-            return []
+        install_hooks(crawler)
+        return await crawler.arun(url=url, config=config)
+
+
+def _to_links(links: list[dict]) -> list[tuple[str, str]]:
+    return [(link['href'], link['text']) for link in links]
+
+
+async def _scrape_in_browser(
+    url: str,
+    markdown: bool,
+    pool: CrawlerPool | None,
+    html: bool = False,
+    profile: RenderProfile = FULL,
+    offload: ProcessOffload | None = None,
+) -> ScrapeResult:
+    started = time.perf_counter()
+    # With an offload the markdown is converted in its pool instead of by crawl4ai on the event loop
+    convert_here = markdown and offload is None
+    try:
+        with current_telemetry().stage("scrape.render", profile=profile.name):
+            result = await _arun(url, config=_run_config(convert_here, profile), pool=pool)
+    except Exception as e:
+        return ScrapeResult(url=url, final_url=url, success=False, elapsed=time.perf_counter() - started, error=str(e))
+
+    elapsed = time.perf_counter() - started
+    if not result.success:
+        return ScrapeResult(
+            url=url,
+            final_url=result.redirected_url or url,
+            success=False,
+            status_code=result.status_code,
+            elapsed=elapsed,
+            error=result.error_message,
+        )
+
+    current_telemetry().count("scrape.bytes", len(result.html or ""), mode="browser")
+    links = result.links or {}
+    final_url = result.redirected_url or result.url or url
+    page_markdown = ""
+    if convert_here:
+        page_markdown = str(result.markdown or "")
+    elif markdown:
+        page_markdown = await offload.markdown(result.html or "", final_url)
+    return ScrapeResult(
+        url=url,
+        final_url=final_url,
+        success=True,
+        status_code=result.status_code,
+        markdown=page_markdown,
+        internal_links=_to_links(links.get('internal', [])),
+        external_links=_to_links(links.get('external', [])),
+        elapsed=elapsed,
+        headers=dict(result.response_headers or {}),
+        html=(result.html or "") if html else "",
+    )
+
+
+async def _scrape_over_http(
+    url: str,
+    markdown: bool,
+    browser_fallback: bool,
+    fetcher: HttpFetcher | None,
+    html: bool = False,
+    offload: ProcessOffload | None = None,
+) -> tuple[ScrapeResult, str | None]:
+    options = dict(markdown=markdown, browser_fallback=browser_fallback, html=html, offload=offload)
+    fetcher = fetcher or current_fetcher()
+    if fetcher is not None:
+        return await fetcher.fetch(url, **options)
+
+    async with HttpFetcher() as fetcher:
+        return await fetcher.fetch(url, **options)
+
+
+async def _prune(
+    result: ScrapeResult, content_filter: ContentFilter | None, offload: ProcessOffload | None = None
+) -> ScrapeResult:
+    if content_filter is not None and result.success and result.markdown:
+        with current_telemetry().stage("scrape.prune"):
+            if offload is not None:
+                result.markdown = await offload.prune(content_filter, result.markdown, result.final_url)
+            else:
+                result.markdown = content_filter.prune(result.markdown, result.final_url)
+    return result
+
+
+async def scrape_page(
+    url: str,
+    markdown: bool = True,
+    pool: CrawlerPool | None = None,
+    cache: PageCache | None = None,
+    strategy: FetchStrategy = "browser",
+    fetcher: HttpFetcher | None = None,
+    content_filter: ContentFilter | None = None,
+    seen: SeenUrls | None = None,
+    html: bool = False,
+    profile: RenderProfile = FULL,
+    offload: ProcessOffload | None = None,
+) -> ScrapeResult:
+    """
+    Renders the page once and returns its markdown, links and response metadata.
+
+    Pass `markdown=False` when only the links are needed to skip the markdown conversion.
+    Results are read from and written to `cache` (or the current `async with PageCache()`).
+
+    `strategy` picks how the page is fetched: "browser" renders it in Chromium,
+    "http" only does a plain GET, and "auto" does the GET first and falls back to
+    the browser when the static HTML looks client side rendered. The path taken
+    is recorded in `ScrapeResult.fetch_mode`.
+
+    A `content_filter` strips boilerplate from the markdown before it is
+    returned; the cache keeps the unpruned markdown. Pages already in `seen`,
+    or being fetched by another call with it, are not fetched again and come
+    back unsuccessful with the error "already seen". Only successful fetches
+    are added to `seen`, a failed page is tried again by the next call.
+
+    With `html=True` the raw HTML is kept in `ScrapeResult.html`. The cache doesn't
+    store HTML, so such requests always fetch and are not cached.
+
+    `profile` sets what the browser loads and waits for, e.g. LINKS_ONLY skips
+    images, fonts, styles, trackers and third party iframes.
+
+    HTML parsing, markdown conversion and pruning run in the process pool of
+    `offload` (or the current `async with ProcessOffload()`) when there is one.
+    """
+    if strategy not in FETCH_STRATEGIES:
+        raise ValueError(f"Unknown fetch strategy {strategy!r}, expected one of {FETCH_STRATEGIES}")
+    error = url_error(url)
+    if error is not None:
+        return _invalid(url, error)
+    args = (url, markdown, pool, cache, strategy, fetcher, content_filter, html, profile, offload)
+    if seen is None:
+        return await _scrape_page(*args)
+    if not seen.claim(url):
+        current_telemetry().count("scrape.seen_skipped")
+        return ScrapeResult(url=url, final_url=url, success=False, error="already seen")
+
+    scraped = None
+    try:
+        scraped = await _scrape_page(*args)
+    finally:
+        _release(seen, url, scraped)
+    return scraped
+
+
+def _invalid(url: str, error: str) -> ScrapeResult:
+    current_telemetry().count("scrape.invalid_urls")
+    return ScrapeResult(url=url, final_url=url, success=False, error=f"invalid URL: {error}")
+
+
+def _release(seen: SeenUrls, url: str, scraped: ScrapeResult | None):
+    # A failed fetch leaves the page to be tried again
+    fetched = scraped is not None and scraped.success
+    seen.release(url, fetched)
+    if fetched and scraped.final_url != url:
+        seen.add(scraped.final_url)
+
+
+async def _scrape_page(
+    url: str,
+    markdown: bool,
+    pool: CrawlerPool | None,
+    cache: PageCache | None,
+    strategy: FetchStrategy,
+    fetcher: HttpFetcher | None,
+    content_filter: ContentFilter | None,
+    html: bool,
+    profile: RenderProfile,
+    offload: ProcessOffload | None,
+) -> ScrapeResult:
+    telemetry = current_telemetry()
+    offload = offload or current_offload()
+    cache = None if html else cache or current_cache()
+    if cache is not None:
+        cached = await cache.get(url, markdown=markdown)
+        telemetry.count("scrape.cache", result="miss" if cached is None else "hit")
+        if cached is not None:
+            return await _prune(cached, content_filter, offload)
+
+    with telemetry.stage("scrape.fetch", strategy=strategy):
+        if strategy == "browser":
+            scraped = await _scrape_in_browser(url, markdown, pool, html, profile, offload)
+        else:
+            scraped, browser_reason = await _scrape_over_http(
+                url, markdown, strategy == "auto", fetcher, html, offload
+            )
+            if strategy == "auto" and browser_reason is not None:
+                scraped = await _scrape_in_browser(url, markdown, pool, html, profile, offload)
+    telemetry.count("scrape.pages", mode=scraped.fetch_mode, success=scraped.success)
+
+    # The cache keeps the unpruned markdown, each read is pruned with the filter at hand
+    if cache is not None:
+        await cache.put(scraped, markdown=markdown)
+    return await _prune(scraped, content_filter, offload)
+
+
+async def scrape_page_markdown(
+    url: str,
+    pool: CrawlerPool | None = None,
+    cache: PageCache | None = None,
+    strategy: FetchStrategy = "browser",
+    content_filter: ContentFilter | None = None,
+    seen: SeenUrls | None = None,
+    profile: RenderProfile = FULL,
+) -> str:
+    result = await scrape_page(
+        url, pool=pool, cache=cache, strategy=strategy, content_filter=content_filter, seen=seen, profile=profile
+    )
+    if not result.success:
+        logger.warning("Failed to scrape page %s: %s", url, result.error)
+        return ""
+
+    return result.markdown
+
+async def scrape_links(
+    url: str,
+    pool: CrawlerPool | None = None,
+    cache: PageCache | None = None,
+    strategy: FetchStrategy = "browser",
+    seen: SeenUrls | None = None,
+    profile: RenderProfile = LINKS_ONLY,
+) -> list[tuple[str, str]]:
+    """
+    Returns the (href, text) links of the page, rendered with the lean LINKS_ONLY profile by default
+    """
+    result = await scrape_page(
+        url, markdown=False, pool=pool, cache=cache, strategy=strategy, seen=seen, profile=profile
+    )
+    if not result.success:
+        logger.warning("Failed to scrape links %s: %s", url, result.error)
+        return []
+
+    return result.links
+
+
+async def _iterate(urls: Iterable[str] | AsyncIterable[str]) -> AsyncIterator[str]:
+    if isinstance(urls, AsyncIterable):
+        async for url in urls:
+            yield url
+    else:
+        for url in urls:
+            yield url
+
+
+async def scrape_many(
+    urls: Iterable[str] | AsyncIterable[str],
+    concurrency: int = 8,
+    per_host_concurrency: int = 2,
+    per_host_delay: float = 1.0,
+    markdown: bool = True,
+    pool: CrawlerPool | None = None,
+    cache: PageCache | None = None,
+    strategy: FetchStrategy = "browser",
+    fetcher: HttpFetcher | None = None,
+    content_filter: ContentFilter | None = None,
+    seen: SeenUrls | None = None,
+    profile: RenderProfile = FULL,
+    offload: ProcessOffload | None = None,
+    limiter: HostRateLimiter | None = None,
+) -> AsyncIterator[ScrapeResult]:
+    """
+    Scrapes `urls` concurrently and yields results as they finish (not in input order).
+    URLs already in `seen`, including duplicates within `urls`, are skipped without a result.
+    URLs that don't parse come back as unsuccessful results with an "invalid URL" error.
+
+    `urls` is consumed lazily: at most `2 * concurrency` pages are scheduled at a
+    time, so memory stays bounded for arbitrarily long inputs. Each host gets at
+    most `per_host_concurrency` parallel requests spaced `per_host_delay` seconds apart,
+    unless a shared `limiter` is passed, e.g. one that knows the crawl-delays of SiteDiscovery.
+    """
+    limiter = limiter or HostRateLimiter(per_host_concurrency, per_host_delay)
+    semaphore = asyncio.Semaphore(concurrency)
+    max_pending = concurrency * 2
+
+    own_pool = own_fetcher = None
+    cache = cache or current_cache()
+    pool = pool or current_pool()
+    if pool is None and strategy != "http":
+        own_pool = pool = CrawlerPool(tabs_per_browser=concurrency)
+        await own_pool.start()
+    offload = offload or current_offload()
+    fetcher = fetcher or current_fetcher()
+    if fetcher is None and strategy != "browser":
+        own_fetcher = fetcher = HttpFetcher(max_connections=concurrency)
+        await own_fetcher.open()
+
+    async def run(url: str) -> ScrapeResult:
+        scraped = None
+        try:
+            async with limiter.limit(url):
+                async with semaphore:
+                    scraped = await scrape_page(
+                        url,
+                        markdown=markdown,
+                        pool=pool,
+                        cache=cache,
+                        strategy=strategy,
+                        fetcher=fetcher,
+                        content_filter=content_filter,
+                        profile=profile,
+                        offload=offload,
+                    )
+            return scraped
+        finally:
+            if seen is not None:
+                _release(seen, url, scraped)
+
+    source = _iterate(urls)
+    pending: set[asyncio.Task] = set()
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(pending) < max_pending:
+                try:
+                    url = await anext(source)
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+                # Rejected here, a URL that doesn't parse would fail the rate limiter and the whole batch
+                error = url_error(url)
+                if error is not None:
+                    yield _invalid(url, error)
+                    continue
+                # Claimed when scheduled, so duplicates within `urls` are skipped too
+                if seen is not None and not seen.claim(url):
+                    continue
+                pending.add(asyncio.create_task(run(url)))
 
-        internal_links = result.links['internal']
-        external_links = result.links['external']
-        return [(link['href'], link['text']) for link in internal_links + external_links]
+            if not pending:
+                break
 
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+        if own_pool is not None:
+            await own_pool.close()
+        if own_fetcher is not None:
+            await own_fetcher.close()
@@ -0,0 +1,73 @@
+from urllib.parse import urlsplit, urlunsplit
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def url_error(url: str) -> str | None:
+    """
+    Returns why `url` can't be fetched (e.g. "Invalid IPv6 URL" for "http://[::1"),
+    None when it parses
+    """
+    try:
+        parts = urlsplit(url.strip())
+        # Raises for ports out of range or not a number
+        parts.port
+    except ValueError as e:
+        return str(e)
+    return None
+
+
+def normalize_url(url: str) -> str:
+    """
+    Lowercases scheme and host, drops default ports and fragments and
+    gives empty paths a "/", so equal pages map to the same key
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower() or "https"
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    return urlunsplit((scheme, host, parts.path or "/", parts.query, ""))
+
+
+# Query parameters that only track the visitor and never change the page. Generic
+# names like "ref" or "source" are left alone, sites use them for content and routing
+TRACKING_PARAMS = frozenset(
+    {
+        "gclid", "gbraid", "wbraid", "dclid", "fbclid", "msclkid", "yclid", "igshid", "twclid", "li_fat_id",
+        "mc_cid", "mc_eid", "_ga", "_gl", "_hsenc", "_hsmi", "hsctatracking", "mkt_tok",
+    }
+)
+INDEX_FILES = ("index.html", "index.htm", "index.php", "default.aspx")
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Identity key of a page for deduplication, not meant to be fetched: on top of
+    normalize_url it treats http as https, drops "www.", tracking parameters,
+    index file names and trailing slashes, and sorts the remaining query.
+    """
+    if "://" not in url:
+        url = "https://" + url.strip()
+    parts = urlsplit(normalize_url(url))
+    scheme = "https" if parts.scheme == "http" else parts.scheme
+    netloc = parts.netloc.removeprefix("www.")
+    if netloc.endswith(":443") and scheme == "https":
+        netloc = netloc[:-4]
+
+    path = parts.path
+    for index_file in INDEX_FILES:
+        if path.endswith("/" + index_file):
+            path = path[: -len(index_file)]
+            break
+    path = path.rstrip("/") or "/"
+
+    query = "&".join(
+        sorted(
+            param
+            for param in parts.query.split("&")
+            if param and not param.split("=", 1)[0].lower().startswith("utm_")
+            and param.split("=", 1)[0].lower() not in TRACKING_PARAMS
+        )
+    )
+    return urlunsplit((scheme, netloc, path, query, ""))
@@ -0,0 +1,181 @@
+import time
+from contextvars import ContextVar
+from statistics import quantiles
+
+
+class _NoStage:
+    """
+    Stage timer of the disabled telemetry, shared so timing a stage allocates nothing
+    """
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoStage":
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+_NO_STAGE = _NoStage()
+
+
+class _Stage:
+    __slots__ = ("telemetry", "name", "attributes", "started")
+
+    def __init__(self, telemetry: "Telemetry", name: str, attributes: dict):
+        self.telemetry = telemetry
+        self.name = name
+        self.attributes = attributes
+
+    def __enter__(self) -> "_Stage":
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, *_):
+        if exc_type is not None:
+            self.attributes["error"] = exc_type.__name__
+        self.telemetry.record(f"{self.name}.duration", time.perf_counter() - self.started, unit="s", **self.attributes)
+
+
+class Telemetry:
+    """
+    Instrumentation surface of the scraper and the career pipeline. This base
+    class records nothing and is what runs when telemetry isn't enabled.
+
+    Code under measurement times stages and counts events on the telemetry of
+    the current `with` block:
+
+        with OpenTelemetry():
+            async for result in pipeline.run(company_urls):
+                ...
+
+    and inside the instrumented code:
+
+        telemetry = current_telemetry()
+        with telemetry.stage("scrape.render", mode="browser"):
+            ...
+        telemetry.count("scrape.bytes", len(html))
+    """
+
+    enabled = False
+
+    def __init__(self):
+        self._context_tokens = []
+
+    def __enter__(self) -> "Telemetry":
+        self._context_tokens.append(_current_telemetry.set(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        _current_telemetry.reset(self._context_tokens.pop())
+
+    def stage(self, name: str, **attributes) -> _Stage | _NoStage:
+        """
+        Times the `with` block into the `<name>.duration` histogram, in seconds
+        """
+        return _NO_STAGE
+
+    def record(self, name: str, value: float, unit: str = "1", **attributes):
+        """
+        Adds one value to the `name` histogram
+        """
+
+    def count(self, name: str, value: float = 1, **attributes):
+        """
+        Adds `value` to the `name` counter
+        """
+
+
+_DISABLED = Telemetry()
+_current_telemetry: ContextVar[Telemetry] = ContextVar("current_telemetry", default=_DISABLED)
+
+
+def current_telemetry() -> Telemetry:
+    """
+    Returns the telemetry of the current `with` block, a no-op one outside any
+    """
+    return _current_telemetry.get()
+
+
+class OpenTelemetry(Telemetry):
+    """
+    Exports stage histograms and counters through the OpenTelemetry metrics
+    API. Without a `meter_provider` the global one is used, so whichever SDK
+    and exporter the application configured receives them.
+    """
+
+    enabled = True
+
+    def __init__(self, meter_provider=None, name: str = "sunduunit"):
+        super().__init__()
+        # Imported here so runs without telemetry never load the SDK
+        from opentelemetry import metrics
+
+        self.meter = metrics.get_meter(name, meter_provider=meter_provider)
+        self._histograms = {}
+        self._counters = {}
+
+    def stage(self, name: str, **attributes) -> _Stage:
+        return _Stage(self, name, attributes)
+
+    def record(self, name: str, value: float, unit: str = "1", **attributes):
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            histogram = self._histograms[name] = self.meter.create_histogram(name, unit=unit)
+        histogram.record(value, attributes)
+
+    def count(self, name: str, value: float = 1, **attributes):
+        counter = self._counters.get(name)
+        if counter is None:
+            counter = self._counters[name] = self.meter.create_counter(name)
+        counter.add(value, attributes)
+
+
+def _key(name: str, attributes: dict) -> str:
+    if not attributes:
+        return name
+    return name + "{" + ",".join(f"{key}={value}" for key, value in sorted(attributes.items())) + "}"
+
+
+class RecordingTelemetry(Telemetry):
+    """
+    Keeps every measurement in memory for benchmarks and one-off runs,
+    keyed by name and attributes: "scrape.render.duration{mode=browser}"
+
+        with RecordingTelemetry() as telemetry:
+            await pipeline.find_career_page(links, url)
+        print(telemetry.summary())
+    """
+
+    enabled = True
+
+    def __init__(self):
+        super().__init__()
+        self.histograms: dict[str, list[float]] = {}
+        self.counters: dict[str, float] = {}
+
+    def stage(self, name: str, **attributes) -> _Stage:
+        return _Stage(self, name, attributes)
+
+    def record(self, name: str, value: float, unit: str = "1", **attributes):
+        self.histograms.setdefault(_key(name, attributes), []).append(value)
+
+    def count(self, name: str, value: float = 1, **attributes):
+        key = _key(name, attributes)
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """
+        Count, total, p50, p95 and max of every histogram
+        """
+        summary = {}
+        for key, values in sorted(self.histograms.items()):
+            cuts = quantiles(values, n=20, method="inclusive") if len(values) > 1 else values * 19
+            summary[key] = {
+                "count": len(values),
+                "total": sum(values),
+                "p50": cuts[9],
+                "p95": cuts[18],
+                "max": max(values),
+            }
+        return summary
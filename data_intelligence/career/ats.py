@@ -0,0 +1,241 @@
+import asyncio
+import json
+from collections.abc import Collection, Iterable
+from dataclasses import asdict, dataclass
+from urllib.parse import urlsplit, urlunsplit
+
+import httpx
+
+from data_collector.scraper.urls import canonicalize_url
+
+
+@dataclass(frozen=True, slots=True)
+class ATSProvider:
+    """
+    An applicant tracking system hosting job boards for many companies.
+
+    `domains` host one board per company subdomain ("acme.teamtailor.com"),
+    `hosts` serve all boards from one host keyed by path ("jobs.lever.co/acme").
+    `url_templates` guess a company's board from its slug ("https://{slug}.teamtailor.com/jobs")
+    and `board_segments` is how many path segments of a link make up the board
+    itself, the rest points to a single posting.
+    """
+    name: str
+    domains: tuple[str, ...] = ()
+    hosts: tuple[str, ...] = ()
+    url_templates: tuple[str, ...] = ()
+    board_segments: int = 0
+
+    def board_url(self, url: str) -> str | None:
+        parts = urlsplit(url)
+        segments = [segment for segment in parts.path.split("/") if segment]
+        host = (parts.hostname or "").lower()
+        # A bare path-keyed host is the vendor's own page, not a company board
+        if host in self.hosts and len(segments) < self.board_segments:
+            return None
+        segments = segments[: self.board_segments]
+        path = "/" + "/".join(segments) if segments else "/"
+        return urlunsplit((parts.scheme or "https", parts.netloc, path, "", ""))
+
+
+DEFAULT_PROVIDERS = (
+    ATSProvider("Teamtailor", domains=("teamtailor.com",), url_templates=("https://{slug}.teamtailor.com/jobs",), board_segments=1),
+    ATSProvider(
+        "Greenhouse",
+        hosts=("boards.greenhouse.io", "job-boards.greenhouse.io", "job-boards.eu.greenhouse.io"),
+        url_templates=("https://job-boards.greenhouse.io/{slug}", "https://job-boards.eu.greenhouse.io/{slug}"),
+        board_segments=1,
+    ),
+    ATSProvider(
+        "Lever",
+        hosts=("jobs.lever.co", "jobs.eu.lever.co"),
+        url_templates=("https://jobs.lever.co/{slug}", "https://jobs.eu.lever.co/{slug}"),
+        board_segments=1,
+    ),
+    ATSProvider("Workday", domains=("myworkdayjobs.com",), board_segments=2),
+    ATSProvider("Recruitee", domains=("recruitee.com",), url_templates=("https://{slug}.recruitee.com/",)),
+    ATSProvider("Laura", domains=("rekrytointi.com",), url_templates=("https://{slug}.rekrytointi.com/paikat/",), board_segments=1),
+    ATSProvider("Sympa", domains=("sympahr.net",)),
+    ATSProvider(
+        "SmartRecruiters",
+        hosts=("jobs.smartrecruiters.com", "careers.smartrecruiters.com"),
+        url_templates=("https://jobs.smartrecruiters.com/{slug}",),
+        board_segments=1,
+    ),
+    ATSProvider("Personio", domains=("jobs.personio.de", "jobs.personio.com"), url_templates=("https://{slug}.jobs.personio.de/",)),
+    ATSProvider("Jobylon", hosts=("emp.jobylon.com",), board_segments=2),
+    ATSProvider("ReachMee", domains=("reachmee.com",)),
+    ATSProvider("Varbi", domains=("varbi.com",)),
+    ATSProvider("HR-Manager", domains=("hr-manager.net",)),
+    ATSProvider("Talentadore", domains=("talentadore.com",)),
+)
+
+
+class HostSuffixTrie:
+    """
+    Trie over reversed host labels, so a lookup costs one step per label of the host
+    """
+
+    def __init__(self):
+        self._root: dict = {}
+
+    def add(self, suffix: str, value, exact: bool = False):
+        node = self._root
+        for label in reversed(suffix.lower().split(".")):
+            node = node.setdefault(label, {})
+        node["=" if exact else "*"] = value
+
+    def longest_match(self, host: str):
+        """
+        Returns the value of the longest registered suffix. Domains only match
+        hosts with a company label in front of them ("www." doesn't count),
+        exact hosts only match themselves.
+        """
+        labels = list(reversed(host.lower().split(".")))
+        node, match = self._root, None
+        for depth, label in enumerate(labels, start=1):
+            node = node.get(label)
+            if node is None:
+                break
+            remaining = labels[depth:]
+            if not remaining and "=" in node:
+                match = node["="]
+            elif "*" in node and remaining and remaining != ["www"]:
+                match = node["*"]
+        return match
+
+
+def company_slugs(company_url: str) -> list[str]:
+    """
+    Guesses the slugs an ATS would use for a company, e.g. "acme-group" and "acmegroup"
+    for https://www.acme-group.fi
+    """
+    labels = (urlsplit(company_url).hostname or "").lower().split(".")
+    if len(labels) < 2:
+        return []
+    name = labels[-2]
+    slugs = [name]
+    if "-" in name:
+        slugs.append(name.replace("-", ""))
+    return slugs
+
+
+class ATSRegistry:
+    """
+    Updatable registry of known ATS providers compiled into a host suffix trie.
+
+        provider = ATS_REGISTRY.match("https://acme.teamtailor.com/jobs/123-dev")
+    """
+
+    def __init__(self, providers: Iterable[ATSProvider] = DEFAULT_PROVIDERS):
+        self.providers: list[ATSProvider] = []
+        self._trie = HostSuffixTrie()
+        for provider in providers:
+            self.register(provider)
+
+    def register(self, provider: ATSProvider):
+        self.providers.append(provider)
+        for domain in provider.domains:
+            self._trie.add(domain, provider)
+        for host in provider.hosts:
+            self._trie.add(host, provider, exact=True)
+
+    def match(self, url: str) -> ATSProvider | None:
+        host = urlsplit(url).hostname
+        return self._trie.longest_match(host) if host else None
+
+    def board_of(self, url: str) -> tuple[str, ATSProvider] | None:
+        """
+        Returns the board URL and provider of `url` when it is hosted on a known
+        ATS, e.g. the board of a single posting on it
+        """
+        provider = self.match(url)
+        board = provider.board_url(url) if provider is not None else None
+        return (board, provider) if board is not None else None
+
+    def find(
+        self, links: Iterable[tuple[str, ...] | str], exclude: Collection[str] = ()
+    ) -> tuple[str, ATSProvider] | None:
+        """
+        Returns the board URL and provider of the first link hosted on a known ATS,
+        skipping boards whose canonical URL is in `exclude`
+        """
+        for link in links:
+            url = link if isinstance(link, str) else link[0]
+            board = self.board_of(url)
+            if board is not None and canonicalize_url(board[0]) not in exclude:
+                return board
+        return None
+
+    def candidate_urls(self, company_url: str) -> list[tuple[str, ATSProvider]]:
+        return [
+            (template.format(slug=slug), provider)
+            for provider in self.providers
+            for template in provider.url_templates
+            for slug in company_slugs(company_url)
+        ]
+
+    async def probe(
+        self, company_url: str, client: httpx.AsyncClient | None = None, concurrency: int = 8
+    ) -> tuple[str, ATSProvider] | None:
+        """
+        HEADs the templated board URLs of every provider and returns the first
+        that exists. Providers redirect unknown companies to their own front
+        page, so the final URL must still be a board on the same provider.
+        """
+        candidates = self.candidate_urls(company_url)
+        if not candidates:
+            return None
+
+        own_client = client is None
+        client = client or httpx.AsyncClient(follow_redirects=True, timeout=5.0)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def check(url: str, provider: ATSProvider) -> bool:
+            async with semaphore:
+                try:
+                    response = await client.head(url)
+                    if response.status_code == 405:
+                        async with client.stream("GET", url) as response:
+                            pass
+                except httpx.HTTPError:
+                    return False
+            final_url = str(response.url)
+            return (
+                response.status_code == 200
+                and self.match(final_url) is provider
+                and urlsplit(final_url).path.rstrip("/") == urlsplit(url).path.rstrip("/")
+            )
+
+        try:
+            results = await asyncio.gather(*(check(url, provider) for url, provider in candidates))
+        finally:
+            if own_client:
+                await client.aclose()
+
+        for (url, provider), exists in zip(candidates, results):
+            if exists:
+                return url, provider
+        return None
+
+    def to_json(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump([asdict(provider) for provider in self.providers], f, indent=2)
+
+    @classmethod
+    def from_json(cls, path: str) -> "ATSRegistry":
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(
+            ATSProvider(
+                name=entry["name"],
+                domains=tuple(entry.get("domains", ())),
+                hosts=tuple(entry.get("hosts", ())),
+                url_templates=tuple(entry.get("url_templates", ())),
+                board_segments=entry.get("board_segments", 0),
+            )
+            for entry in data
+        )
+
+
+ATS_REGISTRY = ATSRegistry()
@@ -0,0 +1,153 @@
+import asyncio
+from dataclasses import dataclass
+
+from langchain_core.language_models import BaseChatModel
+
+from .careers_page_finder.chains import choose_next_link, choose_next_links
+from .careers_page_finder.prompts import ANALYZE_LINKS_PROMPT
+from .llm_cache import LLMDecisionCache, decision_key
+from .models import LinkDecision
+from .prompt_packing import DEFAULT_LINK_TOKEN_BUDGET
+
+
+@dataclass(slots=True)
+class BatcherStats:
+    decisions: int = 0
+    batches: int = 0
+    # Websites the model skipped in a batch and that were asked again on their own
+    retried: int = 0
+
+    @property
+    def average_batch_size(self) -> float:
+        return self.decisions / self.batches if self.batches else 0.0
+
+
+@dataclass(slots=True)
+class _PendingDecision:
+    url: str | None
+    links: list[tuple[str, str, float]]
+    future: asyncio.Future
+
+
+class DecisionBatcher:
+    """
+    Collects link selection decisions from many concurrently running company
+    pipelines and sends them to the model as one structured output request.
+
+    A batch is sent once `max_batch_size` decisions are waiting or `max_wait`
+    seconds after its first decision arrived, whichever comes first, and the
+    answers are fanned back out to the waiting coroutines.
+
+        async with DecisionBatcher(max_batch_size=16, max_wait=0.5) as batcher:
+            pipeline = CareerPipeline(batcher=batcher)
+    """
+
+    def __init__(
+        self,
+        model: BaseChatModel | None = None,
+        max_batch_size: int = 16,
+        max_wait: float = 0.5,
+        cache: LLMDecisionCache | None = None,
+        token_budget: int = DEFAULT_LINK_TOKEN_BUDGET,
+    ):
+        self.model = model
+        self.token_budget = token_budget
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.cache = cache
+        self.stats = BatcherStats()
+        self._pending: list[_PendingDecision] = []
+        self._timer: asyncio.Task | None = None
+        self._in_flight: set[asyncio.Task] = set()
+
+    async def __aenter__(self) -> "DecisionBatcher":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def decide(self, url: str | None, links: list[tuple[str, str, float]]) -> LinkDecision:
+        if self.cache is not None:
+            cached = await self.cache.get(decision_key(ANALYZE_LINKS_PROMPT, url, links))
+            if cached is not None:
+                return LinkDecision.from_response(cached, current_url=url, source="llm_cache")
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append(_PendingDecision(url, links, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._send()
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._send_after_wait())
+        return await future
+
+    async def _send_after_wait(self):
+        await asyncio.sleep(self.max_wait)
+        self._timer = None
+        self._send()
+
+    def _send(self):
+        if self._timer is not None and self._timer is not asyncio.current_task():
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending[: self.max_batch_size], self._pending[self.max_batch_size :]
+        if not batch:
+            return
+        task = asyncio.create_task(self._run_batch(batch))
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
+
+        if self._pending:
+            self._timer = asyncio.create_task(self._send_after_wait())
+
+    async def _run_batch(self, batch: list[_PendingDecision]):
+        self.stats.batches += 1
+        self.stats.decisions += len(batch)
+        try:
+            answers = await choose_next_links(
+                [(item.url, item.links) for item in batch], model=self.model, token_budget=self.token_budget
+            )
+        except Exception as e:
+            for item in batch:
+                if not item.future.done():
+                    item.future.set_exception(e)
+            return
+
+        skipped = []
+        for item, answer in zip(batch, answers):
+            if answer is None:
+                skipped.append(item)
+                continue
+            if self.cache is not None:
+                key = decision_key(ANALYZE_LINKS_PROMPT, item.url, item.links)
+                request = {"url": item.url, "links": [link[:2] for link in item.links]}
+                await self.cache.put(key, request, answer)
+            if not item.future.done():
+                item.future.set_result(LinkDecision.from_response(answer, current_url=item.url))
+
+        # Answer whatever the model left out one by one rather than failing it
+        self.stats.retried += len(skipped)
+        decisions = await asyncio.gather(
+            *(choose_next_link(item.url, item.links, self.model, self.cache, self.token_budget) for item in skipped),
+            return_exceptions=True,
+        )
+        for item, decision in zip(skipped, decisions):
+            if item.future.done():
+                continue
+            if isinstance(decision, BaseException):
+                item.future.set_exception(decision)
+            else:
+                item.future.set_result(decision)
+
+    async def close(self):
+        """
+        Sends whatever is still waiting and waits for all batches to finish
+        """
+        while self._pending:
+            self._send()
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
@@ -0,0 +1,105 @@
+import json
+from typing import Literal
+
+from langchain_core.language_models import BaseChatModel
+from pydantic import BaseModel
+
+from data_collector.telemetry import current_telemetry
+
+from ...utils import get_chat_model, record_usage, strip_code_fence
+from ..llm_cache import LLMDecisionCache, decision_key
+from ..models import Action, LinkDecision
+from ..prompt_packing import DEFAULT_LINK_TOKEN_BUDGET, pack_links
+from .prompts import ANALYZE_LINKS_PROMPT, BATCH_ANALYZE_LINKS_PROMPT, format_batch
+
+
+class _WebsiteDecision(BaseModel):
+    id: int
+    action: Literal["CAREERS_PAGE_FOUND", "NEXT_LINK_TO_CRAWL", "NO_PROMISING_LINKS"]
+    next_link: str | None = None
+
+
+class _BatchDecisions(BaseModel):
+    decisions: list[_WebsiteDecision]
+
+
+async def choose_next_link(
+    url: str | None,
+    links: list[tuple[str, str, float]],
+    model: BaseChatModel | None = None,
+    cache: LLMDecisionCache | None = None,
+    token_budget: int = DEFAULT_LINK_TOKEN_BUDGET,
+) -> LinkDecision:
+    """
+    Asks the LLM whether `url` is the careers page or which of `links` to follow next.
+
+    The links are packed into at most `token_budget` tokens, best ranked first.
+    With a `cache`, identical requests (same prompt, url and link set) are answered
+    from it and get `source="llm_cache"`.
+    """
+    telemetry = current_telemetry()
+    key = None
+    if cache is not None:
+        key = decision_key(ANALYZE_LINKS_PROMPT, url, links)
+        cached = await cache.get(key)
+        telemetry.count("llm.cache", result="miss" if cached is None else "hit")
+        if cached is not None:
+            return LinkDecision.from_response(cached, current_url=url, source="llm_cache")
+
+    packed = pack_links(url, links, token_budget)
+    telemetry.record("llm.prompt_tokens", packed.tokens, call="next_link")
+    model = model or get_chat_model()
+    with telemetry.stage("llm.call", call="next_link"):
+        response = await model.ainvoke(
+            [
+                {"role": "system", "content": ANALYZE_LINKS_PROMPT},
+                {"role": "user", "content": packed.text},
+            ]
+        )
+    record_usage(response, "next_link")
+
+    try:
+        data = json.loads(strip_code_fence(response.content))
+    except json.JSONDecodeError:
+        return LinkDecision(action=Action.NO_PROMISING_LINKS, source="llm", confidence=0.0)
+    data["next_link"] = packed.resolve(data.get("next_link"))
+
+    if cache is not None:
+        await cache.put(key, {"url": url, "links": [link[:2] for link in links]}, data)
+    return LinkDecision.from_response(data, current_url=url)
+
+
+async def choose_next_links(
+    requests: list[tuple[str | None, list[tuple[str, str, float]]]],
+    model: BaseChatModel | None = None,
+    token_budget: int = DEFAULT_LINK_TOKEN_BUDGET,
+) -> list[dict | None]:
+    """
+    Decides several websites in one structured output request. Returns the raw
+    decision of each request in order, None where the model skipped a website.
+    Each website's links get their own `token_budget`.
+    """
+    packed = [pack_links(url, links, token_budget) for url, links in requests]
+    model = model or get_chat_model()
+    # The raw message is kept for its token usage, parsing errors are raised as without it
+    structured = model.with_structured_output(_BatchDecisions, include_raw=True)
+    with current_telemetry().stage("llm.call", call="next_link_batch"):
+        output = await structured.ainvoke(
+            [
+                {"role": "system", "content": BATCH_ANALYZE_LINKS_PROMPT},
+                {"role": "user", "content": format_batch(packed)},
+            ]
+        )
+    record_usage(output["raw"], "next_link_batch")
+    if output["parsed"] is None:
+        raise output["parsing_error"] or ValueError("No structured output in the batch answer")
+    result = output["parsed"]
+
+    answers: list[dict | None] = [None] * len(requests)
+    for decision in result.decisions:
+        if 0 <= decision.id < len(requests) and answers[decision.id] is None:
+            answers[decision.id] = {
+                "action": decision.action,
+                "next_link": packed[decision.id].resolve(decision.next_link),
+            }
+    return answers
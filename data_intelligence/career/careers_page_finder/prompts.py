@@ -0,0 +1,81 @@
+from ..definitions import CAREERS_PAGE_DEFINITION
+from ..prompt_packing import PackedLinks
+
+ANALYZE_LINKS_PROMPT = f"""
+You are analyzing a list of extracted hyperlinks from a website, ordered from most to least promising.
+Each link is given as "<id> <url or path on the current site> <link text>".
+
+Your job is to determine whether the current URL already appears to be the FINAL careers page, or whether another link should be followed.
+
+{CAREERS_PAGE_DEFINITION}
+
+---
+
+Your response MUST be one of the following JSON formats:
+
+1) If the current URL **already appears to be the final careers/job listing page**:
+
+{{
+  "action": "CAREERS_PAGE_FOUND",
+  "next_link": null
+}}
+
+---
+
+2) If the current URL is NOT final, but there exists a link that is more promising for a final careers page:
+
+{{
+  "action": "NEXT_LINK_TO_CRAWL",
+  "next_link": "<id of the single best next link, e.g. L3>"
+}}
+
+---
+
+3) If no promising career-related links exist:
+
+{{
+  "action": "NO_PROMISING_LINKS",
+  "next_link": null
+}}
+
+---
+
+Rules:
+
+- Prefer large hub links over individual job postings.
+- Prefer links containing keywords like: jobs, open positions, vacancies, careers.
+- Return next_link as the id of the link, e.g. "L3".
+
+Only output the JSON object — no additional text.
+"""
+
+
+BATCH_ANALYZE_LINKS_PROMPT = f"""
+You are analyzing the extracted hyperlinks of SEVERAL unrelated websites at once.
+Each website is introduced with its numeric id, its current URL and its links, ordered from most to least promising.
+Each link is given as "<link id> <url or path on the current site> <link text>".
+
+For EACH website independently, determine whether its current URL already appears to be the FINAL careers page,
+or whether another one of ITS OWN links should be followed.
+
+{CAREERS_PAGE_DEFINITION}
+
+---
+
+For every website return one decision with its id and:
+
+- action "CAREERS_PAGE_FOUND" and next_link null if the current URL already is the final careers/job listing page
+- action "NEXT_LINK_TO_CRAWL" and next_link set to the link id (e.g. "L3") of the single best next link in that website's list
+- action "NO_PROMISING_LINKS" and next_link null if no promising career-related links exist
+
+Rules:
+
+- Never use a link from one website in the decision of another.
+- Prefer large hub links over individual job postings.
+- Prefer links containing keywords like: jobs, open positions, vacancies, careers.
+- Return exactly one decision per website id.
+"""
+
+
+def format_batch(packed: list[PackedLinks]) -> str:
+    return "\n\n".join(f"### Website {index}\n{links.text}" for index, links in enumerate(packed))
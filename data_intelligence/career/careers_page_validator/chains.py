@@ -0,0 +1,41 @@
+import json
+
+from langchain_core.language_models import BaseChatModel
+
+from data_collector.telemetry import current_telemetry
+
+from ...utils import get_chat_model, record_usage, strip_code_fence
+from ..prompt_packing import fit_text
+from ..validation import PageSignals
+from .prompts import VALIDATE_CAREERS_PAGE_PROMPT, format_page
+
+DEFAULT_PAGE_TOKEN_BUDGET = 3000
+
+
+async def confirm_careers_page(
+    url: str,
+    markdown: str,
+    signals: PageSignals | None = None,
+    model: BaseChatModel | None = None,
+    token_budget: int = DEFAULT_PAGE_TOKEN_BUDGET,
+) -> bool:
+    """
+    Asks the LLM whether a borderline page is the final careers page. The page
+    markdown is cut to `token_budget` tokens.
+    """
+    found = ", ".join(signals.present()) if signals is not None else ""
+    model = model or get_chat_model()
+    with current_telemetry().stage("llm.call", call="validate"):
+        response = await model.ainvoke(
+            [
+                {"role": "system", "content": VALIDATE_CAREERS_PAGE_PROMPT},
+                {"role": "user", "content": format_page(url, found, fit_text(markdown, token_budget))},
+            ]
+        )
+    record_usage(response, "validate")
+
+    try:
+        data = json.loads(strip_code_fence(response.content))
+    except json.JSONDecodeError:
+        return False
+    return data.get("is_careers_page") is True
@@ -0,0 +1,23 @@
+from ..definitions import CAREERS_PAGE_DEFINITION
+
+VALIDATE_CAREERS_PAGE_PROMPT = f"""
+You are checking whether a web page is the FINAL careers page of a company.
+You get the page URL, the structural signals found in its HTML and its content as markdown (possibly cut short).
+
+{CAREERS_PAGE_DEFINITION}
+
+---
+
+Your response MUST be the following JSON format:
+
+{{
+  "is_careers_page": true or false,
+  "reason": "<one short sentence>"
+}}
+
+Only output the JSON object — no additional text.
+"""
+
+
+def format_page(url: str, signals: str, markdown: str) -> str:
+    return f"URL: {url}\nSignals: {signals or 'none'}\n\nContent:\n{markdown}"
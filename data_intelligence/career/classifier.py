@@ -0,0 +1,96 @@
+import re
+from collections.abc import Collection, Sequence
+from dataclasses import dataclass
+from urllib.parse import unquote, urlsplit
+
+from .ats import ATS_REGISTRY, ATSRegistry
+from .models import Action, LinkDecision
+
+# Last path segment of an obvious careers page, e.g. /careers, /fi/rekry, /en/jobs/
+CAREERS_PATH = re.compile(
+    r"^(careers?|jobs|open-?positions|open-?jobs|vacancies|join-?us|work-?with-?us|"
+    r"rekry|rekrytointi|tyopaikat|työpaikat|avoimet-?tyopaikat|avoimet-?työpaikat|ura|urat|toihin|"
+    r"meille-?toihin|tule-?meille-?toihin)$"
+)
+# First host label of a dedicated careers subdomain, e.g. careers.acme.fi
+CAREERS_SUBDOMAIN = re.compile(r"^(careers?|jobs|rekry|rekrytointi|tyopaikat|ura)$")
+
+
+@dataclass(slots=True)
+class ClassifierStats:
+    decided: int = 0
+    deferred: int = 0
+    # Model calls the decisions replaced, counted by the pipeline once per page it
+    # would have asked the model about. Lower than `decided`, which also counts
+    # pages decided again after a rejection and pages the model never would have seen.
+    llm_calls_saved: int = 0
+
+    @property
+    def decided_ratio(self) -> float:
+        total = self.decided + self.deferred
+        return self.decided / total if total else 0.0
+
+
+class HeuristicClassifier:
+    """
+    Deterministic stage before the LLM: accepts a link to a known ATS board, or
+    a link whose URL is an obvious careers page and that ranks near the top,
+    and defers everything else to the model.
+    """
+
+    def __init__(self, min_confidence: float = 0.8, top_n: int = 5, registry: ATSRegistry = ATS_REGISTRY):
+        self.min_confidence = min_confidence
+        self.top_n = top_n
+        self.registry = registry
+        self.stats = ClassifierStats()
+
+    def link_confidence(self, url: str) -> float:
+        parts = urlsplit(url)
+        # Percent-encoded, e.g. /ty%C3%B6paikat for /työpaikat
+        segments = [segment for segment in unquote(parts.path).lower().split("/") if segment]
+        if segments and CAREERS_PATH.match(segments[-1]):
+            # /careers beats /about/careers which is more often a marketing page
+            return 0.95 if len(segments) <= 2 else 0.85
+
+        labels = (parts.hostname or "").lower().split(".")
+        if len(labels) > 2 and CAREERS_SUBDOMAIN.match(labels[0]) and not segments:
+            return 0.9
+        return 0.0
+
+    def classify(
+        self,
+        ranked_links: list[tuple[str, str, float]],
+        all_links: Sequence[tuple[str, str]] = (),
+        exclude: Collection[str] = (),
+    ) -> LinkDecision | None:
+        """
+        Returns a confident decision for the best of the top `top_n` ranked links,
+        or None when the case is ambiguous and should go to the LLM.
+
+        ATS boards are looked up in `all_links` too, since their anchor text is
+        often too generic to rank high. Boards in `exclude` are skipped.
+        """
+        ats_board = self.registry.find(all_links or ranked_links, exclude=exclude)
+        if ats_board is not None:
+            self.stats.decided += 1
+            return LinkDecision(action=Action.CAREERS_PAGE_FOUND, link=ats_board[0], source="ats", confidence=0.97)
+
+        best_url, best_confidence = None, 0.0
+        for url, _, score in ranked_links[: self.top_n]:
+            if score <= 0:
+                break
+            confidence = self.link_confidence(url)
+            if confidence > best_confidence:
+                best_url, best_confidence = url, confidence
+
+        if best_url is None or best_confidence < self.min_confidence:
+            self.stats.deferred += 1
+            return None
+
+        self.stats.decided += 1
+        return LinkDecision(
+            action=Action.CAREERS_PAGE_FOUND,
+            link=best_url,
+            source="heuristic",
+            confidence=best_confidence,
+        )
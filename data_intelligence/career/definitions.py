@@ -1,5 +1,14 @@
 CAREERS_PAGE_DEFINITION = """
-<if one wants to define a careers page they could do it here>
+A TRUE careers page is one where the job listing can be accessed directly OR visible without needing to navigate deeper.
+
+FINAL careers page should be:
+
+- The deepest, most complete job listing page.
+- Not a marketing page, summary page, or redirect layer.
+- Always check if there is a links like "domain.fi/careers/jobs" or "domain.fi/careers/all-jobs"  or "domain.fi/careers/browse"
+
+Direct links to ATS (job portals) are valid if they lead to full listings, not single application pages.
+Do NOT choose single job posting links unless it is clear the site only has ONE job available.
 """
 
 CAREER_PAGE_KEYWORDS = [
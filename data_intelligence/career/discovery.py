@@ -0,0 +1,80 @@
+import heapq
+import itertools
+import re
+from collections.abc import Iterator
+from urllib.parse import unquote, urlsplit
+
+from data_collector.scraper.discovery import SiteDiscovery
+
+from .helpers import KeywordScorer, default_scorer
+
+PATH_SEPARATOR = re.compile(r"[/\-_.+]+")
+# Sitemap URLs are scored this many at a time, enough to batch the fuzzy matching
+SCORE_BATCH = 1000
+
+
+def path_text(url: str) -> str:
+    """
+    Stand-in anchor text for a URL found without a link to it: the words of its path
+    """
+    return " ".join(PATH_SEPARATOR.split(unquote(urlsplit(url).path))).strip()
+
+
+class CareerDiscovery:
+    """
+    Finds careers page candidates in a company's sitemaps before any page is
+    rendered. Sitemap URLs are scored with the career keywords on their URL
+    and path words, and the `max_seeds` best scoring at least `min_score`
+    become candidate links for CareerPipeline. Sitemaps listed in an index
+    are read in order of their own keyword score, so "page-sitemap.xml" or
+    "careers-sitemap.xml" come before the blog archive.
+
+        pipeline = CareerPipeline(model, discovery=CareerDiscovery())
+    """
+
+    def __init__(
+        self,
+        sites: SiteDiscovery | None = None,
+        scorer: KeywordScorer | None = None,
+        max_seeds: int = 20,
+        min_score: float = 1.0,
+    ):
+        self.sites = sites or SiteDiscovery()
+        self.scorer = scorer or default_scorer()
+        self.max_seeds = max_seeds
+        self.min_score = min_score
+
+    def _sitemap_priority(self, url: str) -> float:
+        return self.scorer.score([(url, path_text(url))])[0]
+
+    def _best(self, batch: list[tuple[str, str]], best: list[tuple[float, int, str, str]], order: Iterator[int]):
+        for (url, text), score in zip(batch, self.scorer.score(batch)):
+            if score < self.min_score:
+                continue
+            # Ties keep the sitemap order, which tends to list the important pages first
+            candidate = (score, -next(order), url, text)
+            if len(best) < self.max_seeds:
+                heapq.heappush(best, candidate)
+            elif candidate > best[0]:
+                heapq.heapreplace(best, candidate)
+
+    async def candidates(self, company_url: str) -> list[tuple[str, str]]:
+        """
+        Returns (url, path words) of the best careers page candidates in the
+        sitemaps of `company_url`, best first. Empty when the site has no
+        sitemap or nothing in it looks career related.
+        """
+        best: list[tuple[float, int, str, str]] = []
+        batch: list[tuple[str, str]] = []
+        order = itertools.count()
+        async for entry in self.sites.sitemap_urls(company_url, priority=self._sitemap_priority):
+            batch.append((entry.url, path_text(entry.url)))
+            if len(batch) >= SCORE_BATCH:
+                self._best(batch, best, order)
+                batch = []
+        if batch:
+            self._best(batch, best, order)
+        return [(url, text) for _, _, url, text in sorted(best, reverse=True)]
+
+    async def close(self):
+        await self.sites.close()
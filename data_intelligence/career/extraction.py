@@ -0,0 +1,445 @@
+import asyncio
+import re
+from collections.abc import AsyncIterator, Awaitable, Callable
+from datetime import datetime, timezone
+from urllib.parse import parse_qsl, urljoin, urlsplit
+
+import httpx
+import lxml.etree
+import lxml.html
+
+from data_collector.scraper.models import ScrapeResult
+from data_collector.scraper.scrape import scrape_page
+from data_collector.scraper.urls import canonicalize_url
+
+from .ats import ATS_REGISTRY, ATSProvider, ATSRegistry
+from .models import JobPosting
+from .validation import MIN_REPEATED_ITEMS, json_ld_nodes, posting_groups
+
+NEXT_PAGE = re.compile(r"^(next( page)?|seuraava( sivu)?|nästa( sida)?|weiter|›|»|>|→)$", re.I)
+PAGE_PARAMS = frozenset({"page", "p", "pg", "sivu", "offset", "start"})
+PAGE_PATH = re.compile(r"/(page|sivu)/\d+/?$", re.I)
+# Anchor texts that say nothing about the posting, the title is elsewhere in the item
+GENERIC_LINK_TEXT = re.compile(r"^(read more|lue lisää|läs mer|apply( now)?|hae|more|details|katso)$", re.I)
+LOCATION_XPATH = (
+    './/*[contains(@class, "location") or contains(@class, "sijainti") or contains(@class, "city")'
+    ' or @itemprop="jobLocation" or @itemprop="addressLocality"]'
+)
+
+AtsApi = Callable[[httpx.AsyncClient, str, str], Awaitable[list[JobPosting]]]
+
+
+def _text(node: lxml.html.HtmlElement) -> str:
+    return " ".join(node.text_content().split())
+
+
+def _string(value) -> str | None:
+    # JSON-LD values may be lists or nested objects with a name
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if isinstance(value, dict):
+        value = value.get("name")
+    return str(value).strip() or None if value is not None else None
+
+
+def _json_ld_location(value) -> str | None:
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if isinstance(value, dict):
+        address = value.get("address", value)
+        if isinstance(address, dict):
+            parts = (_string(address.get(key)) for key in ("addressLocality", "addressRegion", "addressCountry"))
+            return ", ".join(part for part in parts if part) or None
+        return _string(address)
+    return _string(value)
+
+
+def _json_ld_identifier(value) -> str | None:
+    # A plain string or a PropertyValue, whose "name" is the issuer rather than the id
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if isinstance(value, dict):
+        value = value.get("value")
+    return _string(value)
+
+
+def parse_json_ld(doc: lxml.html.HtmlElement, page_url: str) -> list[JobPosting]:
+    postings = []
+    for node in json_ld_nodes(doc, "JobPosting"):
+        title = _string(node.get("title") or node.get("name"))
+        if not title:
+            continue
+        url = _string(node.get("url") or node.get("sameAs"))
+        location = _json_ld_location(node.get("jobLocation"))
+        if location is None and node.get("jobLocationType") == "TELECOMMUTE":
+            location = "Remote"
+        postings.append(
+            JobPosting(
+                title=title,
+                url=urljoin(page_url, url) if url else page_url,
+                company=_string(node.get("hiringOrganization")),
+                location=location,
+                employment_type=_string(node.get("employmentType")),
+                date_posted=_string(node.get("datePosted")),
+                valid_through=_string(node.get("validThrough")),
+                source="json-ld",
+                page_url=page_url,
+                identifier=_json_ld_identifier(node.get("identifier")),
+            )
+        )
+    return postings
+
+
+def parse_microdata(doc: lxml.html.HtmlElement, page_url: str) -> list[JobPosting]:
+    postings = []
+    for item in doc.xpath('//*[contains(@itemtype, "schema.org/JobPosting")]'):
+        def prop(name: str) -> str | None:
+            nodes = item.xpath(f'.//*[@itemprop="{name}"]')
+            if not nodes:
+                return None
+            node = nodes[0]
+            return node.get("content") or node.get("href") or node.get("datetime") or _text(node) or None
+
+        title = prop("title") or prop("name")
+        if not title:
+            continue
+        url = prop("url")
+        postings.append(
+            JobPosting(
+                title=title,
+                url=urljoin(page_url, url) if url else page_url,
+                company=prop("hiringOrganization"),
+                location=prop("addressLocality") or prop("jobLocation"),
+                employment_type=prop("employmentType"),
+                date_posted=prop("datePosted"),
+                valid_through=prop("validThrough"),
+                source="microdata",
+                page_url=page_url,
+                identifier=prop("identifier"),
+            )
+        )
+    return postings
+
+
+def _item_title(item: lxml.html.HtmlElement) -> str | None:
+    for node in item.xpath(".//h1|.//h2|.//h3|.//h4|.//h5|.//h6|.//strong|self::a|.//a"):
+        text = _text(node)
+        if text and not GENERIC_LINK_TEXT.match(text):
+            return text
+    return None
+
+
+def parse_listing(
+    doc: lxml.html.HtmlElement, page_url: str, registry: ATSRegistry = ATS_REGISTRY
+) -> list[JobPosting]:
+    """
+    Reads postings from the largest group of repeated items linking to postings,
+    e.g. the <li>s of a job list or the cards of a job grid
+    """
+    items = max(posting_groups(doc, page_url, registry).values(), key=len, default=[])
+    if len(items) < MIN_REPEATED_ITEMS:
+        return []
+
+    postings = []
+    for item, href in items:
+        title = _item_title(item)
+        if not title:
+            continue
+        location = item.xpath(LOCATION_XPATH)
+        postings.append(
+            JobPosting(
+                title=title,
+                url=href,
+                location=_text(location[0]) or None if location else None,
+                source="list",
+                page_url=page_url,
+            )
+        )
+    return postings
+
+
+def extract_postings(
+    doc: lxml.html.HtmlElement, page_url: str, registry: ATSRegistry = ATS_REGISTRY
+) -> list[JobPosting]:
+    """
+    Postings of one page from the most reliable source it has: JSON-LD, then
+    microdata, then repeated list items
+    """
+    return parse_json_ld(doc, page_url) or parse_microdata(doc, page_url) or parse_listing(doc, page_url, registry)
+
+
+def _is_page_url(url: str) -> bool:
+    parts = urlsplit(url)
+    return PAGE_PATH.search(parts.path) is not None or any(
+        key.lower() in PAGE_PARAMS for key, _ in parse_qsl(parts.query)
+    )
+
+
+def pagination_links(doc: lxml.html.HtmlElement, page_url: str) -> list[str]:
+    """
+    Links to other pages of the same listing: rel="next", "Next" style anchors
+    and numbered page links
+    """
+    hrefs = list(doc.xpath('//link[@rel="next"]/@href'))
+    for anchor in doc.iter("a"):
+        href = anchor.get("href")
+        if not href or href.startswith(("#", "javascript:")):
+            continue
+        text = _text(anchor) or anchor.get("aria-label", "")
+        if (
+            "next" in (anchor.get("rel") or "").split()
+            or NEXT_PAGE.match(text)
+            or (text.isdigit() and _is_page_url(urljoin(page_url, href)))
+        ):
+            hrefs.append(href)
+
+    host = urlsplit(page_url).hostname
+    links = []
+    for href in hrefs:
+        url = urljoin(page_url, href)
+        if urlsplit(url).hostname == host and url not in links:
+            links.append(url)
+    return links
+
+
+def _ats_slug(url: str, provider: ATSProvider) -> str | None:
+    parts = urlsplit(url)
+    host = (parts.hostname or "").lower()
+    # Embedded Greenhouse boards name the company in a query parameter: /embed/job_board?for=acme
+    board = dict(parse_qsl(parts.query)).get("for")
+    if board:
+        return board
+    if host in provider.hosts:
+        segments = [segment for segment in parts.path.split("/") if segment]
+        return segments[0] if segments else None
+    for domain in provider.domains:
+        if host.endswith("." + domain):
+            return host[: -len(domain) - 1].split(".")[-1]
+    return None
+
+
+async def _greenhouse(client: httpx.AsyncClient, slug: str, board: str) -> list[JobPosting]:
+    response = await client.get(f"https://boards-api.greenhouse.io/v1/boards/{slug}/jobs")
+    response.raise_for_status()
+    return [
+        JobPosting(
+            title=job["title"],
+            url=job.get("absolute_url"),
+            location=(job.get("location") or {}).get("name"),
+            date_posted=job.get("updated_at"),
+            source="ats:Greenhouse",
+            page_url=board,
+        )
+        for job in response.json().get("jobs", [])
+    ]
+
+
+async def _lever(client: httpx.AsyncClient, slug: str, board: str) -> list[JobPosting]:
+    api = "api.eu.lever.co" if ".eu." in board else "api.lever.co"
+    response = await client.get(f"https://{api}/v0/postings/{slug}", params={"mode": "json"})
+    response.raise_for_status()
+    postings = []
+    for job in response.json():
+        categories = job.get("categories") or {}
+        created = job.get("createdAt")
+        postings.append(
+            JobPosting(
+                title=job["text"],
+                url=job.get("hostedUrl"),
+                location=categories.get("location"),
+                employment_type=categories.get("commitment"),
+                date_posted=datetime.fromtimestamp(created / 1000, timezone.utc).date().isoformat() if created else None,
+                source="ats:Lever",
+                page_url=board,
+            )
+        )
+    return postings
+
+
+async def _recruitee(client: httpx.AsyncClient, slug: str, board: str) -> list[JobPosting]:
+    response = await client.get(f"https://{slug}.recruitee.com/api/offers/")
+    response.raise_for_status()
+    return [
+        JobPosting(
+            title=offer["title"],
+            url=offer.get("careers_url"),
+            location=offer.get("location"),
+            employment_type=offer.get("employment_type_code"),
+            date_posted=offer.get("published_at"),
+            source="ats:Recruitee",
+            page_url=board,
+        )
+        for offer in response.json().get("offers", [])
+    ]
+
+
+async def _smartrecruiters(client: httpx.AsyncClient, slug: str, board: str) -> list[JobPosting]:
+    response = await client.get(f"https://api.smartrecruiters.com/v1/companies/{slug}/postings")
+    response.raise_for_status()
+    return [
+        JobPosting(
+            title=posting["name"],
+            url=f"https://jobs.smartrecruiters.com/{slug}/{posting['id']}",
+            location=(posting.get("location") or {}).get("city"),
+            employment_type=(posting.get("typeOfEmployment") or {}).get("label"),
+            date_posted=posting.get("releasedDate"),
+            source="ats:SmartRecruiters",
+            page_url=board,
+        )
+        for posting in response.json().get("content", [])
+    ]
+
+
+async def _personio(client: httpx.AsyncClient, slug: str, board: str) -> list[JobPosting]:
+    response = await client.get(f"https://{slug}.jobs.personio.de/xml")
+    response.raise_for_status()
+    postings = []
+    for position in lxml.etree.fromstring(response.content).iter("position"):
+        def field(name: str) -> str | None:
+            return position.findtext(name) or None
+
+        postings.append(
+            JobPosting(
+                title=field("name") or "",
+                url=f"https://{slug}.jobs.personio.de/job/{field('id')}",
+                location=field("office"),
+                employment_type=field("employmentType"),
+                date_posted=field("createdAt"),
+                source="ats:Personio",
+                page_url=board,
+            )
+        )
+    return postings
+
+
+# Public job board APIs by ATS provider name, these return every posting in one request
+ATS_APIS: dict[str, AtsApi] = {
+    "Greenhouse": _greenhouse,
+    "Lever": _lever,
+    "Recruitee": _recruitee,
+    "SmartRecruiters": _smartrecruiters,
+    "Personio": _personio,
+}
+
+
+async def _fetch_page(url: str) -> ScrapeResult:
+    return await scrape_page(url, markdown=False, html=True)
+
+
+class JobExtractor:
+    """
+    Turns a careers page into JobPosting records without an LLM.
+
+    Boards on an ATS with a public API are read from the API. Other pages are
+    parsed for JSON-LD, microdata or repeated list items, and their pagination
+    is followed concurrently (up to `max_pages` pages, `concurrency` at a time).
+    A page with no postings of its own that links to or embeds an ATS board is
+    read from that board instead. Records are deduplicated and streamed out in
+    batches of up to `batch_size` as pages finish.
+
+        async for batch in JobExtractor().extract(career_page):
+            save(batch)
+    """
+
+    def __init__(
+        self,
+        fetch_page: Callable[[str], Awaitable[ScrapeResult]] = _fetch_page,
+        registry: ATSRegistry = ATS_REGISTRY,
+        client: httpx.AsyncClient | None = None,
+        max_pages: int = 20,
+        concurrency: int = 4,
+        batch_size: int = 50,
+    ):
+        self.fetch_page = fetch_page
+        self.registry = registry
+        self.client = client
+        self.max_pages = max_pages
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+
+    async def _from_ats(self, url: str, client: httpx.AsyncClient) -> list[JobPosting] | None:
+        """
+        Postings from the ATS API behind `url`, None when there is no usable API
+        """
+        provider = self.registry.match(url)
+        api = ATS_APIS.get(provider.name) if provider is not None else None
+        slug = _ats_slug(url, provider) if api is not None else None
+        if slug is None:
+            return None
+        try:
+            return await api(client, slug, provider.board_url(url) or url)
+        except (httpx.HTTPError, ValueError, KeyError, lxml.etree.XMLSyntaxError):
+            return None
+
+    async def _pages(self, url: str) -> AsyncIterator[tuple[str, lxml.html.HtmlElement]]:
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch(page_url: str) -> tuple[str, lxml.html.HtmlElement | None]:
+            async with semaphore:
+                page = await self.fetch_page(page_url)
+            if not page.success or not page.html.strip():
+                return page_url, None
+            try:
+                return page.final_url, lxml.html.fromstring(page.html)
+            except (lxml.etree.ParserError, ValueError):
+                return page_url, None
+
+        queued = {canonicalize_url(url)}
+        pending = {asyncio.create_task(fetch(url))}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    page_url, doc = task.result()
+                    if doc is None:
+                        continue
+                    for link in pagination_links(doc, page_url):
+                        key = canonicalize_url(link)
+                        if key not in queued and len(queued) < self.max_pages:
+                            queued.add(key)
+                            pending.add(asyncio.create_task(fetch(link)))
+                    yield page_url, doc
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def extract(self, url: str) -> AsyncIterator[list[JobPosting]]:
+        client = self.client or httpx.AsyncClient(follow_redirects=True, timeout=10.0)
+        seen: set[str] = set()
+        batch: list[JobPosting] = []
+
+        def add(postings: list[JobPosting]):
+            for posting in postings:
+                if posting.url and posting.url != posting.page_url:
+                    key = canonicalize_url(posting.url)
+                else:
+                    # Listed without a page of their own, same title roles in other locations stay apart
+                    key = f"{posting.title}\0{posting.location or ''}\0{posting.identifier or ''}"
+                if key not in seen:
+                    seen.add(key)
+                    batch.append(posting)
+
+        try:
+            postings = await self._from_ats(url, client)
+            if postings is None:
+                first = True
+                async for page_url, doc in self._pages(url):
+                    postings = extract_postings(doc, page_url, self.registry)
+                    if not postings and first:
+                        embeds = [urljoin(page_url, src) for src in doc.xpath("//iframe/@src|//a/@href")]
+                        board = self.registry.find(embeds)
+                        if board is not None:
+                            postings = await self._from_ats(board[0], client) or []
+                    first = False
+                    add(postings)
+                    while len(batch) >= self.batch_size:
+                        yield batch[: self.batch_size]
+                        del batch[: self.batch_size]
+                postings = []
+
+            add(postings)
+            for start in range(0, len(batch), self.batch_size):
+                yield batch[start : start + self.batch_size]
+        finally:
+            if self.client is None:
+                await client.aclose()
@@ -1,10 +1,160 @@
+import re
+from collections.abc import Iterable, Sequence
+from functools import cache
+from urllib.parse import unquote
+
+from rapidfuzz import fuzz, process
+
 from .definitions import CAREER_PAGE_KEYWORDS
 
-def order_links_by_relevance(links: list[str]) -> list[str]:
+TOKEN_SEPARATOR = re.compile(r"[^a-z0-9äöå]+")
+# Accent folding so "työpaikat" and the "tyopaikat" of its URL are the same word
+FOLD = str.maketrans("äöå", "aoa")
+# Everyday words that are only career keywords on their own: "work" not in "network", "join" not in "jointventure"
+WHOLE_WORD_KEYWORDS = frozenset({"work", "join", "job", "jobs", "apply", "hiring"})
+
+
+def tokenize(text: str) -> list[str]:
+    return [token for token in TOKEN_SEPARATOR.split(text.lower()) if token]
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton finding every keyword occurrence in one pass over the text
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._output: list[list[str]] = [[]]
+
+        for keyword in keywords:
+            state = 0
+            for char in keyword:
+                if char not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                    self._goto[state][char] = len(self._goto) - 1
+                state = self._goto[state][char]
+            self._output[state].append(keyword)
+
+        # Breadth first so fail links always point to already finished states
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def find(self, text: str) -> Iterable[tuple[int, str]]:
+        """
+        Yields (start index, keyword) for every, possibly overlapping, match
+        """
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for keyword in self._output[state]:
+                yield index - len(keyword) + 1, keyword
+
+
+class KeywordScorer:
+    """
+    Scores links by the career keywords their URL and anchor text contain.
+
+    Every distinct keyword found verbatim adds 1, counting only the longest of
+    overlapping matches ("careers", not "career" too). Short keywords (like "ura"
+    or "hae") and the everyday words in WHOLE_WORD_KEYWORDS only count as whole
+    tokens so they don't match inside other words. URLs are unquoted and
+    accents folded first. Tokens that match no keyword verbatim are fuzzy matched against the keyword
+    list in one batched rapidfuzz call and add `ratio / 100` when above `fuzzy_threshold`.
+    """
+
+    def __init__(
+        self,
+        keywords: Iterable[str] = CAREER_PAGE_KEYWORDS,
+        fuzzy_threshold: float = 80,
+        min_substring_length: int = 4,
+    ):
+        self.keywords = sorted({keyword.lower().translate(FOLD) for keyword in keywords})
+        self.fuzzy_threshold = fuzzy_threshold
+        self.min_substring_length = min_substring_length
+        self._automaton = KeywordAutomaton(self.keywords)
+
+    def _exact_matches(self, text: str) -> set[str]:
+        spans = []
+        for start, keyword in self._automaton.find(text):
+            end = start + len(keyword)
+            if len(keyword) < self.min_substring_length or keyword in WHOLE_WORD_KEYWORDS:
+                if (start > 0 and text[start - 1].isalnum()) or (end < len(text) and text[end].isalnum()):
+                    continue
+            spans.append((start, end, keyword))
+        # Longest first, a match inside an already kept one is part of that word
+        spans.sort(key=lambda span: span[0] - span[1])
+        kept: list[tuple[int, int, str]] = []
+        for start, end, keyword in spans:
+            if not any(kept_start <= start and end <= kept_end for kept_start, kept_end, _ in kept):
+                kept.append((start, end, keyword))
+        return {keyword for _, _, keyword in kept}
+
+    def _fuzzy_matches(self, tokens: set[str]) -> dict[str, tuple[str, float]]:
+        candidates = [token for token in tokens if len(token) >= 3 and token not in self.keywords]
+        if not candidates:
+            return {}
+
+        scores = process.cdist(
+            candidates, self.keywords, scorer=fuzz.ratio, score_cutoff=self.fuzzy_threshold, workers=-1
+        )
+        best = scores.argmax(axis=1)
+        return {
+            token: (self.keywords[column], float(scores[row, column]))
+            for row, (token, column) in enumerate(zip(candidates, best))
+            if scores[row, column] > 0
+        }
+
+    def score(self, links: Sequence[tuple[str, str]]) -> list[float]:
+        texts = [unquote(f"{url} {text}").lower().translate(FOLD) for url, text in links]
+        link_tokens = [set(tokenize(text)) for text in texts]
+        fuzzy = self._fuzzy_matches(set().union(*link_tokens))
+
+        scores = []
+        for text, tokens in zip(texts, link_tokens):
+            matched = self._exact_matches(text)
+            score = float(len(matched))
+            fuzzy_best: dict[str, float] = {}
+            for token in tokens:
+                if token in fuzzy:
+                    keyword, ratio = fuzzy[token]
+                    if keyword not in matched:
+                        fuzzy_best[keyword] = max(fuzzy_best.get(keyword, 0.0), ratio / 100)
+            scores.append(score + sum(fuzzy_best.values()))
+        return scores
+
+
+@cache
+def default_scorer() -> KeywordScorer:
+    return KeywordScorer()
+
+
+def order_links_by_relevance(
+    links: Sequence[tuple[str, str] | str], scorer: KeywordScorer | None = None
+) -> list[tuple[str, str, float]]:
     """
     Orders links by relevance to career page
-    
-    A link gets 'relevancy' score by the amount of CAREER_PAGE_KEYWORDS the url + text contains
+
+    A link gets 'relevancy' score by the amount of CAREER_PAGE_KEYWORDS the url + text contains.
+    Returns (url, text, score) tuples, most relevant first.
     """
+    links = [(link, "") if isinstance(link, str) else link for link in links]
+    if not links:
+        return []
 
-    return # sorted links by relevancy
\ No newline at end of file
+    scores = (scorer or default_scorer()).score(links)
+    ranked = [(url, text, score) for (url, text), score in zip(links, scores)]
+    ranked.sort(key=lambda link: link[2], reverse=True)
+    return ranked
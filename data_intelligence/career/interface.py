@@ -1,36 +1,641 @@
-from .helpers import order_links_by_relevance
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Callable, Iterable
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from typing import Literal
+
+from langchain_core.language_models import BaseChatModel
+
+from data_collector.scraper.http_fetch import html_to_markdown
+from data_collector.scraper.models import ScrapeResult
+from data_collector.scraper.offload import ProcessOffload, current_offload
+from data_collector.scraper.scrape import scrape_links, scrape_page
+from data_collector.scraper.seen import SeenUrls
+from data_collector.scraper.urls import canonicalize_url
+from data_collector.telemetry import current_telemetry
+
+from .ats import ATS_REGISTRY
+from .batching import DecisionBatcher
+from .careers_page_finder.chains import choose_next_link
+from .careers_page_validator.chains import confirm_careers_page
+from .classifier import HeuristicClassifier
+from .discovery import CareerDiscovery
+from .extraction import JobExtractor
+from .journal import RunJournal
+from .llm_cache import LLMDecisionCache
+from .models import Action, CareerResult, JobPosting, LinkDecision
+from .prompt_packing import DEFAULT_LINK_TOKEN_BUDGET
+from .ranking import LinkRanker
+from .validation import StructuralValidator
+
+MAX_PROMPT_COUNT = 10
+TOP_LINKS_PER_PROMPT = 20
+# Priority of a frontier link shrinks by this factor per hop away from the start page
+DEPTH_DECAY = 0.8
+# Links scoring below this are only followed when the model picks them. Links
+# without a career keyword score 0, so this keeps best-first off the nav links.
+MIN_LINK_SCORE = 0.5
+# Links of rejected proposals kept for the hop that usually follows
+MAX_REJECTED_PAGES = 1024
+
+SearchMode = Literal["greedy", "best_first"]
+SEARCH_MODES = ("greedy", "best_first")
+
+
+@dataclass(slots=True)
+class _CompanyRun:
+    """
+    Where one company is in the search, handed from stage to stage
+    """
+    company_url: str | None
+    url: str | None
+    links: list[tuple[str, str]] = field(default_factory=list)
+    # Canonical URLs of pages crawled or proposals rejected
+    visited: set[str] = field(default_factory=set)
+    top_links: list[tuple[str, str, float]] = field(default_factory=list)
+    decision: LinkDecision | None = None
+    # Company URL still to probe for ATS boards, cleared once probed
+    probe_url: str | None = None
+    # Candidates from the company's sitemaps, None until discovery ran
+    seeds: list[tuple[str, str]] | None = None
+    # Last page the heuristics decided in place of the model
+    decided_page: str | None = None
+    prompt_count: int = 0
+    hops: int = 0
+    started: float = field(default_factory=time.perf_counter)
+
+    def result(self, career_page: str | None = None, error: str | None = None) -> CareerResult:
+        elapsed = time.perf_counter() - self.started
+        telemetry = current_telemetry()
+        telemetry.record("career.company.duration", elapsed, unit="s")
+        telemetry.record("career.company.hops", self.hops)
+        telemetry.record("career.company.prompts", self.prompt_count)
+        telemetry.count("career.companies", outcome="failed" if error else "found" if career_page else "not_found")
+        return CareerResult(
+            company_url=self.company_url or self.url or "",
+            career_page=career_page,
+            source=self.decision.source if career_page and self.decision else None,
+            hops=self.hops,
+            prompts=self.prompt_count,
+            elapsed=elapsed,
+            error=error,
+            visited=sorted(self.visited),
+        )
+
+
+async def _fetch_page(url: str) -> ScrapeResult:
+    return await scrape_page(url, markdown=False, html=True)
+
+
+async def _iterate(urls: Iterable[str] | AsyncIterable[str]) -> AsyncIterator[str]:
+    if isinstance(urls, AsyncIterable):
+        async for url in urls:
+            yield url
+    else:
+        for url in urls:
+            yield url
+
 
 class CareerPipeline:
 
-    def find_career_page(self, links: list[tuple[str, str]]) -> str:
-        MAX_PROMPT_COUNT = 10
-        prompt_count = 0
+    def __init__(
+        self,
+        model: BaseChatModel | None = None,
+        classifier: HeuristicClassifier | None = None,
+        fetch_links: Callable[[str], Awaitable[list[tuple[str, str]]]] = scrape_links,
+        probe_ats: bool = False,
+        llm_cache: LLMDecisionCache | None = None,
+        batcher: DecisionBatcher | None = None,
+        token_budget: int = DEFAULT_LINK_TOKEN_BUDGET,
+        seen: SeenUrls | None = None,
+        search: SearchMode = "greedy",
+        branching: int = 3,
+        max_fetches: int = 12,
+        max_llm_calls: int = MAX_PROMPT_COUNT,
+        min_link_score: float = MIN_LINK_SCORE,
+        validate_pages: bool = True,
+        validator: StructuralValidator | None = None,
+        fetch_page: Callable[[str], Awaitable[ScrapeResult]] = _fetch_page,
+        extractor: JobExtractor | None = None,
+        offload: ProcessOffload | None = None,
+        discovery: CareerDiscovery | None = None,
+    ):
+        if search not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode {search!r}, expected one of {SEARCH_MODES}")
+        self.model = model
+        self.classifier = classifier or HeuristicClassifier()
+        self.fetch_links = fetch_links
+        # HEAD the templated board URLs of known ATS providers before asking the LLM
+        self.probe_ats = probe_ats
+        self.llm_cache = llm_cache
+        # Shared across concurrently running companies to pack their decisions into one request
+        self.batcher = batcher
+        self.token_budget = token_budget
+        # Pages fetched by any company of the run, so shared pages and duplicate companies are crawled once
+        self.seen = seen
+        # "greedy" follows the single link the model picks, "best_first" explores
+        # `branching` links per round from a frontier until a budget runs out
+        self.search = search
+        self.branching = branching
+        self.max_fetches = max_fetches
+        self.max_llm_calls = max_llm_calls
+        self.min_link_score = min_link_score
+        # Proposals are checked from their HTML structure, the LLM only sees borderline pages
+        self.validator = (validator or StructuralValidator()) if validate_pages else None
+        self.fetch_page = fetch_page
+        self.extractor = extractor or JobExtractor(fetch_page=fetch_page)
+        # Process pool for link scoring and markdown conversion, the current `async with ProcessOffload()` if None
+        self.offload = offload
+        # Reads robots.txt and sitemaps for candidates before the start page is
+        # rendered, and keeps every fetch to the crawl-delays it finds
+        self.discovery = discovery
+        self.llm_calls = 0
+        self.llm_validations = 0
+        # Links of proposals rejected after fetching them, by canonical URL. A
+        # rejected proposal is often hopped to next, which then needs no fetch.
+        self._rejected_pages: OrderedDict[str, list[tuple[str, str]]] = OrderedDict()
 
-        # TO-DO: Order links by relevance
-        ordered_links = order_links_by_relevance(links)
-        found = None
+    def _polite(self, url: str):
+        return self.discovery.sites.limiter.limit(url) if self.discovery is not None else nullcontext()
 
-        # TO-DO: Loop until the career page is found or the max prompt count is reached
-        while found is None:
-            # TO-DO: Send top X links to LLM to find the career page
+    async def _fetch_links(self, url: str) -> list[tuple[str, str]]:
+        links = self._rejected_pages.pop(canonicalize_url(url), None)
+        if links is not None:
+            current_telemetry().count("career.fetch_reused")
+            return links
+        with current_telemetry().stage("career.fetch"):
+            async with self._polite(url):
+                return await self.fetch_links(url)
 
-            # TO-DO: Validate the proposal
+    async def _seed(self, run: _CompanyRun) -> bool:
+        """
+        Looks for candidates in the company's sitemaps before its start page is
+        fetched. Returns True when the heuristics already picked one to validate.
+        """
+        telemetry = current_telemetry()
+        with telemetry.stage("career.discover"):
+            run.seeds = await self.discovery.candidates(run.company_url or run.url)
+        if not run.seeds:
+            telemetry.count("career.seeded", outcome="no_candidates")
+            return False
 
-            # TO-DO: If proposal is valid, return the link
+        ranker = await LinkRanker.create(run.seeds, offload=self.offload)
+        top_links = ranker.top_k(TOP_LINKS_PER_PROMPT, exclude=run.visited)
+        decision = self.classifier.classify(top_links, all_links=run.seeds, exclude=run.visited)
+        telemetry.count("career.seeded", outcome="decided" if decision is not None else "deferred")
+        if decision is None or decision.action != Action.CAREERS_PAGE_FOUND:
+            return False
+        decision.source = "sitemap"
+        run.decision = decision
+        return True
 
-            if prompt_count > MAX_PROMPT_COUNT:
-                return None
-        
-        return found
+    async def _rank(self, run: _CompanyRun):
+        # Links are scored once per page, each round only selects the best ones still unseen
+        with current_telemetry().stage("career.rank"):
+            ranker = await LinkRanker.create(run.links, offload=self.offload)
+            run.top_links = ranker.top_k(TOP_LINKS_PER_PROMPT, exclude=run.visited)
 
-    def run(self):
-        pass
+    async def _decide(self, run: _CompanyRun) -> LinkDecision:
+        telemetry = current_telemetry()
+        with telemetry.stage("career.decide"):
+            decision = await self._make_decision(run)
+        telemetry.count("career.decisions", source=decision.source)
+        return decision
 
-    def validate_proposal(self, proposal: str) -> bool:
+    async def _make_decision(self, run: _CompanyRun) -> LinkDecision:
+        # Obvious cases are decided without a model round trip
+        decision = self.classifier.classify(run.top_links, all_links=run.links, exclude=run.visited)
+        if decision is not None:
+            self._saved_llm_call(run)
+        if decision is None and run.probe_url is not None:
+            board = await ATS_REGISTRY.probe(run.probe_url)
+            run.probe_url = None
+            if board is not None:
+                decision = LinkDecision(action=Action.CAREERS_PAGE_FOUND, link=board[0], source="ats")
+        if decision is None:
+            if self.batcher is not None:
+                decision = await self.batcher.decide(run.url, run.top_links)
+            else:
+                decision = await choose_next_link(run.url, run.top_links, self.model, self.llm_cache, self.token_budget)
+            run.prompt_count += 1
+            if decision.source == "llm":
+                self.llm_calls += 1
+
+        run.decision = decision
+        return decision
+
+    def _saved_llm_call(self, run: _CompanyRun):
+        # Deciding a page again after a rejected proposal doesn't save another call
+        if run.decided_page != run.url:
+            run.decided_page = run.url
+            self.classifier.stats.llm_calls_saved += 1
+
+    def _hop(self, run: _CompanyRun, link: str) -> bool:
+        """
+        Moves to the next page, returns False when another company already fetched it
+        """
+        next_url = self.get_next_link(link)
+        run.visited.add(canonicalize_url(next_url))
+        if self.seen is not None and not self.seen.add(next_url):
+            return False
+        run.url = next_url
+        run.hops += 1
         return True
 
+    def _reject(self, run: _CompanyRun, link: str) -> bool:
+        """
+        Records a rejected proposal, returns False when the search is over
+        """
+        # Rejected proposals are never offered again
+        key = canonicalize_url(link)
+        run.visited.add(key)
+        return run.url is None or key != canonicalize_url(run.url)
+
+    def _new_run(self, links: list[tuple[str, str]], url: str | None) -> _CompanyRun:
+        return _CompanyRun(
+            company_url=url,
+            url=url,
+            links=links,
+            visited={canonicalize_url(url)} if url else set(),
+            probe_url=url if self.probe_ats else None,
+        )
+
+    def _resume_run(self, checkpoint: dict) -> _CompanyRun:
+        run = self._new_run([], checkpoint["company_url"])
+        run.url = checkpoint["url"]
+        run.visited.update(map(canonicalize_url, checkpoint["visited"]))
+        run.hops = checkpoint["hops"]
+        run.prompt_count = checkpoint["prompts"]
+        if run.prompt_count:
+            run.probe_url = None
+        return run
+
+    async def find_career_page(self, links: list[tuple[str, str]], url: str | None = None) -> str | None:
+        if self.discovery is not None and url:
+            links = links + await self.discovery.candidates(url)
+        run = self._new_run(links, url)
+        if self.search == "best_first":
+            return await self._best_first(run)
+
+        while run.prompt_count < self.max_llm_calls:
+            await self._rank(run)
+            decision = await self._decide(run)
+
+            if decision.action == Action.CAREERS_PAGE_FOUND:
+                if decision.link is None:
+                    return None
+                if await self.validate_proposal(decision.link):
+                    return self.get_career_page(decision.link)
+                if not self._reject(run, decision.link):
+                    return None
+                # A rejected proposal is often a landing page in front of the real listing
+                if self._hop(run, decision.link):
+                    run.links = await self._fetch_links(run.url)
+            elif decision.action == Action.NEXT_LINK_TO_CRAWL:
+                if self._hop(run, decision.link):
+                    run.links = await self._fetch_links(run.url)
+            else:
+                return None
+
+        return None
+
+    async def _best_first(
+        self, run: _CompanyRun, checkpoint: Callable[[_CompanyRun, str], None] | None = None
+    ) -> str | None:
+        """
+        Best-first search from `run.url`: every round fetches the `branching` best
+        frontier links concurrently while the model looks at the most promising
+        page fetched so far. Fetched pages are scored by their best link and get
+        the heuristics right away. Links the model picks jump the frontier and
+        the model looks at their page next, without a concurrent question about
+        a weaker page. Links scoring below `min_link_score` are left to the model
+        to pick, and the links of a page it finds nothing promising on are dropped.
+        Stops at the first validated page, when nothing promising is left, or when
+        `max_fetches` and `max_llm_calls` are spent.
+
+        `checkpoint` is called with each page the model is asked about, the
+        page a resumed search starts from.
+        """
+        order = itertools.count()
+        # (-priority, order, url, depth, id of the page it was found on) of links to fetch
+        frontier: list[tuple[float, int, str, int, int]] = []
+        # (-score, id, page, depth) of fetched pages the model hasn't looked at
+        undecided: list[tuple[float, int, _CompanyRun, int]] = []
+        new_pages = [(run.url, run.links, 0, False)]
+        fetched = {canonicalize_url(run.url)} if run.url else set()
+        # Pages the model found nothing promising on
+        dropped: set[int] = set()
+        fetches = 0
+
+        def pick(link: str, depth: int):
+            # The model's pick goes before anything the ranker suggested
+            heapq.heappush(frontier, (-math.inf, next(order), link, depth + 1, -1))
+
+        async def accept(decision: LinkDecision, depth: int) -> bool:
+            if await self.validate_proposal(decision.link):
+                run.decision = decision
+                return True
+            self._reject(run, decision.link)
+            # Rejected proposals are never offered again, but may lead to the real listing
+            pick(decision.link, depth)
+            return False
+
+        while True:
+            for page_url, links, depth, picked in new_pages:
+                page = _CompanyRun(run.company_url, page_url, links, visited=run.visited)
+                page_id = next(order)
+                await self._rank(page)
+                decision = self.classifier.classify(page.top_links, all_links=links, exclude=run.visited)
+                if decision is not None and (depth == 0 or picked):
+                    # The model would have been asked about these pages next
+                    self._saved_llm_call(page)
+                if decision is not None and await accept(decision, depth):
+                    return self.get_career_page(decision.link)
+
+                promising = [(link, score) for link, _, score in page.top_links if score >= self.min_link_score]
+                for link, score in promising:
+                    heapq.heappush(frontier, (-score * DEPTH_DECAY**depth, next(order), link, depth + 1, page_id))
+                best_score = math.inf if picked else page.top_links[0][2] if page.top_links else 0.0
+                heapq.heappush(undecided, (-best_score * DEPTH_DECAY**depth, page_id, page, depth))
+            new_pages = []
+
+            batch = []
+            while frontier and len(batch) < self.branching and fetches + len(batch) < self.max_fetches:
+                priority, _, link, depth, found_on = heapq.heappop(frontier)
+                if found_on in dropped:
+                    continue
+                next_url = self.get_next_link(link)
+                key = canonicalize_url(next_url)
+                if key in fetched:
+                    continue
+                fetched.add(key)
+                run.visited.add(key)
+                if self.seen is None or self.seen.add(next_url):
+                    batch.append((next_url, depth, priority == -math.inf))
+
+            ask, ask_depth = None, 0
+            # While a page the model picked is fetched, its answer is awaited rather than
+            # spending a call on a page it ranked lower
+            following = any(picked for _, _, picked in batch)
+            if undecided and not following and run.prompt_count < self.max_llm_calls:
+                _, ask_id, ask, ask_depth = heapq.heappop(undecided)
+                await self._rank(ask)
+                ask.probe_url, run.probe_url = run.probe_url, None
+                if checkpoint is not None and ask.url is not None:
+                    checkpoint(run, ask.url)
+            if not batch and ask is None:
+                return None
+
+            fetches += len(batch)
+            run.hops += len(batch)
+            pages = await asyncio.gather(
+                *(self._fetch_links(url) for url, _, _ in batch),
+                self._decide(ask) if ask is not None else asyncio.sleep(0),
+                return_exceptions=True,
+            )
+            *page_links, decision = pages
+            new_pages = [
+                (url, links if isinstance(links, list) else [], depth, picked)
+                for (url, depth, picked), links in zip(batch, page_links)
+            ]
+
+            if ask is None:
+                continue
+            run.prompt_count += ask.prompt_count
+            if isinstance(decision, BaseException):
+                raise decision
+            if decision.action == Action.CAREERS_PAGE_FOUND and decision.link is not None:
+                if await accept(decision, ask_depth):
+                    return self.get_career_page(decision.link)
+            elif decision.action == Action.NEXT_LINK_TO_CRAWL:
+                pick(decision.link, ask_depth)
+            elif decision.action == Action.NO_PROMISING_LINKS:
+                dropped.add(ask_id)
+
+    async def run(
+        self,
+        company_urls: Iterable[str] | AsyncIterable[str],
+        fetch_workers: int = 8,
+        rank_workers: int = 1,
+        classify_workers: int = 16,
+        validate_workers: int = 4,
+        max_in_flight: int = 64,
+        journal: RunJournal | None = None,
+        retry_failed: bool = False,
+    ) -> AsyncIterator[CareerResult]:
+        """
+        Finds the careers page of every company and yields a CareerResult per
+        company as soon as it is done (not in input order).
+
+        Companies flow through fetch -> rank -> classify -> validate stages, each
+        with its own workers, and jump back to fetch when the model picks a link
+        to crawl or to rank when a proposal is rejected. At most `max_in_flight`
+        companies are admitted at once and every queue holds that many, so the
+        feedback can never block a stage and memory stays constant however long
+        `company_urls` is. Classification includes the LLM fallback, so
+        `classify_workers` is the number of concurrent model requests. In
+        best-first mode the whole search of a company runs in the classify stage.
+        With a ProcessOffload links are scored in its pool, so `rank_workers`
+        can go up to its number of processes.
+
+        With `discovery` the fetch stage first looks for candidates in the
+        company's sitemaps. A candidate the heuristics accept goes straight to
+        validation, so the company may resolve without rendering a page; the
+        other candidates join the start page's links.
+
+        With a `journal` every hop and result is recorded: companies already done
+        are skipped, failed ones are only rerun with `retry_failed`, and companies
+        cut off mid search resume from their last page with their visited URLs.
+
+            async for result in pipeline.run(company_urls):
+                print(result.company_url, result.career_page)
+        """
+        admission = asyncio.Semaphore(max_in_flight)
+        fetch_queue: asyncio.Queue[_CompanyRun] = asyncio.Queue(max_in_flight)
+        rank_queue: asyncio.Queue[_CompanyRun] = asyncio.Queue(max_in_flight)
+        classify_queue: asyncio.Queue[_CompanyRun] = asyncio.Queue(max_in_flight)
+        validate_queue: asyncio.Queue[_CompanyRun] = asyncio.Queue(max_in_flight)
+        # None marks the end of the input
+        results: asyncio.Queue[CareerResult | None] = asyncio.Queue(max_in_flight + 1)
+
+        async def fetch(run: _CompanyRun):
+            if run.hops == 0 and run.seeds is None and self.discovery is not None and await self._seed(run):
+                await validate_queue.put(run)
+                return
+            run.links = await self._fetch_links(run.url)
+            if run.hops == 0 and run.seeds:
+                # Sitemap candidates compete with the start page's links
+                run.links = run.links + run.seeds
+            if not run.links and run.hops == 0:
+                await results.put(run.result(error="no links on the start page"))
+            else:
+                await rank_queue.put(run)
+
+        async def rank(run: _CompanyRun):
+            if run.prompt_count >= self.max_llm_calls:
+                await results.put(run.result())
+                return
+            await self._rank(run)
+            await classify_queue.put(run)
+
+        async def classify(run: _CompanyRun):
+            if self.search == "best_first":
+                await results.put(run.result(career_page=await self._best_first(run, checkpoint)))
+                return
+            decision = await self._decide(run)
+            if decision.action == Action.CAREERS_PAGE_FOUND and decision.link is not None:
+                await validate_queue.put(run)
+            elif decision.action == Action.NEXT_LINK_TO_CRAWL:
+                await follow(run, decision.link)
+            else:
+                await results.put(run.result())
+
+        async def validate(run: _CompanyRun):
+            link = run.decision.link
+            if await self.validate_proposal(link):
+                await results.put(run.result(career_page=self.get_career_page(link)))
+            elif not self._reject(run, link):
+                await results.put(run.result())
+            elif run.hops == 0 and run.seeds and not run.links:
+                # A sitemap candidate failed before the start page was fetched, search from there
+                await fetch_queue.put(run)
+            else:
+                # A rejected proposal is often a landing page in front of the real listing
+                await follow(run, link)
+
+        def checkpoint(run: _CompanyRun, url: str):
+            if journal is not None:
+                journal.record_progress(run.company_url, url, sorted(run.visited), run.hops, run.prompt_count)
+
+        async def follow(run: _CompanyRun, link: str):
+            if not self._hop(run, link):
+                await rank_queue.put(run)
+                return
+            checkpoint(run, run.url)
+            await fetch_queue.put(run)
+
+        async def worker(queue: asyncio.Queue[_CompanyRun], handle: Callable[[_CompanyRun], Awaitable[None]]):
+            while True:
+                run = await queue.get()
+                try:
+                    await handle(run)
+                except Exception as e:
+                    await results.put(run.result(error=f"{type(e).__name__}: {e}"))
+                finally:
+                    queue.task_done()
+
+        in_flight = 0
+
+        async def feed():
+            nonlocal in_flight
+            try:
+                async for company_url in _iterate(company_urls):
+                    checkpoint = None
+                    if journal is not None:
+                        if not journal.should_run(company_url, retry_failed):
+                            continue
+                        checkpoint = journal.checkpoint(company_url)
+                    if self.seen is not None and not self.seen.add(company_url) and checkpoint is None:
+                        continue
+                    await admission.acquire()
+                    in_flight += 1
+                    run = self._resume_run(checkpoint) if checkpoint else self._new_run([], company_url)
+                    await fetch_queue.put(run)
+            finally:
+                await results.put(None)
+
+        stages = (
+            (fetch_queue, fetch, fetch_workers),
+            (rank_queue, rank, rank_workers),
+            (classify_queue, classify, classify_workers),
+            (validate_queue, validate, validate_workers),
+        )
+        tasks = [
+            asyncio.create_task(worker(queue, handle))
+            for queue, handle, workers in stages
+            for _ in range(workers)
+        ]
+        feeder = asyncio.create_task(feed())
+
+        try:
+            fed = False
+            while not fed or in_flight:
+                result = await results.get()
+                if result is None:
+                    fed = True
+                    await feeder
+                    continue
+                in_flight -= 1
+                admission.release()
+                if journal is not None:
+                    journal.record_result(result)
+                yield result
+        finally:
+            feeder.cancel()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(feeder, *tasks, return_exceptions=True)
+
+    async def validate_proposal(self, proposal: str) -> bool:
+        """
+        Accepts or rejects a proposed careers page from its structure (JSON-LD
+        JobPostings, ATS boards and embeds, repeated postings, apply links) and
+        asks the LLM only when the structural confidence is borderline
+        """
+        telemetry = current_telemetry()
+        with telemetry.stage("career.validate"):
+            accepted = await self._validate_proposal(proposal)
+        telemetry.count("career.validations", outcome="accepted" if accepted else "rejected")
+        return accepted
+
+    async def _validate_proposal(self, proposal: str) -> bool:
+        if self.validator is None:
+            return True
+        # A posting on a known ATS is judged by its board, which get_career_page answers with
+        board = ATS_REGISTRY.board_of(proposal)
+        if board is not None:
+            proposal = board[0]
+        # Boards on a known ATS are recognised from the URL without fetching them
+        if self.validator.confidence(self.validator.inspect("", proposal)) >= self.validator.accept:
+            return True
+
+        async with self._polite(proposal):
+            page = await self.fetch_page(proposal)
+        if not page.success:
+            return False
+        result = self.validator.validate(page.html, page.final_url)
+        if not self.validator.is_borderline(result):
+            accepted = result.confidence >= self.validator.accept
+        else:
+            self.llm_validations += 1
+            offload = self.offload or current_offload()
+            if offload is not None:
+                markdown = await offload.markdown(page.html, page.final_url)
+            else:
+                markdown = html_to_markdown(page.html, page.final_url)
+            accepted = await confirm_careers_page(page.final_url, markdown, result.signals, self.model)
+
+        if not accepted:
+            self._rejected_pages[canonicalize_url(proposal)] = page.links
+            if len(self._rejected_pages) > MAX_REJECTED_PAGES:
+                self._rejected_pages.popitem(last=False)
+        return accepted
+
     def get_next_link(self, proposal: str) -> str:
         return proposal
 
     def get_career_page(self, link: str) -> str:
-        return link
\ No newline at end of file
+        # A single posting on a known ATS stands for the company's board
+        board = ATS_REGISTRY.board_of(link)
+        return board[0] if board is not None else link
+
+    def extract_jobs(self, career_page: str) -> AsyncIterator[list[JobPosting]]:
+        """
+        Streams the job postings of a found careers page in batches, see JobExtractor
+        """
+        return self.extractor.extract(career_page)
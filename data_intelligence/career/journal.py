@@ -0,0 +1,173 @@
+import os
+import time
+from dataclasses import asdict, dataclass
+from enum import StrEnum
+
+import orjson
+
+from .models import CareerResult
+
+
+class RunStatus(StrEnum):
+    IN_PROGRESS = "in_progress"
+    DONE = "done"
+    FAILED = "failed"
+
+
+@dataclass(slots=True)
+class JournalStats:
+    skipped: int = 0
+    resumed: int = 0
+    recorded: int = 0
+
+
+class RunJournal:
+    """
+    Append-only JSONL journal of per-company progress, so a crashed batch run
+    can pick up where it stopped.
+
+    Every hop writes an "in_progress" checkpoint (current URL, visited URLs,
+    hop and prompt counts) and every finished company a "done" or "failed"
+    record with its answer. On open the journal is replayed, the last record
+    per company wins, and a line cut short by a crash is ignored and truncated
+    away. Only each company's status and the offset of its last record stay in
+    memory, the record itself is read back from disk when needed. Best-first searches checkpoint the page they last asked the model
+    about and resume from there, without their frontier.
+
+        with RunJournal("career_journal.jsonl") as journal:
+            async for result in pipeline.run(company_urls, journal=journal):
+                ...
+    """
+
+    def __init__(self, path: str = "career_journal.jsonl", fsync: bool = False):
+        self.path = path
+        # fsync after every record, survives power loss rather than only a process crash
+        self.fsync = fsync
+        self.stats = JournalStats()
+        # company_url -> (status, byte offset of its last record)
+        self._index: dict[str, tuple[RunStatus, int]] = {}
+        self._file = None
+
+    def open(self):
+        if self._file is not None:
+            return
+        if os.path.exists(self.path):
+            # Length of the complete lines, anything after it was cut short by a crash
+            end = 0
+            with open(self.path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    offset = end
+                    end += len(line)
+                    try:
+                        record = orjson.loads(line)
+                        self._index[record["company_url"]] = (RunStatus(record["status"]), offset)
+                    except (orjson.JSONDecodeError, KeyError, TypeError, ValueError):
+                        continue
+            # Dropped so the next record starts on a line of its own instead of extending the fragment
+            if end < os.path.getsize(self.path):
+                os.truncate(self.path, end)
+        self._file = open(self.path, "ab")
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "RunJournal":
+        self.open()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _append(self, record: dict):
+        self.open()
+        record["at"] = time.time()
+        offset = self._file.tell()
+        self._file.write(orjson.dumps(record) + b"\n")
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self._index[record["company_url"]] = (RunStatus(record["status"]), offset)
+        self.stats.recorded += 1
+
+    def _read(self, f, offset: int) -> dict:
+        f.seek(offset)
+        return orjson.loads(f.readline())
+
+    def status(self, company_url: str) -> RunStatus | None:
+        entry = self._index.get(company_url)
+        return entry[0] if entry else None
+
+    def should_run(self, company_url: str, retry_failed: bool = False) -> bool:
+        """
+        False for companies already done, and for failed ones unless `retry_failed`
+        """
+        status = self.status(company_url)
+        run = status is None or status == RunStatus.IN_PROGRESS or (retry_failed and status == RunStatus.FAILED)
+        if not run:
+            self.stats.skipped += 1
+        return run
+
+    def checkpoint(self, company_url: str) -> dict | None:
+        """
+        Returns the last in progress record of a company to resume from, if any
+        """
+        entry = self._index.get(company_url)
+        if entry is None or entry[0] != RunStatus.IN_PROGRESS:
+            return None
+        with open(self.path, "rb") as f:
+            record = self._read(f, entry[1])
+        self.stats.resumed += 1
+        return record
+
+    def record_progress(self, company_url: str, url: str | None, visited: list[str], hops: int, prompts: int):
+        self._append(
+            {
+                "company_url": company_url,
+                "status": RunStatus.IN_PROGRESS,
+                "url": url,
+                "visited": visited,
+                "hops": hops,
+                "prompts": prompts,
+            }
+        )
+
+    def record_result(self, result: CareerResult):
+        record = asdict(result)
+        record["status"] = RunStatus.FAILED if result.error else RunStatus.DONE
+        self._append(record)
+
+    def results(self) -> list[CareerResult]:
+        """
+        Final results of every finished company, e.g. to export a completed run
+        """
+        self.open()
+        fields = CareerResult.__dataclass_fields__
+        results = []
+        with open(self.path, "rb") as f:
+            for status, offset in self._index.values():
+                if status == RunStatus.IN_PROGRESS:
+                    continue
+                record = self._read(f, offset)
+                results.append(CareerResult(**{key: value for key, value in record.items() if key in fields}))
+        return results
+
+    def compact(self):
+        """
+        Rewrites the journal keeping only the last record of each company
+        """
+        self.open()
+        self.close()
+        tmp_path = self.path + ".tmp"
+        index = {}
+        with open(self.path, "rb") as src, open(tmp_path, "wb") as dst:
+            for company_url, (status, offset) in self._index.items():
+                src.seek(offset)
+                index[company_url] = (status, dst.tell())
+                dst.write(src.readline())
+        os.replace(tmp_path, self.path)
+        self._index = index
+        self.open()
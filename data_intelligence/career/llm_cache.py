@@ -0,0 +1,154 @@
+import time
+from collections.abc import AsyncIterator, Sequence
+from dataclasses import dataclass
+
+import aiosqlite
+import orjson
+import xxhash
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_decisions (
+    key TEXT PRIMARY KEY,
+    request BLOB NOT NULL,
+    response BLOB NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS llm_decisions_accessed_at ON llm_decisions (accessed_at);
+"""
+
+
+class CacheMissError(LookupError):
+    """
+    Raised in replay mode when a decision was never recorded
+    """
+
+
+@dataclass(slots=True)
+class LLMCacheStats:
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+
+
+def decision_key(system_prompt: str, url: str | None, links: Sequence[tuple[str, ...]]) -> str:
+    """
+    Content address of one link selection request: xxh3-128 of the whitespace
+    normalized system prompt, the current URL and the sorted candidate links.
+    Link order doesn't change the key, so the same navigation seen on several
+    pages or runs hits the same entry.
+    """
+    hasher = xxhash.xxh3_128()
+    hasher.update(" ".join(system_prompt.split()).encode())
+    hasher.update(b"\0")
+    hasher.update((url or "").encode())
+    for link, text, *_ in sorted(links):
+        hasher.update(b"\0")
+        hasher.update(f"{link}\t{text}".encode())
+    return hasher.hexdigest()
+
+
+class LLMDecisionCache:
+    """
+    Persistent SQLite cache of LLM link selection decisions.
+
+    Entries older than `ttl` seconds (if set) are ignored and the least recently
+    used entries are evicted past `max_entries`. With `replay=True` the cache
+    never falls through to the model: misses raise CacheMissError, which makes
+    reruns over recorded company lists deterministic and free.
+
+        async with LLMDecisionCache("llm_cache.sqlite") as cache:
+            pipeline = CareerPipeline(llm_cache=cache)
+    """
+
+    def __init__(
+        self,
+        path: str = "llm_cache.sqlite",
+        max_entries: int = 200_000,
+        ttl: float | None = None,
+        replay: bool = False,
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.replay = replay
+        self.stats = LLMCacheStats()
+        self._db: aiosqlite.Connection | None = None
+        self._entries = 0
+
+    async def open(self):
+        if self._db is not None:
+            return
+        self._db = await aiosqlite.connect(self.path)
+        await self._db.executescript(_SCHEMA)
+        await self._db.commit()
+        async with self._db.execute("SELECT COUNT(*) FROM llm_decisions") as cursor:
+            (self._entries,) = await cursor.fetchone()
+
+    async def close(self):
+        if self._db is not None:
+            await self._db.close()
+            self._db = None
+
+    async def __aenter__(self) -> "LLMDecisionCache":
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def get(self, key: str) -> dict | None:
+        await self.open()
+        async with self._db.execute(
+            "SELECT response, created_at FROM llm_decisions WHERE key = ?", (key,)
+        ) as cursor:
+            row = await cursor.fetchone()
+
+        now = time.time()
+        if row is None or (self.ttl is not None and now - row[1] > self.ttl):
+            self.stats.misses += 1
+            if self.replay:
+                raise CacheMissError(key)
+            return None
+
+        await self._db.execute("UPDATE llm_decisions SET accessed_at = ? WHERE key = ?", (now, key))
+        await self._db.commit()
+        self.stats.hits += 1
+        return orjson.loads(row[0])
+
+    async def put(self, key: str, request: dict, response: dict):
+        await self.open()
+        now = time.time()
+        async with self._db.execute("SELECT 1 FROM llm_decisions WHERE key = ?", (key,)) as cursor:
+            exists = await cursor.fetchone() is not None
+
+        await self._db.execute(
+            "INSERT OR REPLACE INTO llm_decisions VALUES (?, ?, ?, ?, ?)",
+            (key, orjson.dumps(request), orjson.dumps(response), now, now),
+        )
+        if not exists:
+            self._entries += 1
+        self.stats.stores += 1
+
+        overflow = self._entries - self.max_entries
+        if overflow > 0:
+            await self._db.execute(
+                "DELETE FROM llm_decisions WHERE key IN "
+                "(SELECT key FROM llm_decisions ORDER BY accessed_at LIMIT ?)",
+                (overflow,),
+            )
+            self._entries -= overflow
+            self.stats.evictions += overflow
+        await self._db.commit()
+
+    async def records(self) -> AsyncIterator[tuple[dict, dict]]:
+        """
+        Yields every recorded (request, response) pair, oldest first, for replays and audits
+        """
+        await self.open()
+        async with self._db.execute(
+            "SELECT request, response FROM llm_decisions ORDER BY created_at"
+        ) as cursor:
+            async for request, response in cursor:
+                yield orjson.loads(request), orjson.loads(response)
@@ -0,0 +1,81 @@
+from dataclasses import dataclass, field
+from enum import StrEnum
+
+from data_collector.scraper.urls import canonicalize_url
+
+
+class Action(StrEnum):
+    CAREERS_PAGE_FOUND = "CAREERS_PAGE_FOUND"
+    NEXT_LINK_TO_CRAWL = "NEXT_LINK_TO_CRAWL"
+    NO_PROMISING_LINKS = "NO_PROMISING_LINKS"
+
+
+@dataclass(slots=True)
+class LinkDecision:
+    """
+    What to do with a page: accept `link` as the careers page, crawl `link` next, or give up
+    """
+    action: Action
+    link: str | None = None
+    # "heuristic" or "llm"
+    source: str = "llm"
+    confidence: float = 1.0
+
+    @classmethod
+    def from_response(cls, response: dict, current_url: str | None, source: str = "llm") -> "LinkDecision":
+        try:
+            action = Action(response.get("action"))
+        except ValueError:
+            action = Action.NO_PROMISING_LINKS
+
+        link = response.get("next_link")
+        # Guard rail so the pipeline doesn't start looping the current url
+        if (
+            action == Action.NEXT_LINK_TO_CRAWL
+            and link
+            and current_url
+            and canonicalize_url(link) == canonicalize_url(current_url)
+        ):
+            action = Action.CAREERS_PAGE_FOUND
+
+        if action == Action.CAREERS_PAGE_FOUND:
+            link = link or current_url
+        elif action == Action.NEXT_LINK_TO_CRAWL and not link:
+            action = Action.NO_PROMISING_LINKS
+        return cls(action=action, link=link, source=source)
+
+
+@dataclass(slots=True)
+class CareerResult:
+    """
+    Outcome of one company run through `CareerPipeline.run`
+    """
+    company_url: str
+    career_page: str | None = None
+    # Source of the decision that found the page: "heuristic", "ats", "sitemap", "llm" or "llm_cache"
+    source: str | None = None
+    hops: int = 0
+    prompts: int = 0
+    elapsed: float = 0.0
+    error: str | None = None
+    visited: list[str] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class JobPosting:
+    """
+    One open position listed on a careers page
+    """
+    title: str
+    url: str | None = None
+    company: str | None = None
+    location: str | None = None
+    employment_type: str | None = None
+    date_posted: str | None = None
+    valid_through: str | None = None
+    # "json-ld", "microdata", "list" or "ats:<provider>"
+    source: str = "list"
+    # Careers page the posting was listed on
+    page_url: str | None = None
+    # The site's own id of the posting, from JSON-LD or microdata "identifier"
+    identifier: str | None = None
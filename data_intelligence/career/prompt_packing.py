@@ -0,0 +1,139 @@
+import logging
+import re
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from functools import cache
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+import tiktoken
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ENCODING = "o200k_base"
+DEFAULT_LINK_TOKEN_BUDGET = 1500
+ALIAS = re.compile(r"^L\d+$", re.I)
+# Characters per token of the approximate encoding, about right for English and Finnish prose
+CHARS_PER_TOKEN = 4
+
+
+class ApproximateEncoding:
+    """
+    Stand-in for a tiktoken encoding that can't be loaded: every `CHARS_PER_TOKEN`
+    characters count as a token. Budgets come out roughly right, which is all
+    the packing needs.
+    """
+
+    name = "approximate"
+
+    def encode(self, text: str, disallowed_special=()) -> list[str]:
+        return [text[i:i + CHARS_PER_TOKEN] for i in range(0, len(text), CHARS_PER_TOKEN)]
+
+    def decode(self, tokens: list[str]) -> str:
+        return "".join(tokens)
+
+
+@cache
+def get_encoding(name: str = DEFAULT_ENCODING) -> tiktoken.Encoding | ApproximateEncoding:
+    """
+    Returns the tiktoken encoding `name`, or an ApproximateEncoding when it isn't
+    cached locally and can't be downloaded (e.g. offline, without TIKTOKEN_CACHE_DIR)
+    """
+    try:
+        return tiktoken.get_encoding(name)
+    except (OSError, ValueError) as e:
+        logger.warning("Tiktoken encoding %s unavailable, counting characters / %d: %s", name, CHARS_PER_TOKEN, e)
+        return ApproximateEncoding()
+
+
+def count_tokens(text: str, encoding: str = DEFAULT_ENCODING) -> int:
+    return len(get_encoding(encoding).encode(text, disallowed_special=()))
+
+
+def fit_text(text: str, token_budget: int, encoding: str = DEFAULT_ENCODING) -> str:
+    """
+    Cuts `text` to at most `token_budget` tokens
+    """
+    tokens = get_encoding(encoding).encode(text, disallowed_special=())
+    if len(tokens) <= token_budget:
+        return text
+    return get_encoding(encoding).decode(tokens[:token_budget])
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme, parts.netloc, "", "", ""))
+
+
+@dataclass(slots=True)
+class PackedLinks:
+    """
+    Compact prompt text for a link list plus the mapping back from the aliases
+    the model is asked to answer with
+    """
+    text: str
+    aliases: dict[str, str] = field(default_factory=dict)
+    origin: str = ""
+    tokens: int = 0
+    # Links left out to stay under the token budget
+    dropped: int = 0
+
+    def resolve(self, answer: str | None) -> str | None:
+        """
+        Maps the model's answer (an alias like "L3", a shortened path or a full URL) back
+        to the real URL. Returns None for answers that are none of these, e.g. an alias
+        that wasn't offered or a bare word, rather than a link the pipeline can't fetch.
+        """
+        if not answer:
+            return None
+        answer = answer.strip().strip("[]").strip()
+        if ALIAS.match(answer):
+            return self.aliases.get(answer.upper())
+        try:
+            if answer.startswith("/"):
+                if not self.origin:
+                    return None
+                answer = urljoin(self.origin + "/", answer)
+            parts = urlsplit(answer)
+        except ValueError:
+            return None
+        return answer if parts.scheme in ("http", "https") and parts.hostname else None
+
+
+def pack_links(
+    url: str | None,
+    links: Sequence[tuple[str, str, float]],
+    token_budget: int = DEFAULT_LINK_TOKEN_BUDGET,
+    encoding: str = DEFAULT_ENCODING,
+) -> PackedLinks:
+    """
+    Formats ranked links for the model as "L<n> <path> <anchor text>" lines.
+
+    Duplicates (ignoring fragments) are dropped, links on the current site are
+    shortened to their path, and lines are added in rank order until the token
+    budget is used up, so the best links always make it in.
+    """
+    origin = _origin(url) if url else ""
+    header = f"Current URL: {url or 'unknown'}\n\nLinks:"
+    used = count_tokens(header, encoding)
+    lines, aliases, seen = [header], {}, set()
+    dropped = 0
+
+    for link, text, _ in links:
+        link = link.split("#", 1)[0]
+        if not link or link in seen:
+            continue
+        seen.add(link)
+
+        alias = f"L{len(aliases) + 1}"
+        shown = (link[len(origin):] or "/") if origin and _origin(link) == origin else link
+        line = f"{alias} {shown} {' '.join(text.split())}".rstrip()
+        cost = count_tokens(line, encoding) + 1
+        if used + cost > token_budget:
+            dropped += 1
+            continue
+
+        used += cost
+        aliases[alias] = link
+        lines.append(line)
+
+    return PackedLinks(text="\n".join(lines), aliases=aliases, origin=origin, tokens=used, dropped=dropped)
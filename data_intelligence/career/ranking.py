@@ -0,0 +1,227 @@
+import heapq
+import json
+import math
+from collections.abc import Collection, Iterable, Sequence
+from dataclasses import dataclass
+from functools import cache
+from typing import Protocol
+from urllib.parse import urlsplit
+
+import numpy as np
+from rank_bm25 import BM25Okapi
+
+from data_collector.scraper.offload import ProcessOffload, current_offload
+from data_collector.scraper.urls import canonicalize_url
+
+from .definitions import CAREER_PAGE_KEYWORDS
+from .helpers import FOLD, KeywordAutomaton, default_scorer, tokenize
+
+
+class LinkScorer(Protocol):
+    def score(self, links: Sequence[tuple[str, str]]) -> list[float]: ...
+
+
+@dataclass(frozen=True, slots=True)
+class FieldWeights:
+    path: float = 1.0
+    text: float = 1.0
+    domain: float = 0.5
+
+
+def _fold(tokens: Iterable[str]) -> list[str]:
+    return [token.translate(FOLD) for token in tokens]
+
+
+class _BM25(BM25Okapi):
+    """
+    BM25Okapi with the always positive idf of BM25+. Okapi's idf goes negative for
+    terms in more than half the documents, which on a page with a handful of
+    links makes even a lone "Jobs" link score below zero.
+    """
+
+    def _calc_idf(self, nd):
+        for word, freq in nd.items():
+            self.idf[word] = math.log((self.corpus_size + 1) / freq)
+
+
+class BM25LinkScorer:
+    """
+    Scores links with BM25 against the career keyword query, separately over the
+    URL path, anchor text and domain of each link, then combines them with `weights`.
+
+    Tokens are accent folded ("työpaikat" -> "tyopaikat") and expanded with every
+    keyword they contain, so "rekrytointi" also matches "rekry".
+    """
+
+    def __init__(self, query: Iterable[str] = CAREER_PAGE_KEYWORDS, weights: FieldWeights = FieldWeights()):
+        self.query = sorted(set(_fold(keyword.lower() for keyword in query)))
+        self.weights = weights
+        self._automaton = KeywordAutomaton(self.query)
+
+    def _tokens(self, text: str) -> list[str]:
+        tokens = _fold(tokenize(text))
+        expanded = list(tokens)
+        for token in tokens:
+            expanded.extend(keyword for _, keyword in self._automaton.find(token) if keyword != token)
+        return expanded
+
+    def _field_scores(self, documents: list[list[str]]) -> np.ndarray:
+        if not any(documents):
+            return np.zeros(len(documents))
+        return _BM25(documents).get_scores(self.query)
+
+    def field_scores(self, links: Sequence[tuple[str, str]]) -> np.ndarray:
+        """
+        Returns an (n, 3) array of path, text and domain BM25 scores
+        """
+        paths, texts, domains = [], [], []
+        for url, text in links:
+            parts = urlsplit(url)
+            paths.append(self._tokens(f"{parts.path} {parts.query}"))
+            texts.append(self._tokens(text))
+            domains.append(self._tokens(parts.hostname or ""))
+
+        return np.column_stack([self._field_scores(paths), self._field_scores(texts), self._field_scores(domains)])
+
+    def score(self, links: Sequence[tuple[str, str]]) -> list[float]:
+        if not links:
+            return []
+        weights = np.array([self.weights.path, self.weights.text, self.weights.domain])
+        return (self.field_scores(links) @ weights).tolist()
+
+
+class LogisticLinkScorer:
+    """
+    Logistic regression over the BM25 field scores, keyword score and path depth
+    of a link. Train it on labeled (link, is careers page) pairs with `fit`,
+    persist with `save` and plug it into `LinkRanker` in place of the BM25 scorer.
+    """
+
+    FEATURES = ("bm25_path", "bm25_text", "bm25_domain", "keywords", "path_depth")
+
+    def __init__(self, coefficients: Sequence[float] | None = None, intercept: float = 0.0):
+        self.coefficients = np.asarray(coefficients if coefficients is not None else [1.0, 1.0, 0.5, 1.0, -0.2])
+        self.intercept = intercept
+        self._bm25 = BM25LinkScorer()
+
+    def features(self, links: Sequence[tuple[str, str]]) -> np.ndarray:
+        depth = [len([part for part in urlsplit(url).path.split("/") if part]) for url, _ in links]
+        return np.column_stack([
+            self._bm25.field_scores(links),
+            default_scorer().score(links),
+            depth,
+        ])
+
+    def score(self, links: Sequence[tuple[str, str]]) -> list[float]:
+        if not links:
+            return []
+        logits = self.features(links) @ self.coefficients + self.intercept
+        return (1 / (1 + np.exp(-logits))).tolist()
+
+    @classmethod
+    def fit(
+        cls,
+        links: Sequence[tuple[str, str]],
+        labels: Sequence[int],
+        epochs: int = 500,
+        learning_rate: float = 0.1,
+        l2: float = 0.01,
+    ) -> "LogisticLinkScorer":
+        model = cls(np.zeros(len(cls.FEATURES)))
+        X = model.features(links)
+        y = np.asarray(labels, dtype=float)
+        for _ in range(epochs):
+            predictions = 1 / (1 + np.exp(-(X @ model.coefficients + model.intercept)))
+            error = predictions - y
+            model.coefficients -= learning_rate * (X.T @ error / len(y) + l2 * model.coefficients)
+            model.intercept -= learning_rate * error.mean()
+        return model
+
+    def save(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "features": self.FEATURES,
+                "coefficients": self.coefficients.tolist(),
+                "intercept": self.intercept,
+            }, f, indent=2)
+
+    @classmethod
+    def load(cls, path: str) -> "LogisticLinkScorer":
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["coefficients"], data["intercept"])
+
+
+@cache
+def _default_link_scorer() -> BM25LinkScorer:
+    return BM25LinkScorer()
+
+
+def _score_links(scorer: LinkScorer | None, links: list[tuple[str, str]]) -> list[float]:
+    # Runs in offload workers, which build the default scorer once per process
+    return (scorer or _default_link_scorer()).score(links)
+
+
+class LinkRanker:
+    """
+    Scores the links of one page once and answers top-k queries with partial
+    selection instead of sorting every link. Links are deduplicated by
+    canonical URL, and `exclude` holds canonical URLs.
+
+        ranker = LinkRanker(await scrape_links(url))
+        ranker.top_k(5)
+    """
+
+    def __init__(self, links: Iterable[tuple[str, str] | str], scorer: LinkScorer | None = None):
+        self._index(links)
+        self.scores = (scorer or BM25LinkScorer()).score(self.links)
+
+    def _index(self, links: Iterable[tuple[str, str] | str]):
+        unique: dict[str, tuple[str, str]] = {}
+        for link in links:
+            url, text = (link, "") if isinstance(link, str) else link
+            key = canonicalize_url(url)
+            # Keep the first URL form and the most descriptive anchor text for links that appear several times
+            if key not in unique:
+                unique[key] = (url, text)
+            elif len(text) > len(unique[key][1]):
+                unique[key] = (unique[key][0], text)
+
+        self.keys = list(unique)
+        self.links = list(unique.values())
+
+    @classmethod
+    async def create(
+        cls,
+        links: Iterable[tuple[str, str] | str],
+        scorer: LinkScorer | None = None,
+        offload: ProcessOffload | None = None,
+    ) -> "LinkRanker":
+        """
+        Like the constructor, but scores pages with many links in the process
+        pool of `offload` (or the current `async with ProcessOffload()`).
+        A custom `scorer` must be picklable to be offloaded.
+        """
+        offload = offload or current_offload()
+        if offload is None:
+            return cls(links, scorer)
+
+        ranker = cls.__new__(cls)
+        ranker._index(links)
+        size = sum(len(url) + len(text) for url, text in ranker.links)
+        ranker.scores = await offload.run("rank", size, _score_links, scorer, ranker.links)
+        return ranker
+
+    def __len__(self) -> int:
+        return len(self.links)
+
+    def top_k(self, k: int, exclude: Collection[str] = ()) -> list[tuple[str, str, float]]:
+        """
+        Returns the `k` best (url, text, score) tuples, best first, skipping urls in `exclude`
+        """
+        candidates = (
+            (url, text, score)
+            for key, (url, text), score in zip(self.keys, self.links, self.scores)
+            if key not in exclude
+        )
+        return heapq.nlargest(k, candidates, key=lambda link: link[2])
@@ -0,0 +1,236 @@
+import json
+import re
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from urllib.parse import urljoin
+
+import lxml.etree
+import lxml.html
+
+from data_collector.scraper.urls import canonicalize_url
+
+from .ats import ATS_REGISTRY, ATSRegistry
+
+# "Hae" alone is as often a search button as an apply button, so only its apply phrases count
+APPLY = re.compile(
+    r"\b(apply|hae (nyt|paikkaa|tähän|työpaikkaa)|hakemus|jätä hakemus|lähetä hakemus|ansök|sök tjänsten|bewerben)\b",
+    re.I,
+)
+# Link to a single posting below a listing, e.g. /jobs/senior-developer or /avoimet-tyopaikat/123
+JOB_LINK = re.compile(
+    r"/(jobs?|careers?|positions?|vacanc(y|ies)|openings?|rekry|rekrytointi|tyopaikat|työpaikat|"
+    r"avoimet-?tyopaikat|avoimet-?työpaikat|paikat|ilmoitus)/[^/?#]+",
+    re.I,
+)
+# Dates as postings show them: 2025-03-31, 31.3.2025, 31.3. or 3/31/2025
+DATE = re.compile(r"\b(\d{4}-\d{2}-\d{2}|\d{1,2}\.\d{1,2}\.(\d{2,4})?|\d{1,2}/\d{1,2}/\d{2,4})(?!\d)")
+MIN_REPEATED_ITEMS = 3
+
+# Weight of each signal in the noisy-or confidence: 1 - prod(1 - weight) over the signals present
+SIGNAL_WEIGHTS = {
+    "job_postings": 0.9,
+    "ats_board": 0.85,
+    "ats_embed": 0.7,
+    "repeated_items": 0.5,
+    "job_links": 0.4,
+    "apply_links": 0.2,
+}
+
+
+@dataclass(slots=True)
+class PageSignals:
+    """
+    Structural hints that a page lists open positions
+    """
+    # JobPosting items in JSON-LD or microdata
+    job_postings: int = 0
+    apply_links: int = 0
+    job_links: int = 0
+    # Largest group of sibling elements with the same tag and class that link to postings
+    repeated_items: int = 0
+    # Most items of one such group with an apply link or a date, which bare navigation links lack
+    detailed_items: int = 0
+    # Name of the ATS whose widget or iframe is embedded
+    ats_embed: str | None = None
+    # The page itself is a job board on a known ATS
+    ats_board: str | None = None
+
+    def present(self) -> list[str]:
+        return [
+            name
+            for name, present in (
+                ("job_postings", self.job_postings > 0),
+                ("ats_board", self.ats_board is not None),
+                ("ats_embed", self.ats_embed is not None),
+                ("repeated_items", self.repeated_items >= MIN_REPEATED_ITEMS),
+                # A list of bare links, e.g. a careers landing page's /careers/... sub
+                # navigation, is the job links and the repeated items at once: it counts once
+                ("job_links", self.job_links >= MIN_REPEATED_ITEMS
+                 and (self.repeated_items < MIN_REPEATED_ITEMS or self.detailed_items > 0)),
+                ("apply_links", self.apply_links > 0),
+            )
+            if present
+        ]
+
+
+@dataclass(slots=True)
+class ValidationResult:
+    confidence: float
+    signals: PageSignals = field(default_factory=PageSignals)
+    # "structure" when decided from the page structure, "llm" for borderline pages the model decided
+    source: str = "structure"
+
+
+@dataclass(slots=True)
+class ValidatorStats:
+    accepted: int = 0
+    rejected: int = 0
+    borderline: int = 0
+
+
+def json_ld_nodes(doc: lxml.html.HtmlElement, item_type: str) -> Iterator[dict]:
+    """
+    Yields the JSON-LD objects of `item_type` in the page, including ones nested
+    in @graph, ItemList and mainEntity wrappers
+    """
+    def walk(data) -> Iterator[dict]:
+        if isinstance(data, list):
+            for item in data:
+                yield from walk(item)
+        elif isinstance(data, dict):
+            types = data.get("@type")
+            if item_type == types or (isinstance(types, list) and item_type in types):
+                yield data
+            for key in ("@graph", "itemListElement", "item", "mainEntity"):
+                if key in data:
+                    yield from walk(data[key])
+
+    for script in doc.xpath('//script[contains(@type, "ld+json")]'):
+        try:
+            yield from walk(json.loads(script.text_content()))
+        except ValueError:
+            continue
+
+
+def is_job_link(href: str, page_url: str, registry: ATSRegistry = ATS_REGISTRY) -> bool:
+    return JOB_LINK.search(href) is not None or (
+        registry.match(href) is not None and href.rstrip("/") != page_url.rstrip("/")
+    )
+
+
+def posting_groups(
+    doc: lxml.html.HtmlElement, url: str, registry: ATSRegistry = ATS_REGISTRY
+) -> dict[tuple, list[tuple[lxml.html.HtmlElement, str]]]:
+    """
+    Groups the links to postings by the list item they sit in, i.e. their nearest
+    ancestor with siblings of the same tag and class. Returns the (item, href)
+    pairs of every group keyed by (parent, (tag, class)).
+    """
+    groups: dict[tuple, list[tuple[lxml.html.HtmlElement, str]]] = {}
+    seen = set()
+    for anchor in doc.iter("a"):
+        href = urljoin(url, (anchor.get("href") or "").strip())
+        if href in seen or not is_job_link(href, url, registry):
+            continue
+        seen.add(href)
+
+        item = anchor
+        while item is not None and item.getparent() is not None:
+            parent = item.getparent()
+            signature = (item.tag, item.get("class"))
+            if sum(1 for sibling in parent if (sibling.tag, sibling.get("class")) == signature) > 1:
+                groups.setdefault((parent, signature), []).append((item, href))
+                break
+            item = parent
+    return groups
+
+
+def _has_details(item: lxml.html.HtmlElement) -> bool:
+    if item.find(".//time") is not None:
+        return True
+    # Joined per text node, text_content() would run "Developer" and "Apply" together
+    text = " ".join(" ".join(item.itertext()).split())
+    return APPLY.search(text) is not None or DATE.search(text) is not None
+
+
+class StructuralValidator:
+    """
+    Scores how likely a proposed page is a careers page from its HTML alone:
+    JSON-LD or microdata JobPostings, a known ATS board or embed, repeated
+    posting-like items, posting links and apply buttons. Each signal has a
+    weight in SIGNAL_WEIGHTS and the confidence is their noisy-or. Posting
+    links only add to repeated items when some items carry an apply link or
+    a date, so a landing page linking to its sections stays borderline.
+
+    Pages at or above `accept` pass, at or below `reject` fail, and anything in
+    between is borderline and worth a model look.
+    """
+
+    def __init__(self, accept: float = 0.7, reject: float = 0.3, registry: ATSRegistry = ATS_REGISTRY):
+        self.accept = accept
+        self.reject = reject
+        self.registry = registry
+        self.stats = ValidatorStats()
+
+    def inspect(self, html: str | bytes, url: str) -> PageSignals:
+        signals = PageSignals()
+        board = self.registry.board_of(url)
+        # Only the board itself, a single posting on the ATS is no careers page
+        if board is not None and canonicalize_url(board[0]) == canonicalize_url(url):
+            signals.ats_board = board[1].name
+
+        if not html or not html.strip():
+            return signals
+        try:
+            doc = lxml.html.fromstring(html)
+        except (lxml.etree.ParserError, ValueError):
+            return signals
+
+        signals.job_postings = sum(1 for _ in json_ld_nodes(doc, "JobPosting"))
+        signals.job_postings += len(doc.xpath('//*[contains(@itemtype, "schema.org/JobPosting")]'))
+
+        for node in doc.xpath("//iframe[@src]|//script[@src]"):
+            provider = self.registry.match(urljoin(url, node.get("src")))
+            if provider is not None:
+                signals.ats_embed = provider.name
+                break
+
+        job_links = set()
+        for anchor in doc.iter("a"):
+            href = urljoin(url, (anchor.get("href") or "").strip())
+            if APPLY.search(" ".join(anchor.text_content().split())):
+                signals.apply_links += 1
+            if is_job_link(href, url, self.registry):
+                job_links.add(href)
+
+        for button in doc.xpath("//button|//input[@type='submit']"):
+            if APPLY.search(button.text_content() or button.get("value") or ""):
+                signals.apply_links += 1
+
+        signals.job_links = len(job_links)
+        groups = posting_groups(doc, url, self.registry).values()
+        signals.repeated_items = max(map(len, groups), default=0)
+        signals.detailed_items = max(
+            (sum(1 for item, _ in group if _has_details(item)) for group in groups), default=0
+        )
+        return signals
+
+    def confidence(self, signals: PageSignals) -> float:
+        miss = 1.0
+        for name in signals.present():
+            miss *= 1 - SIGNAL_WEIGHTS[name]
+        return 1 - miss
+
+    def validate(self, html: str | bytes, url: str) -> ValidationResult:
+        signals = self.inspect(html, url)
+        confidence = self.confidence(signals)
+        if confidence >= self.accept:
+            self.stats.accepted += 1
+        elif confidence <= self.reject:
+            self.stats.rejected += 1
+        else:
+            self.stats.borderline += 1
+        return ValidationResult(confidence=confidence, signals=signals)
+
+    def is_borderline(self, result: ValidationResult) -> bool:
+        return self.reject < result.confidence < self.accept
@@ -0,0 +1,40 @@
+import os
+from functools import cache
+
+from langchain_openai import ChatOpenAI
+
+from data_collector.telemetry import current_telemetry
+
+DEFAULT_MODEL = "gpt-4.1-mini"
+DEFAULT_BASE_URL = "https://munherkkuinstanssifoundry.openai.azure.com/openai/v1"
+
+
+@cache
+def get_chat_model(model: str = DEFAULT_MODEL) -> ChatOpenAI:
+    return ChatOpenAI(
+        model=model,
+        base_url=os.getenv("AZURE_OPENAI_BASE_URL", DEFAULT_BASE_URL),
+        api_key=os.getenv("AZURE_OPENAI_API_KEY"),
+    )
+
+
+def strip_code_fence(text: str) -> str:
+    """
+    Removes the ```json ... ``` wrapper models sometimes put around JSON answers
+    """
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[1] if "\n" in text else ""
+        text = text.rsplit("```", 1)[0]
+    return text.strip()
+
+
+def record_usage(response, call: str):
+    """
+    Counts an LLM call and the tokens its response reports in the current telemetry
+    """
+    telemetry = current_telemetry()
+    telemetry.count("llm.calls", call=call)
+    usage = getattr(response, "usage_metadata", None) or {}
+    telemetry.count("llm.tokens", usage.get("input_tokens", 0), call=call, direction="input")
+    telemetry.count("llm.tokens", usage.get("output_tokens", 0), call=call, direction="output")